@@ -0,0 +1,294 @@
+"""/api/health için kabul kontrolü: istemci başına hız sınırı ve eşzamanlılık tavanı.
+
+İki katman vardır:
+
+* İstemci başına token kovası (HEALTH_RATE_LIMIT istek/sn, HEALTH_RATE_BURST
+  kova boyutu). Durum süreç içinde (`memory`) ya da gunicorn worker'ları
+  arasında paylaşılan bir SQLite dosyasında (`sqlite`) tutulur.
+* Worker başına upstream eşzamanlılık tavanı: en fazla HEALTH_MAX_IN_FLIGHT
+  analiz aynı anda upstream'i bekler, HEALTH_MAX_QUEUE kadarı geliş sırasıyla (FIFO) en fazla
+  HEALTH_QUEUE_TIMEOUT saniye sıra bekler, gerisi hemen reddedilir.
+  Önbellek ve snapshot isabetleri bu tavana takılmaz.
+
+Reddedilen istekler (her zaman 200 kuralına uygun olarak) `code` alanlı bir
+hata ve Retry-After başlığıyla yanıtlanır.
+"""
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+import metrics
+from sqlite_local import LocalConnection
+from upstream import env_float, env_int
+
+RATE_LIMITED_ERROR = "Çok fazla istek gönderdiniz, lütfen biraz sonra tekrar deneyin."
+OVERLOADED_ERROR = "Sistem şu anda çok yoğun, lütfen biraz sonra tekrar deneyin."
+
+REJECTIONS = metrics.REGISTRY.register(metrics.Counter(
+    "health_admission_rejections_total", "Requests rejected by admission control", ("reason",)))
+
+
+class Rejected(Exception):
+    """İstek kabul edilmedi; `as_error()` yanıt gövdesini verir."""
+
+    def __init__(self, code, message, retry_after):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.retry_after = retry_after
+
+    def as_error(self):
+        return {"error": self.message, "code": self.code, "retry_after": self.retry_after}
+
+
+def retry_after_header(result):
+    """Hata sonucunda retry_after varsa Retry-After başlık değerini döndürür."""
+    retry_after = result.get("retry_after") if isinstance(result, dict) else None
+    return None if retry_after is None else str(max(1, math.ceil(retry_after)))
+
+
+class MemoryRateLimiter:
+    """Süreç içi token kovaları."""
+
+    def __init__(self, rate, burst, idle_ttl=600):
+        self.rate = rate
+        self.burst = burst
+        self.idle_ttl = idle_ttl
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._next_cleanup = 0.0
+
+    def acquire(self, client, cost=1, now=None):
+        """Token alınabildiyse 0, alınamadıysa beklenmesi gereken saniyeyi döndürür."""
+        now = time.time() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.get(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= cost:
+                self._buckets[client] = (tokens - cost, now)
+                wait = 0.0
+            else:
+                self._buckets[client] = (tokens, now)
+                wait = (cost - tokens) / self.rate
+            if now >= self._next_cleanup:
+                # Uzun süredir istek göndermeyen (kovası dolmuş) istemciler unutulur
+                self._buckets = {key: value for key, value in self._buckets.items()
+                                 if now - value[1] < self.idle_ttl}
+                self._next_cleanup = now + self.idle_ttl
+            return wait
+
+
+class SQLiteRateLimiter:
+    """Worker süreçleri arasında paylaşılan, SQLite tabanlı token kovaları."""
+
+    def __init__(self, path, rate, burst, idle_ttl=600):
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        self.idle_ttl = idle_ttl
+        self._connect = LocalConnection(path, synchronous="OFF", isolation_level=None)
+        conn = self._connect()
+        conn.execute("""CREATE TABLE IF NOT EXISTS rate_buckets (
+            client TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated REAL NOT NULL
+        )""")
+        conn.commit()
+
+    def acquire(self, client, cost=1, now=None):
+        """Token alınabildiyse 0, alınamadıysa beklenmesi gereken saniyeyi döndürür."""
+        now = time.time() if now is None else now
+        conn = self._connect()
+        # Okuma ve yazma tek bir yazma kilidi altında yapılır ki worker'lar yarışmasın
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM rate_buckets WHERE client = ?",
+                               (client,)).fetchone()
+            tokens = self.burst if row is None else min(self.burst, row[0] + (now - row[1]) * self.rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / self.rate
+            conn.execute("INSERT OR REPLACE INTO rate_buckets VALUES (?, ?, ?)", (client, tokens, now))
+            if row is None:
+                conn.execute("DELETE FROM rate_buckets WHERE updated < ?", (now - self.idle_ttl,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+
+def create_rate_limiter_from_env():
+    """Ortam değişkenlerinden hız sınırlayıcı kurar; kapalıysa None döner.
+
+    HEALTH_RATE_LIMIT_BACKEND: off (varsayılan), memory veya sqlite
+    HEALTH_RATE_LIMIT: istemci başına saniyede istek (varsayılan 0.5)
+    HEALTH_RATE_BURST: kova boyutu (varsayılan 10)
+    HEALTH_RATE_LIMIT_PATH: SQLite dosyası (varsayılan health_ratelimit.sqlite3)
+    """
+    backend_name = os.environ.get("HEALTH_RATE_LIMIT_BACKEND", "off").lower()
+    if backend_name in ("off", "none", "0", ""):
+        return None
+
+    rate = env_float("HEALTH_RATE_LIMIT", 0.5)
+    burst = env_float("HEALTH_RATE_BURST", 10.0)
+    if backend_name == "sqlite":
+        return SQLiteRateLimiter(os.environ.get("HEALTH_RATE_LIMIT_PATH", "health_ratelimit.sqlite3"), rate, burst)
+    if backend_name == "memory":
+        return MemoryRateLimiter(rate, burst)
+    raise ValueError(f"Bilinmeyen hız sınırlayıcı arka ucu: {backend_name}")
+
+
+# Ters vekil sunucu (ör. Render) arkasında istemci adresi X-Forwarded-For'dan alınır
+TRUST_PROXY = os.environ.get("HEALTH_TRUST_PROXY", "0").lower() in ("1", "true", "yes", "on")
+
+
+def client_id(headers, remote_addr):
+    """İstemci kimliği: X-API-Key başlığı, yoksa (güvenilen vekil arkasında) gerçek IP."""
+    api_key = headers.get("X-API-Key")
+    if api_key:
+        return "key:" + api_key
+    if TRUST_PROXY:
+        forwarded = headers.get("X-Forwarded-For")
+        if forwarded:
+            return "ip:" + forwarded.split(",")[0].strip()
+    return "ip:" + (remote_addr or "unknown")
+
+
+def check_rate(limiter, client, cost=1):
+    """Hız sınırı aşıldıysa Rejected fırlatır."""
+    if limiter is None:
+        return
+    wait = limiter.acquire(client, cost)
+    if wait > 0:
+        REJECTIONS.inc(reason="rate_limited")
+        raise Rejected("rate_limited", RATE_LIMITED_ERROR, round(wait, 1))
+
+
+class AdmissionController:
+    """Thread tabanlı sunucu (Flask) için aynı tavan; bekleyenler FIFO sırayla alınır."""
+
+    def __init__(self, max_in_flight=None, max_queue=None, queue_timeout=None):
+        self.max_in_flight = max_in_flight if max_in_flight is not None else env_int("HEALTH_MAX_IN_FLIGHT", 16)
+        self.max_queue = max_queue if max_queue is not None else env_int("HEALTH_MAX_QUEUE", 16)
+        self.queue_timeout = queue_timeout if queue_timeout is not None else env_float("HEALTH_QUEUE_TIMEOUT", 2.0)
+        self.in_flight = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def queued(self):
+        return len(self._waiters)
+
+    def _reject(self, reason):
+        REJECTIONS.inc(reason=reason)
+        return Rejected("overloaded", OVERLOADED_ERROR, max(1.0, self.queue_timeout))
+
+    @contextmanager
+    def slot(self):
+        """Upstream çağrısı için yer ayırır; yer yoksa hemen ya da sıra süresi dolunca Rejected."""
+        if self.max_in_flight <= 0:
+            yield
+            return
+        waiter = None
+        with self._lock:
+            # Bekleyen varken yeni gelen sıraya girer; boşalan yer en eski bekleyenindir
+            if self.in_flight >= self.max_in_flight or self._waiters:
+                if len(self._waiters) >= self.max_queue:
+                    raise self._reject("queue_full")
+                waiter = threading.Event()
+                self._waiters.append(waiter)
+            else:
+                self.in_flight += 1
+        if waiter is not None:
+            # Yer açıldığında serbest bırakan in_flight'ı bu istek adına tutar ve olayı kurar
+            with metrics.stage("admission_wait"):
+                admitted = waiter.wait(self.queue_timeout)
+            if not admitted:
+                with self._lock:
+                    # Süre dolarken yer verilmiş olabilir
+                    admitted = waiter.is_set()
+                    if not admitted:
+                        self._waiters.remove(waiter)
+                if not admitted:
+                    raise self._reject("queue_timeout")
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self):
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().set()
+            else:
+                self.in_flight -= 1
+
+    def stats(self):
+        return {"in_flight": self.in_flight, "queued": self.queued}
+
+
+class AsyncAdmissionController:
+    """asyncio sunucusu (async_app) için aynı tavan; bekleyenler FIFO sırayla alınır."""
+
+    def __init__(self, max_in_flight=None, max_queue=None, queue_timeout=None):
+        self.max_in_flight = max_in_flight if max_in_flight is not None else env_int("HEALTH_MAX_IN_FLIGHT", 16)
+        self.max_queue = max_queue if max_queue is not None else env_int("HEALTH_MAX_QUEUE", 16)
+        self.queue_timeout = queue_timeout if queue_timeout is not None else env_float("HEALTH_QUEUE_TIMEOUT", 2.0)
+        self.in_flight = 0
+        self._waiters = deque()
+
+    @property
+    def queued(self):
+        return len(self._waiters)
+
+    def _reject(self, reason):
+        REJECTIONS.inc(reason=reason)
+        return Rejected("overloaded", OVERLOADED_ERROR, max(1.0, self.queue_timeout))
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.max_in_flight <= 0:
+            yield
+            return
+        if self.in_flight >= self.max_in_flight or self._waiters:
+            if len(self._waiters) >= self.max_queue:
+                raise self._reject("queue_full")
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                # Yer açıldığında serbest bırakan in_flight'ı bu istek adına artırır
+                with metrics.stage("admission_wait"):
+                    await asyncio.wait_for(waiter, self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise self._reject("queue_timeout")
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._release()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        else:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self):
+        return {"in_flight": self.in_flight, "queued": self.queued}
@@ -0,0 +1,208 @@
+"""/api/health analiz hattının sunucu türünden bağımsız parçaları.
+
+Flask (app.py) ve asyncio (async_app.py) sunucuları aynı düzeltme,
+sınıflandırma, önbellek ve ayrıştırma adımlarını buradan kullanır.
+"""
+import os
+
+import metrics
+import response_parser
+import router
+import structured
+from admission import AdmissionController, Rejected, create_rate_limiter_from_env
+from cache import create_cache_from_env, make_key
+from config import API_KEY, MODEL
+from log import get_logger
+from preprocess import correct_turkish_text, is_health_related
+from semantic import create_semantic_index_from_env
+from singleflight import SingleFlight
+from snapshot import load_snapshot_from_env
+
+logger = get_logger("analysis")
+
+SYSTEM_PROMPT = """Sen bir sağlık asistanısın. Kullanıcının sağlık şikayetlerini dinleyip, 
+        olası nedenleri ve önerileri sunacaksın. Her zaman şu formatta yanıt ver:
+        1. Olası Nedenler:
+        2. Öneriler:
+        3. Ne Zaman Doktora Gitmelisiniz:
+        4. Hangi Branşa Gitmelisiniz:
+        5. Acil Servise Gitmem Gerekir mi?:
+        6. Evde Nelere Dikkat Etmeliyim?:
+        7. Ne Kadar Sürede Geçmeli?:
+        8. Bu Belirtiler Stres Kaynaklı Olabilir mi?:
+        9. Bu Belirtiler Hangi Hastalıklarla Karıştırılabilir?:
+        10. Bu Belirtiler Ciddi mi?:
+        11. Bu Durumda İlaç Kullanmalı mıyım?:
+        12. Bu Durum Bulaşıcı mı?:"""
+# Prompt değiştiğinde artırılmalı; eski önbellek kayıtları böylece geçersiz olur
+PROMPT_VERSION = 1
+TEMPERATURE = 0.3
+# Yanıt biçimi: text (12 başlıklı düzyazı, varsayılan) ya da json (bkz. structured.py).
+# İki mod aynı alanları ürettiğinden önbellek ve snapshot kayıtları ortaktır.
+# Akış (/api/health/stream) bölümleri başlıklardan çıkardığı için her zaman düzyazı ister.
+STRUCTURED_OUTPUT = os.environ.get("HEALTH_RESPONSE_FORMAT", "text").lower() == "json"
+# Her istekte aynı sistem mesajı kullanılır; bir kez kurulur
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+STRUCTURED_SYSTEM_MESSAGE = {"role": "system", "content": structured.SYSTEM_PROMPT}
+
+response_cache = create_cache_from_env()
+# warmup.py ile önceden hesaplanmış sık şikayetler; upstream'e hiç gidilmez
+response_snapshot = load_snapshot_from_env()
+if response_snapshot is not None:
+    logger.info("snapshot loaded path=%s entries=%d", response_snapshot.path, len(response_snapshot))
+    metrics.REGISTRY.register(metrics.GaugeFunc(
+        "health_snapshot_entries", "Entries in the loaded warm-up snapshot", "path",
+        lambda: {response_snapshot.path: len(response_snapshot)}))
+
+# Yakın anlamlı sorgular önbellekteki yanıtı kullanır (bkz. semantic.py); dizin
+# önbellek anahtarlarını tuttuğundan önbellek kapalıysa kapalıdır
+semantic_index = create_semantic_index_from_env() if response_cache is not None else None
+if semantic_index is not None:
+    metrics.REGISTRY.register(metrics.GaugeFunc(
+        "health_semantic_cache", "Similarity cache counters of this worker", "stat", semantic_index.stats))
+
+# Aynı anda gelen aynı sorgular tek upstream çağrısını bekler
+INFLIGHT_TIMEOUT = float(os.environ.get("HEALTH_INFLIGHT_TIMEOUT", 75))
+inflight = SingleFlight(INFLIGHT_TIMEOUT)
+
+if response_cache is not None:
+    metrics.REGISTRY.register(metrics.GaugeFunc(
+        "health_cache", "Response cache counters of this worker", "stat",
+        lambda: {k: v for k, v in response_cache.stats().items() if k != "backend"}))
+metrics.REGISTRY.register(metrics.GaugeFunc(
+    "health_inflight", "Single-flight counters of this worker", "stat", inflight.stats))
+
+# İstemci başına hız sınırı ve worker başına upstream eşzamanlılık tavanı (bkz. admission.py)
+rate_limiter = create_rate_limiter_from_env()
+admission_control = AdmissionController()
+metrics.REGISTRY.register(metrics.GaugeFunc(
+    "health_admission", "Upstream admission slots of this worker", "stat", admission_control.stats))
+
+NON_HEALTH_ERROR = "Lütfen sağlığınızla ilgili şikayetlerinizi detaylı ve düzgün kelimelerle belirtiniz. Sistem sadece sağlık şikayetlerini analiz edebilmektedir."
+
+def prepare_query(query, should_correct=True):
+    """Correct the query and look it up in the cache.
+
+    Returns (corrected_query, query_key, result); result is set when no
+    upstream call is needed (non-health query or cache hit). query_key
+    identifies the normalized query and prompt for caching and coalescing.
+    """
+    # Semptom metni loglanmaz; yalnızca uzunluğu ve sorgu anahtarı yazılır
+    # Only correct the text if requested
+    corrected_query = query
+    if should_correct:
+        with metrics.stage("correction"):
+            corrected_query = correct_turkish_text(query)
+    
+    # Check if health related after correction
+    with metrics.stage("classification"):
+        health_related = is_health_related(corrected_query)
+    if not health_related:
+        logger.info("query len=%d corrected=%s rejected=non_health",
+                    len(query), corrected_query != query)
+        return corrected_query, None, {"error": NON_HEALTH_ERROR}
+    
+    # Aynı (normalize edilmiş) şikayet için önbellekteki analizi kullan
+    query_key = make_key(corrected_query, MODEL, TEMPERATURE, PROMPT_VERSION)
+    cached = None
+    lookup = "miss"
+    with metrics.stage("cache_lookup"):
+        if response_snapshot is not None:
+            cached = response_snapshot.get(query_key)
+            if cached is not None:
+                lookup = "snapshot"
+        if cached is None and response_cache is not None:
+            cached = response_cache.get(query_key)
+            if cached is not None:
+                lookup = "hit"
+    if cached is None and semantic_index is not None:
+        with metrics.stage("semantic_lookup"):
+            similar_key = semantic_index.search(corrected_query)
+            if similar_key is not None:
+                cached = response_cache.get(similar_key)
+                if cached is not None:
+                    lookup = "semantic"
+    metrics.CACHE_LOOKUPS.inc(result=lookup)
+    logger.info("query len=%d corrected=%s key=%s cache=%s", len(query),
+                corrected_query != query, query_key[:12], lookup)
+    if cached is not None:
+        return corrected_query, query_key, with_corrected_query(cached, query, corrected_query)
+    
+    return corrected_query, query_key, None
+
+def build_messages(corrected_query, structured_output=False):
+    return [
+        STRUCTURED_SYSTEM_MESSAGE if structured_output else SYSTEM_MESSAGE,
+        {"role": "user", "content": corrected_query}
+    ]
+
+def build_payload(corrected_query, stream=False):
+    """Chat completion istek gövdesini hazırlar"""
+    structured_output = STRUCTURED_OUTPUT and not stream
+    payload = {
+        "model": MODEL,
+        "messages": build_messages(corrected_query, structured_output),
+        "temperature": TEMPERATURE
+    }
+    if structured_output:
+        payload["response_format"] = structured.RESPONSE_FORMAT
+    if stream:
+        payload["stream"] = True
+    return payload
+
+def get_router():
+    """Süreç başına upstream yönlendiricisi (UPSTREAM_BACKENDS, bkz. router.py)"""
+    return router.get_router(MODEL, API_KEY)
+
+def with_corrected_query(result, query, corrected_query):
+    return dict(result, corrected_query=corrected_query if corrected_query != query else None)
+
+def parse_analysis(ai_response):
+    """Model yanıtını yanıt biçimine göre ayrıştırır"""
+    # JSON modunda geçersiz yanıtlar (ve akıştan gelen düzyazı) düzyazı olarak ayrıştırılır
+    parser = structured if STRUCTURED_OUTPUT else response_parser
+    return parser.parse(ai_response).as_dict()
+
+def has_sections(result):
+    """En az bir bölüm ayrıştırıldıysa True; kesik ya da biçimsiz yanıtlar saklanmaz"""
+    return any(result[field] for field in response_parser.FIELDS)
+
+def store_analysis(query_key, ai_response, corrected_query=None):
+    """Parse the model answer and store it in the cache"""
+    with metrics.stage("parse"):
+        result = parse_analysis(ai_response)
+    if not has_sections(result):
+        # Hiçbir bölüm ayrıştırılamadı (kesik ya da biçimsiz yanıt); önbelleğe alınmaz ki
+        # aynı şikayet TTL boyunca boş sonuçla yanıtlanmasın
+        logger.warning("unparsed answer not cached key=%s len=%d", query_key[:12], len(ai_response))
+        return result
+    if response_cache is not None:
+        response_cache.set(query_key, result)
+        if semantic_index is not None and corrected_query is not None:
+            semantic_index.add(corrected_query, query_key)
+    return result
+
+def upstream_result(response, corrected_query, query_key):
+    """Turn an upstream chat completion response into the parsed result or an error dict
+
+    Flask (app.fetch_analysis) ve aiohttp (async_app.fetch_analysis) sürümleri
+    yalnızca upstream çağrısında ayrışır; yanıtın işlenmesi burada ortaktır.
+    """
+    if response.status_code != 200:
+        metrics.record_upstream(response.status_code)
+        logger.warning("upstream error status=%d key=%s", response.status_code, query_key[:12])
+        return {"error": f"API Hatası: {response.status_code}", "details": response.text}
+    body = response.json()
+    metrics.record_upstream(response.status_code, body)
+    return store_analysis(query_key, body["choices"][0]["message"]["content"], corrected_query)
+
+def upstream_error(error, query_key):
+    """Turn an exception raised around the upstream call into an error dict"""
+    if isinstance(error, Rejected):
+        return error.as_error()
+    logger.warning("upstream exception key=%s: %s", query_key[:12], error)
+    return {"error": f"Bağlantı hatası: {str(error)}"}
+
+def finish_analysis(query, corrected_query, query_key, ai_response):
+    """Parse the model answer, store it in the cache and build the response"""
+    return with_corrected_query(store_analysis(query_key, ai_response, corrected_query), query, corrected_query)
@@ -1,212 +1,425 @@
-from flask import Flask, request, jsonify
+"""/api/health için Flask sunucusu.
+
+Uygulama create_app() ile kurulur; `app` modül düzeyinde de hazırdır.
+
+    gunicorn app:app
+    gunicorn app:app --preload    # statik veriler ana süreçte bir kez kurulur
+
+Düzeltme tabloları, sağlık sözlüğü, benzerlik dizini ve prompt modüller
+yüklenirken bir kez kurulur. --preload ile bunlar ana süreçte kurulup
+worker'lara fork ile copy-on-write olarak geçer. Worker'a özgü kaynaklar
+(upstream bağlantı havuzu, thread havuzları, iş çalıştırıcısı) ise
+init_worker() ile worker başlarken kurulur (bkz. gunicorn.conf.py); ilk
+istek bunları beklemez.
+"""
+import time
+
+_import_started = time.perf_counter()
+
+from flask import Blueprint, Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-import re
+import json
 import threading
-import time
-import requests
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+import response_parser
+import upstream
+from admission import Rejected, check_rate, client_id, retry_after_header
+from jobs import JOB_NOT_FOUND_ERROR, JobRunner, create_job_store_from_env, public_view
+from log import get_logger
+from analysis import (admission_control, build_payload, finish_analysis, get_router, inflight,
+                      prepare_query, rate_limiter, upstream_error, upstream_result, with_corrected_query)
+
+bp = Blueprint("health", __name__)
+
+logger = get_logger("app")
 
-# Import our health assistant logic
-from de import API_KEY, MODEL, is_health_related, correct_turkish_text
+# Soğuk başlangıç süreleri (sn): import, create_app, init_worker, first_request
+STARTUP_SECONDS = {}
+_first_request_pid = None
+metrics.REGISTRY.register(metrics.GaugeFunc(
+    "health_startup_seconds", "Cold start phases of this worker", "phase", lambda: dict(STARTUP_SECONDS)))
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+def start_server_timing():
+    # gthread aynı thread'i sonraki isteklerde de kullandığından her istekte sıfırlanır
+    g.stage_timings = metrics.start_timing()
+    g.started_at = time.perf_counter()
+
+def add_server_timing(response):
+    timings = g.get("stage_timings")
+    if timings is not None:
+        timings["total"] = time.perf_counter() - g.started_at
+        response.headers["Server-Timing"] = metrics.server_timing_header(timings)
+    return response
+
+def start_first_request():
+    g.request_started_at = time.perf_counter()
+
+def record_first_request(response):
+    """Worker'ın ilk isteğinin süresini bir kez kaydeder"""
+    global _first_request_pid
+    if _first_request_pid != os.getpid() and "request_started_at" in g:
+        _first_request_pid = os.getpid()
+        STARTUP_SECONDS["first_request"] = time.perf_counter() - g.request_started_at
+        logger.info("first request %.1f ms", STARTUP_SECONDS["first_request"] * 1000)
+    return response
+
+def create_app():
+    """Flask uygulamasını kurar; ağır statik veriler modül yüklenirken zaten hazırdır"""
+    started = time.perf_counter()
+    flask_app = Flask(__name__)
+    CORS(flask_app, expose_headers=["Retry-After", "Server-Timing"])  # Enable CORS for all routes
+    if metrics.SERVER_TIMING:
+        flask_app.before_request(start_server_timing)
+        flask_app.after_request(add_server_timing)
+    flask_app.before_request(start_first_request)
+    flask_app.after_request(record_first_request)
+    flask_app.register_blueprint(bp)
+    STARTUP_SECONDS["create_app"] = time.perf_counter() - started
+    return flask_app
+
+def json_result(result):
+    """Always 200; admission rejections also carry a Retry-After header"""
+    response = jsonify(result)
+    retry_after = retry_after_header(result)
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response, 200
+
+def fetch_analysis(corrected_query, query_key):
+    """Send one upstream request; returns the parsed result or an error dict"""
+    # Upstream eşzamanlılık tavanı doluysa Rejected fırlatılır
+    with admission_control.slot(), metrics.stage("upstream_wait"):
+        response = get_router().chat_completion(build_payload(corrected_query))
+    return upstream_result(response, corrected_query, query_key)
 
 def analyze_health_query(query, should_correct=True):
     """Process a health query using the deepseek model"""
-    print(f"Received query: {query}")
-    
-    # Only correct the text if requested
-    corrected_query = query
-    if should_correct:
-        print(f"Correcting text: {query}")
-        corrected_query = correct_turkish_text(query)
-        if corrected_query != query:
-            print(f"Corrected query: {corrected_query}")
-    else:
-        print("Text correction skipped as per user request")
-    
-    # Check if health related after correction
-    if not is_health_related(corrected_query):
-        return {"error": "Lütfen sağlığınızla ilgili şikayetlerinizi detaylı ve düzgün kelimelerle belirtiniz. Sistem sadece sağlık şikayetlerini analiz edebilmektedir."}
-    
-    messages = [
-        {"role": "system", "content": """Sen bir sağlık asistanısın. Kullanıcının sağlık şikayetlerini dinleyip, 
-        olası nedenleri ve önerileri sunacaksın. Her zaman şu formatta yanıt ver:
-        1. Olası Nedenler:
-        2. Öneriler:
-        3. Ne Zaman Doktora Gitmelisiniz:
-        4. Hangi Branşa Gitmelisiniz:
-        5. Acil Servise Gitmem Gerekir mi?:
-        6. Evde Nelere Dikkat Etmeliyim?:
-        7. Ne Kadar Sürede Geçmeli?:
-        8. Bu Belirtiler Stres Kaynaklı Olabilir mi?:
-        9. Bu Belirtiler Hangi Hastalıklarla Karıştırılabilir?:
-        10. Bu Belirtiler Ciddi mi?:
-        11. Bu Durumda İlaç Kullanmalı mıyım?:
-        12. Bu Durum Bulaşıcı mı?:"""},
-        {"role": "user", "content": corrected_query}
-    ]
+    corrected_query, query_key, result = prepare_query(query, should_correct)
+    if result is not None:
+        return result
     
+    return complete_health_query(query, corrected_query, query_key)
+
+def complete_health_query(query, corrected_query, query_key):
+    """Upstream part of analyze_health_query for an already prepared query"""
     try:
-        print("Sending request to OpenRouter API...")
-        response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": MODEL,
-                "messages": messages,
-                "temperature": 0.3
-            },
-            timeout=60  # 60 saniye bekle
-        )
-        
-        print(f"OpenRouter API response status: {response.status_code}")
-        
-        if response.status_code == 200:
-            ai_response = response.json()["choices"][0]["message"]["content"]
-            
-            # Yıldız (*) işaretlerini temizle
-            ai_response = re.sub(r'\*+', '', ai_response)
-            
-            # Parse the AI response to extract structured information
-            causes = ""
-            recommendations = ""
-            when_to_see_doctor = ""
-            which_specialist = ""
-            emergency_visit = ""
-            home_care = ""
-            duration = ""
-            stress_related = ""
-            similar_conditions = ""
-            severity = ""
-            medication = ""
-            contagious = ""
-            
-            # Daha güçlü regex pattern'ler ile ayrıştırma yaparak temiz sonuçlar elde et
-            
-            # Olası Nedenler kısmını ayıkla
-            causes_match = re.search(r'(?:1\.[\s]*)?Olası Nedenler:(.+?)(?:(?:2\.[\s]*)?Öneriler:|$)', ai_response, re.DOTALL)
-            
-            # Öneriler kısmını ayıkla
-            recommendations_match = re.search(r'(?:2\.[\s]*)?Öneriler:(.+?)(?:(?:3\.[\s]*)?Ne Zaman Doktora Gitmelisiniz:|$)', ai_response, re.DOTALL)
-            
-            # Doktor tavsiyesi kısmını ayıkla
-            doctor_match = re.search(r'(?:3\.[\s]*)?Ne Zaman Doktora Gitmelisiniz:(.+?)(?:(?:4\.[\s]*)?Hangi Branşa Gitmelisiniz:|$)', ai_response, re.DOTALL)
-            
-            # Branş tavsiyesi kısmını ayıkla
-            specialist_match = re.search(r'(?:4\.[\s]*)?Hangi Branşa Gitmelisiniz:(.+?)(?:(?:5\.[\s]*)?Acil Servise Gitmem Gerekir mi\?:|$)', ai_response, re.DOTALL)
-            
-            # Acil servis kısmını ayıkla
-            emergency_match = re.search(r'(?:5\.[\s]*)?Acil Servise Gitmem Gerekir mi\?:(.+?)(?:(?:6\.[\s]*)?Evde Nelere Dikkat Etmeliyim\?:|$)', ai_response, re.DOTALL)
-            
-            # Evde dikkat edilecekler kısmını ayıkla
-            home_care_match = re.search(r'(?:6\.[\s]*)?Evde Nelere Dikkat Etmeliyim\?:(.+?)(?:(?:7\.[\s]*)?Ne Kadar Sürede Geçmeli\?:|$)', ai_response, re.DOTALL)
-            
-            # Süre kısmını ayıkla
-            duration_match = re.search(r'(?:7\.[\s]*)?Ne Kadar Sürede Geçmeli\?:(.+?)(?:(?:8\.[\s]*)?Bu Belirtiler Stres Kaynaklı Olabilir mi\?:|$)', ai_response, re.DOTALL)
-            
-            # Stres kaynaklı kısmını ayıkla
-            stress_match = re.search(r'(?:8\.[\s]*)?Bu Belirtiler Stres Kaynaklı Olabilir mi\?:(.+?)(?:(?:9\.[\s]*)?Bu Belirtiler Hangi Hastalıklarla Karıştırılabilir\?:|$)', ai_response, re.DOTALL)
-            
-            # Benzer hastalıklar kısmını ayıkla
-            similar_match = re.search(r'(?:9\.[\s]*)?Bu Belirtiler Hangi Hastalıklarla Karıştırılabilir\?:(.+?)(?:(?:10\.[\s]*)?Bu Belirtiler Ciddi mi\?:|$)', ai_response, re.DOTALL)
-            
-            # Ciddiyet kısmını ayıkla
-            severity_match = re.search(r'(?:10\.[\s]*)?Bu Belirtiler Ciddi mi\?:(.+?)(?:(?:11\.[\s]*)?Bu Durumda İlaç Kullanmalı mıyım\?:|$)', ai_response, re.DOTALL)
-            
-            # İlaç kullanımı kısmını ayıkla
-            medication_match = re.search(r'(?:11\.[\s]*)?Bu Durumda İlaç Kullanmalı mıyım\?:(.+?)(?:(?:12\.[\s]*)?Bu Durum Bulaşıcı mı\?:|$)', ai_response, re.DOTALL)
-            
-            # Bulaşıcılık kısmını ayıkla
-            contagious_match = re.search(r'(?:12\.[\s]*)?Bu Durum Bulaşıcı mı\?:(.+?)$', ai_response, re.DOTALL)
-            
-            if causes_match:
-                causes = causes_match.group(1).strip()
-            if recommendations_match:
-                recommendations = recommendations_match.group(1).strip()
-            if doctor_match:
-                when_to_see_doctor = doctor_match.group(1).strip()
-            if specialist_match:
-                which_specialist = specialist_match.group(1).strip()
-            if emergency_match:
-                emergency_visit = emergency_match.group(1).strip()
-            if home_care_match:
-                home_care = home_care_match.group(1).strip()
-            if duration_match:
-                duration = duration_match.group(1).strip()
-            if stress_match:
-                stress_related = stress_match.group(1).strip()
-            if similar_match:
-                similar_conditions = similar_match.group(1).strip()
-            if severity_match:
-                severity = severity_match.group(1).strip()
-            if medication_match:
-                medication = medication_match.group(1).strip()
-            if contagious_match:
-                contagious = contagious_match.group(1).strip()
-            
-            # Yanıt verisini hazırla
-            return {
-                "causes": causes,
-                "recommendations": recommendations,
-                "when_to_see_doctor": when_to_see_doctor,
-                "which_specialist": which_specialist,
-                "emergency_visit": emergency_visit,
-                "home_care": home_care,
-                "duration": duration,
-                "stress_related": stress_related,
-                "similar_conditions": similar_conditions,
-                "severity": severity,
-                "medication": medication,
-                "contagious": contagious,
-                "full_response": ai_response,
-                "corrected_query": corrected_query if corrected_query != query else None
-            }
-        else:
-            print(f"API Error: {response.status_code}")
-            print(f"Response content: {response.text}")
-            return {"error": f"API Hatası: {response.status_code}", "details": response.text}
-            
+        # Aynı sorgu için süren bir çağrı varsa onun sonucu paylaşılır
+        result = inflight.do(query_key, lambda: fetch_analysis(corrected_query, query_key))
     except Exception as e:
-        print(f"Exception occurred: {str(e)}")
-        return {"error": f"Bağlantı hatası: {str(e)}"}
+        return upstream_error(e, query_key)
+    
+    if "error" in result:
+        return result
+    return with_corrected_query(result, query, corrected_query)
 
-@app.route('/api/health', methods=['POST'])
+@bp.route('/api/health', methods=['POST'])
 def health_analysis():
     try:
-        print("Received request:", request.data)
-        data = request.json
+        with metrics.stage("json_decode"):
+            data = request.json
         if not data:
-            print("No JSON data found in request")
+            metrics.REQUESTS.inc(endpoint="health", outcome="bad_request")
             return jsonify({"error": "Geçersiz istek formatı"}), 200
         
         if 'symptoms' not in data:
-            print("No 'symptoms' key in request JSON")
+            metrics.REQUESTS.inc(endpoint="health", outcome="bad_request")
             return jsonify({"error": "Semptom bilgisi gerekli"}), 200
         
         symptoms = data['symptoms']
         should_correct = data.get('should_correct', True)  # Varsayılan olarak düzeltme yap
         
-        print(f"Processing symptoms: {symptoms}")
-        print(f"Should correct text: {should_correct}")
-        
+        check_rate(rate_limiter, client_id(request.headers, request.remote_addr))
         result = analyze_health_query(symptoms, should_correct)
+        metrics.REQUESTS.inc(endpoint="health", outcome=result.get("code", "error") if "error" in result else "ok")
         
         # Always return 200 status code, even if there's an error
-        return jsonify(result), 200
+        with metrics.stage("serialize"):
+            return json_result(result)
+    except Rejected as e:
+        metrics.REQUESTS.inc(endpoint="health", outcome=e.code)
+        return json_result(e.as_error())
+    except Exception as e:
+        metrics.REQUESTS.inc(endpoint="health", outcome="exception")
+        logger.exception("Unexpected error")
+        return jsonify({"error": f"Sunucu hatası: {str(e)}"}), 200
+
+BATCH_MAX_ITEMS = int(os.environ.get("HEALTH_BATCH_MAX_ITEMS", 500))
+BATCH_CONCURRENCY = int(os.environ.get("HEALTH_BATCH_CONCURRENCY", 8))
+
+_batch_executor = None
+_batch_executor_pid = None
+_batch_executor_lock = threading.Lock()
+
+def get_batch_executor():
+    """Toplu isteklerin upstream çağrıları için süreç başına sınırlı thread havuzu"""
+    global _batch_executor, _batch_executor_pid
+    if _batch_executor is None or _batch_executor_pid != os.getpid():
+        with _batch_executor_lock:
+            if _batch_executor is None or _batch_executor_pid != os.getpid():
+                _batch_executor = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY,
+                                                     thread_name_prefix="health-batch")
+                _batch_executor_pid = os.getpid()
+    return _batch_executor
+
+def analyze_health_batch(items, should_correct=True):
+    """Analyze many symptom texts; yields results in input order.
+
+    Düzeltme, sınıflandırma ve önbellek kontrolü önce tüm öğeler için
+    yapılır; yalnızca upstream gerektiren (ve batch içinde tekil) sorgular
+    sınırlı eşzamanlılıkla gönderilir.
+    """
+    prepared = []
+    pending = {}
+    executor = get_batch_executor()
+    for item in items:
+        if isinstance(item, dict):
+            query = item.get('symptoms')
+            item_should_correct = item.get('should_correct', should_correct)
+        else:
+            query = item
+            item_should_correct = should_correct
+        
+        if not isinstance(query, str) or not query.strip():
+            prepared.append({"error": "Semptom bilgisi gerekli"})
+            continue
+        
+        try:
+            corrected_query, query_key, result = prepare_query(query, item_should_correct)
+        except Exception as e:
+            prepared.append({"error": f"Sunucu hatası: {str(e)}"})
+            continue
+        if result is not None:
+            prepared.append(result)
+            continue
+        
+        # Aynı batch içindeki tekrarlanan sorgular tek çağrıyı paylaşır
+        future = pending.get(query_key)
+        if future is None:
+            future = pending[query_key] = executor.submit(complete_health_query, query,
+                                                          corrected_query, query_key)
+        prepared.append((future, query, corrected_query))
+    
+    for entry in prepared:
+        if isinstance(entry, dict):
+            yield entry
+            continue
+        future, query, corrected_query = entry
+        result = future.result()
+        # Paylaşılan sonuçta düzeltme bilgisi bu öğenin sorgusuna göre yeniden yazılır
+        if "error" not in result:
+            result = with_corrected_query(result, query, corrected_query)
+        yield result
+
+@bp.route('/api/health/batch', methods=['POST'])
+def health_analysis_batch():
+    try:
+        data = request.get_json(silent=True)
+        if not data or not isinstance(data, dict):
+            return jsonify({"error": "Geçersiz istek formatı"}), 200
+        
+        items = data.get('symptoms')
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "Semptom listesi gerekli"}), 200
+        if len(items) > BATCH_MAX_ITEMS:
+            return jsonify({"error": f"En fazla {BATCH_MAX_ITEMS} semptom gönderilebilir"}), 200
+        
+        should_correct = data.get('should_correct', True)
+        # Toplu istek öğe sayısı kadar (en fazla kova boyutu kadar) token harcar
+        if rate_limiter is not None:
+            check_rate(rate_limiter, client_id(request.headers, request.remote_addr),
+                       min(len(items), rate_limiter.burst))
+        results = analyze_health_batch(items, should_correct)
+        
+        # NDJSON istenirse her sonuç hazır olduğunda (giriş sırasıyla) gönderilir
+        if request.args.get('stream') == '1' or 'application/x-ndjson' in request.headers.get('Accept', ''):
+            def lines():
+                for index, result in enumerate(results):
+                    yield json.dumps(dict(result, index=index), ensure_ascii=False) + "\n"
+            return Response(stream_with_context(lines()), mimetype="application/x-ndjson")
+        
+        return jsonify({"results": list(results)}), 200
+    except Rejected as e:
+        return json_result(e.as_error())
+    except Exception as e:
+        logger.exception("Unexpected error")
+        return jsonify({"error": f"Sunucu hatası: {str(e)}"}), 200
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def stream_health_query(query, should_correct=True):
+    """Analizi server-sent events olarak üretir.
+
+    Her bölüm, modelin bir sonraki başlığa geçtiği anda `section` olayı
+    olarak gönderilir; son olarak /api/health ile aynı JSON `done` olayıyla
+    gelir.
+    """
+    try:
+        corrected_query, query_key, result = prepare_query(query, should_correct)
+    except Exception as e:
+        # Akış başlamış olabilir; hata da bir SSE olayı olarak gönderilir
+        logger.exception("Unexpected error")
+        yield _sse("error", {"error": f"Sunucu hatası: {str(e)}"})
+        return
+    yield _sse("meta", {"corrected_query": corrected_query if corrected_query != query else None})
+    
+    if result is not None:
+        if "error" in result:
+            yield _sse("error", result)
+            return
+        for field in response_parser.FIELDS:
+            yield _sse("section", {"field": field, "content": result[field]})
+        yield _sse("done", result)
+        return
+    
+    try:
+        # Akış süresince upstream eşzamanlılık tavanından bir yer tutulur
+        with admission_control.slot():
+            with metrics.stage("upstream_wait"):
+                response = get_router().open_stream(build_payload(corrected_query, stream=True))
+            metrics.record_upstream(response.status_code)
+        
+            if response.status_code != 200:
+                logger.warning("upstream error status=%d key=%s", response.status_code, query_key[:12])
+                yield _sse("error", {"error": f"API Hatası: {response.status_code}", "details": response.text})
+                return
+        
+            sections = response_parser.SectionStream()
+            chunks = []
+            with response:
+                for delta in upstream.iter_stream_content(response):
+                    chunks.append(delta)
+                    for field, content in sections.feed(delta):
+                        yield _sse("section", {"field": field, "content": content})
+            for field, content in sections.close():
+                yield _sse("section", {"field": field, "content": content})
+        
+            yield _sse("done", finish_analysis(query, corrected_query, query_key, "".join(chunks)))
+    
+    except Rejected as e:
+        yield _sse("error", e.as_error())
+    except Exception as e:
+        logger.warning("stream exception key=%s: %s", query_key[:12], e)
+        yield _sse("error", {"error": f"Bağlantı hatası: {str(e)}"})
+
+@bp.route('/api/health/stream', methods=['POST'])
+def health_analysis_stream():
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return jsonify({"error": "Geçersiz istek formatı"}), 200
+    if not isinstance(data.get('symptoms'), str):
+        return jsonify({"error": "Semptom bilgisi gerekli"}), 200
+    try:
+        check_rate(rate_limiter, client_id(request.headers, request.remote_addr))
+    except Rejected as e:
+        return json_result(e.as_error())
+    
+    events = stream_health_query(data['symptoms'], data.get('should_correct', True))
+    return Response(stream_with_context(events), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # Ters vekil sunucularda tamponlamayı kapat
+    })
+
+_job_runner = None
+_job_runner_pid = None
+_job_runner_lock = threading.Lock()
+
+def get_job_runner():
+    """Arka plan işleri için süreç başına iş çalıştırıcısı.
+
+    İlk çağrıda kirası dolmuş (ör. yeniden başlatılan worker'dan kalan)
+    işler de yeniden kuyruğa alınır.
+    """
+    global _job_runner, _job_runner_pid
+    if _job_runner is None or _job_runner_pid != os.getpid():
+        with _job_runner_lock:
+            if _job_runner is None or _job_runner_pid != os.getpid():
+                _job_runner = JobRunner(create_job_store_from_env(), analyze_health_query)
+                _job_runner_pid = os.getpid()
+    return _job_runner
+
+# Worker başlarken upstream'e bağlantı açılır (HEALTH_UPSTREAM_PRECONNECT=0 ile kapatılır)
+UPSTREAM_PRECONNECT = os.environ.get("HEALTH_UPSTREAM_PRECONNECT", "1").lower() not in ("0", "off", "false", "no")
+
+def init_worker():
+    """Worker'a özgü kaynakları ilk istekten önce kurar.
+
+    Fork'tan sonra çağrılmalıdır (gunicorn post_worker_init); --preload ile
+    ana süreçte çağrılırsa thread'ler ve bağlantılar worker'lara geçmez,
+    her worker bunları yeniden kurar. İş çalıştırıcısı kurulurken önceki
+    worker'dan kalan işler de hemen yeniden kuyruğa alınır.
+    """
+    started = time.perf_counter()
+    router = get_router()
+    if UPSTREAM_PRECONNECT:
+        # Başlangıcı bekletmemek için arka planda
+        threading.Thread(target=router.preconnect, name="upstream-preconnect", daemon=True).start()
+    get_batch_executor()
+    get_job_runner()
+    STARTUP_SECONDS["init_worker"] = time.perf_counter() - started
+    logger.info("worker ready import=%.0f ms create_app=%.1f ms init_worker=%.1f ms",
+                STARTUP_SECONDS["import"] * 1000, STARTUP_SECONDS.get("create_app", 0) * 1000,
+                STARTUP_SECONDS["init_worker"] * 1000)
+
+metrics.REGISTRY.register(metrics.GaugeFunc(
+    "health_jobs", "Async jobs of this worker", "stat",
+    lambda: _job_runner.stats() if _job_runner is not None and _job_runner_pid == os.getpid() else {}))
+
+@bp.route('/api/health/jobs', methods=['POST'])
+def submit_health_job():
+    """Analizi arka planda başlatır ve iş kimliğini hemen döndürür"""
+    try:
+        data = request.get_json(silent=True)
+        if not data or not isinstance(data, dict):
+            return jsonify({"error": "Geçersiz istek formatı"}), 200
+        if not isinstance(data.get('symptoms'), str):
+            return jsonify({"error": "Semptom bilgisi gerekli"}), 200
+        
+        check_rate(rate_limiter, client_id(request.headers, request.remote_addr))
+        try:
+            job = get_job_runner().submit(data['symptoms'], data.get('should_correct', True),
+                                          data.get('callback_url'))
+        except ValueError as e:
+            return jsonify({"error": str(e), "code": "invalid_callback"}), 200
+        metrics.REQUESTS.inc(endpoint="jobs", outcome="submitted")
+        view = public_view(job)
+        view["poll_url"] = f"/api/health/jobs/{job['id']}"
+        return jsonify(view), 200
+    except Rejected as e:
+        metrics.REQUESTS.inc(endpoint="jobs", outcome=e.code)
+        return json_result(e.as_error())
+    except Exception as e:
+        logger.exception("Unexpected error")
+        return jsonify({"error": f"Sunucu hatası: {str(e)}"}), 200
+
+@bp.route('/api/health/jobs/<job_id>', methods=['GET'])
+def get_health_job(job_id):
+    """İşin durumunu ve (bittiyse) sonucunu döndürür"""
+    try:
+        job = get_job_runner().get(job_id)
+        if job is None:
+            return jsonify({"error": JOB_NOT_FOUND_ERROR, "code": "not_found"}), 200
+        return jsonify(public_view(job)), 200
     except Exception as e:
-        print(f"Unexpected error: {str(e)}")
+        logger.exception("Unexpected error")
         return jsonify({"error": f"Sunucu hatası: {str(e)}"}), 200
 
-@app.route('/')
+@bp.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+@bp.route('/')
 def home():
     return "Neyim Var API is running!"
 
+app = create_app()
+STARTUP_SECONDS["import"] = time.perf_counter() - _import_started
+
 if __name__ == '__main__':
+    init_worker()
     # Lokalde çalıştığınızda
     # app.run(host='0.0.0.0', port=5000, debug=True)
     # Render.com'da çalıştığınızda:
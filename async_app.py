@@ -0,0 +1,179 @@
+"""/api/health için asyncio tabanlı sunucu (aiohttp).
+
+Flask sürümüyle aynı JSON sözleşmesini sunar; yavaş LLM çağrıları bir
+worker thread'ini değil yalnızca bir coroutine'i bekletir. Önbellek ya da
+hız sınırlayıcı SQLite arka ucundaysa dosya erişimi (sorgu hazırlama,
+önbelleğe yazma, hız kontrolü) event loop'u bloklamasın diye thread
+havuzunda çalıştırılır; bellek içi arka uçlarda doğrudan çağrılır.
+
+    python async_app.py
+    gunicorn async_app:create_app --worker-class aiohttp.GunicornWebWorker
+"""
+import asyncio
+import json
+import os
+import time
+
+from aiohttp import web
+
+import metrics
+from admission import (AsyncAdmissionController, Rejected, SQLiteRateLimiter, check_rate, client_id,
+                       retry_after_header)
+from analysis import (INFLIGHT_TIMEOUT, build_payload, prepare_query, rate_limiter, response_cache,
+                      upstream_error, upstream_result, with_corrected_query)
+from cache import SQLiteBackend
+from config import API_KEY, MODEL
+from log import get_logger
+from router import AsyncRouter, load_backends
+from singleflight import AsyncSingleFlight
+
+UPSTREAM = web.AppKey("upstream", AsyncRouter)
+
+async_inflight = AsyncSingleFlight(INFLIGHT_TIMEOUT)
+metrics.REGISTRY.register(metrics.GaugeFunc(
+    "health_async_inflight", "Async single-flight counters of this worker", "stat",
+    async_inflight.stats))
+async_admission = AsyncAdmissionController()
+metrics.REGISTRY.register(metrics.GaugeFunc(
+    "health_async_admission", "Async upstream admission slots of this worker", "stat",
+    async_admission.stats))
+
+logger = get_logger("async_app")
+
+# SQLite arka uçlarında çağrılar dosya kilidi bekleyebilir
+BLOCKING_STORES = (isinstance(getattr(response_cache, "backend", None), SQLiteBackend)
+                   or isinstance(rate_limiter, SQLiteRateLimiter))
+
+
+async def run_blocking(func, *args):
+    """SQLite arka ucu varsa func'ı thread havuzunda, yoksa doğrudan çalıştırır."""
+    if not BLOCKING_STORES:
+        return func(*args)
+    # to_thread bağlamı kopyalar; aşama süreleri (Server-Timing) bu isteğe yazılır
+    return await asyncio.to_thread(func, *args)
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+    "Access-Control-Expose-Headers": "Retry-After, Server-Timing"
+}
+
+
+async def fetch_analysis(client, corrected_query, query_key):
+    """Send one upstream request; returns the parsed result or an error dict"""
+    # Upstream eşzamanlılık tavanı doluysa Rejected fırlatılır
+    async with async_admission.slot():
+        with metrics.stage("upstream_wait"):
+            response = await client.chat_completion(build_payload(corrected_query))
+    return await run_blocking(upstream_result, response, corrected_query, query_key)
+
+
+async def analyze_health_query(client, query, should_correct=True):
+    """Process a health query using the deepseek model (async)"""
+    corrected_query, query_key, result = await run_blocking(prepare_query, query, should_correct)
+    if result is not None:
+        return result
+
+    try:
+        # Aynı sorgu için süren bir çağrı varsa onun sonucu paylaşılır
+        result = await async_inflight.do(query_key,
+                                         lambda: fetch_analysis(client, corrected_query, query_key))
+    except Exception as e:
+        return upstream_error(e, query_key)
+
+    if "error" in result:
+        return result
+    return with_corrected_query(result, query, corrected_query)
+
+
+def json_result(result):
+    """Always 200; admission rejections also carry a Retry-After header"""
+    retry_after = retry_after_header(result)
+    return web.json_response(result, headers=None if retry_after is None else {"Retry-After": retry_after})
+
+
+async def health_analysis(request):
+    # Flask sürümü gibi hatalarda da her zaman 200 döner
+    try:
+        body = await request.read()
+        with metrics.stage("json_decode"):
+            try:
+                data = json.loads(body) if body else None
+            except ValueError:
+                data = None
+        if not data:
+            metrics.REQUESTS.inc(endpoint="health", outcome="bad_request")
+            return web.json_response({"error": "Geçersiz istek formatı"})
+
+        if 'symptoms' not in data:
+            metrics.REQUESTS.inc(endpoint="health", outcome="bad_request")
+            return web.json_response({"error": "Semptom bilgisi gerekli"})
+
+        await run_blocking(check_rate, rate_limiter, client_id(request.headers, request.remote))
+        result = await analyze_health_query(request.app[UPSTREAM], data['symptoms'],
+                                            data.get('should_correct', True))
+        metrics.REQUESTS.inc(endpoint="health", outcome=result.get("code", "error") if "error" in result else "ok")
+        with metrics.stage("serialize"):
+            return json_result(result)
+    except Rejected as e:
+        metrics.REQUESTS.inc(endpoint="health", outcome=e.code)
+        return json_result(e.as_error())
+    except Exception as e:
+        metrics.REQUESTS.inc(endpoint="health", outcome="exception")
+        logger.exception("Unexpected error")
+        return web.json_response({"error": f"Sunucu hatası: {str(e)}"})
+
+
+async def prometheus_metrics(request):
+    return web.Response(body=metrics.REGISTRY.render().encode(),
+                        headers={"Content-Type": metrics.CONTENT_TYPE})
+
+
+async def home(request):
+    return web.Response(text="Neyim Var API is running!")
+
+
+@web.middleware
+async def cors_middleware(request, handler):
+    if request.method == "OPTIONS":
+        return web.Response(headers=CORS_HEADERS)
+    response = await handler(request)
+    response.headers.update(CORS_HEADERS)
+    return response
+
+
+@web.middleware
+async def server_timing_middleware(request, handler):
+    # Handler bu task içinde çalışır; alt task'lar aynı sözlüğü bağlamla devralır
+    timings = metrics.start_timing()
+    started_at = time.perf_counter()
+    response = await handler(request)
+    timings["total"] = time.perf_counter() - started_at
+    response.headers["Server-Timing"] = metrics.server_timing_header(timings)
+    return response
+
+
+async def _upstream_router(app):
+    client = AsyncRouter(load_backends(MODEL, API_KEY))
+    await client.start()
+    app[UPSTREAM] = client
+    yield
+    await client.close()
+
+
+async def create_app():
+    middlewares = [cors_middleware]
+    if metrics.SERVER_TIMING:
+        middlewares.append(server_timing_middleware)
+    app = web.Application(middlewares=middlewares)
+    app.cleanup_ctx.append(_upstream_router)
+    app.router.add_post('/api/health', health_analysis)
+    app.router.add_get('/metrics', prometheus_metrics)
+    app.router.add_get('/', home)
+    return app
+
+
+if __name__ == '__main__':
+    port = int(os.environ.get("PORT", 10000))
+    web.run_app(create_app(), host="0.0.0.0", port=port)
@@ -0,0 +1,70 @@
+"""OpenRouter için asyncio tabanlı (aiohttp) istemci.
+
+Ayarlar ve yeniden deneme politikası `upstream.UpstreamClient` ile aynıdır;
+fark, beklemenin bir thread'i değil yalnızca bir coroutine'i bekletmesidir.
+Böylece tek süreçte yüzlerce analiz aynı anda yanıt bekleyebilir.
+"""
+import asyncio
+import json
+
+import aiohttp
+
+from upstream import RETRY_STATUS_CODES, BaseUpstreamClient, env_int
+
+
+class AsyncResponse:
+    """Gövdesi okunmuş yanıt; `requests.Response` ile aynı alanları sunar."""
+
+    def __init__(self, status_code, headers, text):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncUpstreamClient(BaseUpstreamClient):
+    """aiohttp oturumu ve bağlantı havuzu; oturum çalışan döngü içinde açılır."""
+
+    def __init__(self, pool_size=None, **kwargs):
+        super().__init__(pool_size=pool_size or env_int("UPSTREAM_ASYNC_POOL_SIZE", 256), **kwargs)
+        self.session = None
+
+    async def start(self):
+        connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=None, connect=self.connect_timeout,
+                                        sock_read=self.read_timeout)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def post_json(self, path, payload, api_key):
+        """JSON gövdeli POST isteği gönderir; son yanıtı ya da son hatayı döndürür."""
+        url = self.url(path)
+        headers = self.headers(api_key)
+
+        attempt = 0
+        while True:
+            try:
+                async with self.session.post(url, headers=headers, json=payload) as response:
+                    text = await response.text()
+            except (aiohttp.ClientConnectorError, aiohttp.ServerDisconnectedError):
+                if attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            if response.status in RETRY_STATUS_CODES and attempt < self.max_retries:
+                await asyncio.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
+                attempt += 1
+                continue
+            return AsyncResponse(response.status, response.headers, text)
+
+    async def chat_completion(self, payload, api_key):
+        """/chat/completions uç noktasını çağırır."""
+        return await self.post_json("chat/completions", payload, api_key)
@@ -0,0 +1,89 @@
+"""is_health_related benchmark'ı.
+
+Etiketli test kümesinde (data/classifier_labeled.tsv) eski alt dizgi
+taraması ile derlenmiş sınıflandırıcının doğruluğunu, sorgu başına süresini
+ve sözlük büyüdükçe sorgu maliyetinin değişmediğini gösterir.
+
+Kullanım: python bench/bench_classifier.py [--repeat 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from classifier import CLASSIFIER, DEFAULT_TERMS_PATH, HealthClassifier, load_terms  # noqa: E402
+from legacy_classifier import legacy_is_health_related  # noqa: E402
+
+LABELED_PATH = os.path.join(ROOT_DIR, "data", "classifier_labeled.tsv")
+ALPHABET = "abcçdefgğhıijklmnoöprsştuüvyz"
+
+
+def load_labeled():
+    rows = []
+    with open(LABELED_PATH, encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                label, text = line.rstrip("\n").split("\t", 1)
+                rows.append((label == "1", text))
+    return rows
+
+
+def report_accuracy(name, func, rows):
+    errors = [(label, text) for label, text in rows if func(text) != label]
+    false_pos = sum(1 for label, _ in errors if not label)
+    print(f"{name:<14} doğruluk {1 - len(errors) / len(rows):6.1%}  "
+          f"yanlış pozitif {false_pos:3}  yanlış negatif {len(errors) - false_pos:3}")
+
+
+def time_per_query(func, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(texts))
+
+
+def synthetic_terms(count, rng):
+    """Gerçek sözlüğe rastgele uydurma kök/kelimeler ekler."""
+    terms = load_terms(DEFAULT_TERMS_PATH)
+    for _ in range(count):
+        word = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(4, 10)))
+        terms.append((word + ("*" if rng.random() < 0.5 else ""), rng.choice([1.0, 2.0, -10.0])))
+    return terms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = load_labeled()
+    texts = [text for _, text in rows]
+    print(f"Etiketli küme: {len(rows)} örnek")
+    report_accuracy("eski", legacy_is_health_related, rows)
+    report_accuracy("sınıflandırıcı", CLASSIFIER.is_health_related, rows)
+
+    legacy = time_per_query(legacy_is_health_related, texts, args.repeat)
+    new = time_per_query(CLASSIFIER.is_health_related, texts, args.repeat)
+    print(f"\neski           {legacy * 1e6:8.2f} µs/sorgu")
+    print(f"sınıflandırıcı {new * 1e6:8.2f} µs/sorgu")
+
+    print("\nSözlük boyutu ve sorgu maliyeti:")
+    rng = random.Random(0)
+    for extra in (0, 1000, 10000, 100000):
+        terms = synthetic_terms(extra, rng)
+        start = time.perf_counter()
+        classifier = HealthClassifier(terms)
+        build = time.perf_counter() - start
+        per_query = time_per_query(classifier.is_health_related, texts, args.repeat)
+        print(f"  {len(terms):>7} terim: kurulum {build * 1e3:7.1f} ms, {per_query * 1e6:6.2f} µs/sorgu")
+
+
+if __name__ == "__main__":
+    main()
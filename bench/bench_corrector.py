@@ -0,0 +1,68 @@
+"""correct_turkish_text mikro benchmark'ı.
+
+Önce derlenmiş motorun altın derlemde eski sürümle birebir aynı çıktıyı
+verdiğini doğrular, sonra sorgu başına süreyi karşılaştırır.
+
+Kullanım: python bench/bench_corrector.py [--repeat 20]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from corrector import correct  # noqa: E402
+from legacy_corrector import legacy_correct_turkish_text  # noqa: E402
+
+GOLDEN_PATH = os.path.join(BENCH_DIR, "golden_corrections.jsonl")
+
+
+def load_golden():
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def check_golden(golden):
+    failures = 0
+    for case in golden:
+        actual = correct(case["input"])
+        if actual != case["expected"]:
+            failures += 1
+            print(f"MISMATCH {case['input']!r}: {actual!r} != {case['expected']!r}")
+    return failures
+
+
+def time_per_query(func, queries, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            func(query)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(queries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    golden = load_golden()
+    failures = check_golden(golden)
+    print(f"Altın derlem: {len(golden) - failures}/{len(golden)} birebir aynı")
+    if failures:
+        sys.exit(1)
+
+    queries = [case["input"] for case in golden]
+    legacy = time_per_query(legacy_correct_turkish_text, queries, args.repeat)
+    engine = time_per_query(correct, queries, args.repeat)
+    print(f"eski sürüm : {legacy * 1e6:9.1f} µs/sorgu")
+    print(f"motor      : {engine * 1e6:9.1f} µs/sorgu")
+    print(f"hızlanma   : {legacy / engine:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
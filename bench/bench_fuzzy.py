@@ -0,0 +1,165 @@
+"""Bulanık (fuzzy) düzeltme benchmark'ı.
+
+1. Altın derlem: bulanık aşama kapalıyken correct_turkish_text çıktısının
+   altın derlemle birebir aynı olduğunu doğrular; açıkken değişen çıktıları
+   listeler ve değişmemesi gereken metinlerin (UNCHANGED) varsayılan
+   ayarlarla aynı kaldığını doğrular; isteğe bağlı düzenleme aşaması
+   (HEALTH_FUZZY_EDITS) açıkken değişenleri de gösterir.
+2. Doğruluk: sözlük kelimelerinden rastgele yazım hataları (harf silme,
+   ekleme, değiştirme, yer değiştirme ve ASCII katlama) üretir ve en iyi
+   adayın doğru kelime olma oranını ölçer.
+3. Ölçek: gerçek sözlüğe uydurma kelimeler eklenerek 10k-100k kelimelik
+   sözlüklerde kurulum süresi, bellek ve kelime başına arama süresi ölçülür;
+   10k sözlükte doğrusal tarama ile karşılaştırılır.
+
+Kullanım: python bench/bench_fuzzy.py [--sizes 10000,30000,100000] [--queries 2000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from preprocess import correct_turkish_text  # noqa: E402
+from fuzzy import DEFAULT_LEXICON_PATH, FuzzyCorrector, edit_distance, fold, load_lexicon  # noqa: E402
+
+GOLDEN_PATH = os.path.join(BENCH_DIR, "golden_corrections.jsonl")
+# Varsayılan ayarlarla (düzenleme aşaması kapalı) değişmemesi gereken metinler: doğru Türkçe harfli
+# kelimeler başka biçime çevrilmez, sağlık dışı metin sağlık terimine düzeltilmez
+UNCHANGED = ("dosya açılmıyor", "acılı yemek yedim", "kaşım ağrıyor", "python kodum calismiyor",
+             "para lazim", "kasa acik", "yarim saat bekledim")
+ALPHABET = "abcçdefgğhıijklmnoöprsştuüvyz"
+
+
+def check_golden():
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        golden = [json.loads(line) for line in f if line.strip()]
+    failures = sum(1 for case in golden if correct_turkish_text(case["input"], use_fuzzy=False) != case["expected"])
+    print(f"Altın derlem (bulanık aşama kapalı): {len(golden) - failures}/{len(golden)} birebir aynı")
+    changed = [(case["input"], case["expected"], correct_turkish_text(case["input"], use_fuzzy=True))
+               for case in golden]
+    changed = [row for row in changed if row[1] != row[2]]
+    print(f"Bulanık aşama açıkken değişen çıktı: {len(changed)}")
+    for text, expected, actual in changed[:10]:
+        print(f"  {text!r}: {expected!r} -> {actual!r}")
+
+    broken = [(text, correct_turkish_text(text, use_fuzzy=True)) for text in UNCHANGED]
+    broken = [(text, actual) for text, actual in broken if actual != text]
+    print(f"Değişmemesi gereken metinler: {len(UNCHANGED) - len(broken)}/{len(UNCHANGED)} aynı")
+    for text, actual in broken:
+        print(f"  {text!r} -> {actual!r}")
+    # Düzenleme aşaması isteğe bağlıdır (HEALTH_FUZZY_EDITS); açılırsa neyi bozduğu bilgi olarak gösterilir
+    edited = [(text, correct_turkish_text(text, use_fuzzy=True, use_edits=True)) for text in UNCHANGED]
+    edited = [(text, actual) for text, actual in edited if actual != text]
+    print(f"Düzenleme aşaması açıkken değişen: {len(edited)}/{len(UNCHANGED)}")
+    for text, actual in edited:
+        print(f"  {text!r} -> {actual!r}")
+    return failures + len(broken)
+
+
+def misspell(word, rng):
+    """Kelimeye tek bir rastgele yazım hatası ekler ve yarı yarıya ASCII'ye katlar."""
+    chars = list(word)
+    op = rng.choice(("delete", "insert", "replace", "transpose"))
+    i = rng.randrange(len(chars))
+    if op == "delete" and len(chars) > 4:
+        del chars[i]
+    elif op == "insert":
+        chars.insert(i, rng.choice(ALPHABET))
+    elif op == "transpose" and i < len(chars) - 1:
+        chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    else:
+        chars[i] = rng.choice(ALPHABET)
+    typo = "".join(chars)
+    return fold(typo) if rng.random() < 0.5 else typo
+
+
+def make_queries(lexicon, count, rng):
+    words = [word for word, _ in lexicon if len(word) >= 5 and word.isalpha()]
+    queries = []
+    while len(queries) < count:
+        word = rng.choice(words)
+        typo = misspell(word, rng)
+        if typo != word:
+            queries.append((typo, word))
+    return queries
+
+
+def synthetic_lexicon(size, rng):
+    lexicon = load_lexicon(DEFAULT_LEXICON_PATH)
+    seen = {word for word, _ in lexicon}
+    while len(lexicon) < size:
+        word = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(4, 12)))
+        if word not in seen:
+            seen.add(word)
+            lexicon.append((word, rng.randint(1, 50)))
+    return lexicon
+
+
+def time_lookups(corrector, queries):
+    """Önbellek olmadan kelime başına düzeltme süresi"""
+    start = time.perf_counter()
+    for typo, _ in queries:
+        corrector._correct_lower(typo, True)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def linear_scan(lexicon, folded_query, max_distance):
+    best = None
+    for word, count in lexicon:
+        distance = edit_distance(folded_query, fold(word), max_distance)
+        if distance <= max_distance and (best is None or (distance, -count) < best[0]):
+            best = ((distance, -count), word)
+    return best and best[1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,30000,100000")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    failures = check_golden()
+
+    lexicon = load_lexicon(DEFAULT_LEXICON_PATH)
+    corrector = FuzzyCorrector(lexicon)
+    queries = make_queries(lexicon, args.queries, rng)
+    correct = sum(1 for typo, word in queries if corrector._correct_lower(typo, True) == word)
+    print(f"\nDoğruluk ({len(lexicon)} kelimelik sözlük, tek hatalı {len(queries)} kelime): "
+          f"%{correct / len(queries) * 100:.1f}; {time_lookups(corrector, queries) * 1e6:.1f} µs/kelime\n")
+
+    print(f"{'sözlük':>8} {'kurulum sn':>11} {'bellek MB':>10} {'µs/kelime':>10} {'doğruluk':>9}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        big = synthetic_lexicon(size, rng)
+        tracemalloc.start()
+        start = time.perf_counter()
+        corrector = FuzzyCorrector(big)
+        build = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+        per_word = time_lookups(corrector, queries)
+        correct = sum(1 for typo, word in queries if corrector._correct_lower(typo, True) == word)
+        print(f"{size:>8} {build:>11.1f} {memory:>10.0f} {per_word * 1e6:>10.1f} {correct / len(queries):>9.1%}")
+
+        if size == 10000:
+            sample = queries[:50]
+            start = time.perf_counter()
+            for typo, _ in sample:
+                linear_scan(big, fold(typo), 1 if len(typo) < 7 else 2)
+            print(f"{'':>8} doğrusal tarama: {(time.perf_counter() - start) / len(sample) * 1e6:.0f} µs/kelime")
+        del corrector
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Sohbet geçmişi benchmark'ı: sınırsız liste ile token bütçeli geçmiş.
+
+Yerel sahte OpenRouter'a (prompt uzunluğuyla artan prefill gecikmesiyle)
+uzun bir sohbet oturumu sürer ve belirli turlarda istek boyutunu, tahmini
+prompt token'ını ve tur süresini karşılaştırır. Eski davranışta bu
+değerler tur sayısıyla doğrusal büyür; ConversationHistory ile sabit kalır.
+
+Kullanım: python bench/bench_history.py [--turns 200] [--prefill-latency 0.01]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_openrouter import start_in_thread  # noqa: E402
+
+SYSTEM_PROMPT = """Sen bir sağlık asistanısın. Kullanıcının sağlık şikayetlerini dinleyip,
+olası nedenleri ve önerileri sunacaksın. Her zaman şu formatta yanıt ver:
+1. Olası Nedenler:
+2. Öneriler:
+3. Ne Zaman Doktora Gitmelisiniz:"""
+
+
+class UnboundedHistory:
+    """de.py'nin eski davranışı: her tur listeye eklenir ve hepsi gönderilir."""
+
+    def __init__(self, system_prompt):
+        self._messages = [{"role": "system", "content": system_prompt}]
+
+    def append(self, role, content):
+        self._messages.append({"role": role, "content": content})
+
+    def messages(self):
+        return self._messages
+
+
+def load_complaints():
+    with open(os.path.join(BENCH_DIR, "complaints.txt"), encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def run_session(history, complaints, turns, checkpoints):
+    import upstream
+    rows = {}
+    for turn in range(1, turns + 1):
+        history.append("user", complaints[turn % len(complaints)])
+        payload = {"model": "bench", "messages": history.messages(), "temperature": 0.3}
+        start = time.perf_counter()
+        response = upstream.chat_completion(payload, "bench-key")
+        body = response.json()
+        elapsed = time.perf_counter() - start
+        history.append("assistant", body["choices"][0]["message"]["content"])
+        if turn in checkpoints:
+            rows[turn] = (len(json.dumps(payload, ensure_ascii=False).encode()),
+                          body["usage"]["prompt_tokens"], elapsed)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--prefill-latency", type=float, default=0.01,
+                        help="sahte sunucuda 1000 prompt token'ı başına gecikme (sn)")
+    parser.add_argument("--max-tokens", type=int, default=2000)
+    args = parser.parse_args()
+
+    server = start_in_thread(prefill_latency=args.prefill_latency)
+    os.environ["OPENROUTER_BASE_URL"] = server.base_url
+    from history import ConversationHistory
+
+    complaints = load_complaints()
+    checkpoints = sorted({1, 10, 25, 50, 100, 200, args.turns} & set(range(1, args.turns + 1)))
+    unbounded = run_session(UnboundedHistory(SYSTEM_PROMPT), complaints, args.turns, checkpoints)
+    bounded_history = ConversationHistory(SYSTEM_PROMPT, max_tokens=args.max_tokens)
+    bounded = run_session(bounded_history, complaints, args.turns, checkpoints)
+
+    print(f"{'tur':>5} | {'sınırsız bayt':>13} {'token':>7} {'süre ms':>8} | "
+          f"{'bütçeli bayt':>12} {'token':>6} {'süre ms':>8}")
+    for turn in checkpoints:
+        u_bytes, u_tokens, u_time = unbounded[turn]
+        b_bytes, b_tokens, b_time = bounded[turn]
+        print(f"{turn:>5} | {u_bytes:>13} {u_tokens:>7} {u_time * 1000:>8.1f} | "
+              f"{b_bytes:>12} {b_tokens:>6} {b_time * 1000:>8.1f}")
+    print(f"\nbütçe {args.max_tokens} token; özetlenen mesaj {bounded_history.summarized}, "
+          f"özetten atılan satır {bounded_history.dropped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Bölüm ayrıştırıcı benchmark'ı.
+
+Kaydedilmiş uzun model yanıtlarında tek geçişli `response_parser.parse`
+ile eski 12 regex'lik zinciri karşılaştırır. Sırası doğru yanıtlarda iki
+çıktının aynı olduğunu doğrular; sırası bozuk/eksik başlıklı yanıtlarda
+farklı çıkan alanları listeler.
+
+Kullanım: python bench/bench_parser.py [--repeat 200]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import response_parser  # noqa: E402
+from legacy_parser import legacy_parse_ai_response  # noqa: E402
+
+RECORDED_PATH = os.path.join(BENCH_DIR, "recorded_completions.jsonl")
+
+
+def load_recorded():
+    with open(RECORDED_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def time_per_call(func, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'yanıt':<26}{'boyut':>8}{'eski µs':>10}{'yeni µs':>10}{'hız':>7}  fark")
+    for record in load_recorded():
+        text = record["completion"]
+        legacy = legacy_parse_ai_response(text)
+        new = response_parser.parse(text).as_dict()
+        diff = [field for field in response_parser.FIELDS if legacy[field] != new[field]]
+        if record["in_order"] and diff:
+            failed = True
+
+        legacy_time = time_per_call(legacy_parse_ai_response, text, args.repeat)
+        new_time = time_per_call(response_parser.parse, text, args.repeat)
+        print(f"{record['name']:<26}{len(text):>8}{legacy_time * 1e6:>10.1f}{new_time * 1e6:>10.1f}"
+              f"{legacy_time / new_time:>6.1f}x  {', '.join(diff) or '-'}")
+
+    if failed:
+        print("HATA: sırası doğru bir yanıtta çıktılar farklı")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Upstream yönlendirici benchmark'ı: hedged istek ve devre kesici.
+
+Gecikmesi ve hata oranı enjekte edilmiş yerel sahte backend'ler başlatır.
+
+1. Hedging: birincil backend isteklerin bir kısmında çok yavaş yanıt verir.
+   Tek backend ile router (birincil + yedek, p95'te hedge) arasında
+   p50/p95/p99 gecikme ve yedeğe giden ek yük karşılaştırılır.
+2. Devre kesici: birincil backend sürekli 503 döner; kaç istekten sonra
+   devrenin açıldığı ve sonrasında birincile kaç istek gittiği gösterilir.
+
+Kullanım: python bench/bench_router.py [--requests 400] [--concurrency 8]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_openrouter import start_in_thread  # noqa: E402
+from router import BREAKER_TRIPS, Backend, Router  # noqa: E402
+
+PAYLOAD = {"model": "bench", "messages": [{"role": "user", "content": "başım ağrıyor"}],
+           "temperature": 0.3}
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def drive(router, count, concurrency):
+    def one(_):
+        start = time.perf_counter()
+        response = router.chat_completion(PAYLOAD)
+        return time.perf_counter() - start, response.status_code
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(one, range(count)))
+
+
+def report(name, results):
+    latencies = [elapsed for elapsed, _ in results]
+    ok = sum(1 for _, status in results if status == 200)
+    print(f"{name:<24} başarılı {ok:4}/{len(results):<4} p50 {percentile(latencies, 0.5) * 1000:7.1f} ms  "
+          f"p95 {percentile(latencies, 0.95) * 1000:7.1f} ms  p99 {percentile(latencies, 0.99) * 1000:7.1f} ms")
+
+
+def backend(name, server, **kwargs):
+    return Backend(name, name, "bench-key", base_url=server.base_url, max_retries=0, **kwargs)
+
+
+def bench_hedging(args):
+    print(f"== Hedging: birincil %{args.slow_rate * 100:g} oranında +{args.slow_latency:g} sn gecikiyor ==")
+    primary = start_in_thread(latency=0.05, slow_rate=args.slow_rate, slow_latency=args.slow_latency, seed=1)
+    secondary = start_in_thread(latency=0.08)
+
+    single = Router([backend("primary", primary)])
+    report("tek backend", drive(single, args.requests, args.concurrency))
+
+    hedged = Router([backend("primary", primary), backend("secondary", secondary)])
+    # Gecikme yüzdeliği oluşsun diye önce kısa bir ısınma
+    drive(hedged, 40, args.concurrency)
+    primary_before, secondary_before = primary.request_count, secondary.request_count
+    report("router (p95 hedge)", drive(hedged, args.requests, args.concurrency))
+    extra = secondary.request_count - secondary_before
+    print(f"{'':<24} birincile {primary.request_count - primary_before} istek, "
+          f"yedeğe {extra} hedge isteği (ek yük %{extra / args.requests * 100:.1f})\n")
+
+
+def bench_breaker(args):
+    print("== Devre kesici: birincil her istekte 503 dönüyor ==")
+    primary = start_in_thread(latency=0.01, error_rate=1.0, error_status=503)
+    secondary = start_in_thread(latency=0.02)
+    router = Router([backend("primary", primary), backend("secondary", secondary)])
+    breaker = router.backends[0].breaker
+    breaker.cooldown = args.cooldown
+
+    start = time.perf_counter()
+    results = drive(router, args.requests // 2, 1)
+    elapsed = time.perf_counter() - start
+    report("router", results)
+    print(f"{'':<24} {elapsed:.1f} sn içinde birincile {primary.request_count} istek gitti: "
+          f"eşiğe kadar {breaker.failure_threshold}, sonrası her {args.cooldown:g} sn'de bir deneme isteği; "
+          f"devre {BREAKER_TRIPS.value(backend='primary'):g} kez açıldı, yedeğe {secondary.request_count} istek")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=2.0)
+    parser.add_argument("--cooldown", type=float, default=1.0)
+    args = parser.parse_args()
+
+    bench_hedging(args)
+    bench_breaker(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Kök anahtarlı benzerlik önbelleği (semantic.py) benchmark'ı.
+
+1. Çiftler: bench/paraphrases.tsv'deki etiketli çiftler (ikisi de sunucudaki
+   gibi düzeltilerek) için isabet oranı (aynı soruların yeniden kullanılma
+   oranı) ve yanlış eşleşme sayısı raporlanır. Yanlış eşleşme farklı bir
+   soruya başka sorunun yanıtının verilmesi demektir; sıfır olmalıdır.
+   Iskalanan aynı çiftler de örnek olarak listelenir.
+2. Gerileme: farklı organ ya da belirti taşıyan sorgular (incelemede
+   yanlış eşleştiği görülen çiftler ve organ x belirti taraması) hiç
+   eşleşmemelidir; eşleşen olursa betik hata koduyla çıkar.
+3. İsabet oranı: bench/complaints.txt ve çiftlerin tüm sorguları sırayla
+   sunucudaki gibi oynatılır; yalnızca tam anahtarlı önbellekle ve kök
+   anahtarlı dizin eklenmişken upstream'e gitmeden yanıtlanan sorgu oranı
+   karşılaştırılır.
+4. Arama süresi: dizin 1k-20k kayıtla doldurulup sorgu başına ekleme ve
+   arama süresi ölçülür.
+
+Kullanım: python bench/bench_semantic.py [--sizes 1000,5000,20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from cache import make_key  # noqa: E402
+from preprocess import correct_turkish_text, is_health_related  # noqa: E402
+from semantic import SemanticIndex  # noqa: E402
+
+PAIRS_PATH = os.path.join(BENCH_DIR, "paraphrases.tsv")
+COMPLAINTS_PATH = os.path.join(BENCH_DIR, "complaints.txt")
+# Klinik olarak farklı olduğu halde eski vektör eşiğiyle eşleşen çiftler
+REGRESSION_PAIRS = [
+    ("testisim şişti", "testisim ağrıyor"),
+    ("belim morardı", "elim morardı"),
+    ("kulağım kaşınıyor", "kulağım ağrıyor"),
+    ("makatım kanıyor", "makatım kaşınıyor"),
+    ("kaşım ağrıyor", "kasım ağrıyor"),
+]
+BODY_PARTS = ["başım", "kolum", "elim", "belim", "bacağım", "dizim", "kulağım", "gözüm", "boğazım", "karnım",
+              "göğsüm", "sırtım", "testisim", "makatım", "dişim", "boynum", "ayağım", "midem"]
+SYMPTOMS = ["ağrıyor", "şişti", "morardı", "kaşınıyor", "kanıyor", "yanıyor", "uyuşuyor", "kızardı",
+            "sızlıyor", "titriyor"]
+
+
+def load_pairs():
+    pairs = []
+    with open(PAIRS_PATH, encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                label, a, b = line.rstrip("\n").split("\t")
+                pairs.append((label == "1", correct_turkish_text(a), correct_turkish_text(b)))
+    return pairs
+
+
+def matches(a, b):
+    """a dizindeyken b ile arama a'yı bulursa True."""
+    index = SemanticIndex(4)
+    index.add(a, "a")
+    return index.search(b) == "a"
+
+
+def bench_pairs():
+    scored = [(same, matches(a, b), a, b) for same, a, b in load_pairs()]
+    positives = sum(1 for same, *_ in scored if same)
+    hits = sum(1 for same, found, *_ in scored if same and found)
+    wrong = [(a, b) for same, found, a, b in scored if not same and found]
+    print(f"== Çiftler: {positives} aynı, {len(scored) - positives} farklı soru çifti ==")
+    print(f"isabet: {hits / positives:.0%}, yanlış eşleşme: {len(wrong)}")
+    for a, b in wrong[:10]:
+        print(f"  yanlış: {a!r} ~ {b!r}")
+    missed = [(a, b) for same, found, a, b in scored if same and not found]
+    print("Iskalanan aynı çiftler:")
+    for a, b in missed[:5]:
+        print(f"  {a!r} ~ {b!r}")
+    return wrong
+
+
+def bench_regression():
+    """Farklı organ/belirti çiftlerinden eşleşenlerin listesi."""
+    queries = [f"{part} {symptom}" for part in BODY_PARTS for symptom in SYMPTOMS]
+    pairs = REGRESSION_PAIRS + [(a, b) for i, a in enumerate(queries) for b in queries[i + 1:]]
+    wrong = [(a, b) for a, b in pairs if matches(correct_turkish_text(a), correct_turkish_text(b))]
+    print(f"\n== Gerileme: {len(pairs)} farklı organ/belirti çifti ==")
+    print(f"yanlış eşleşme: {len(wrong)}")
+    for a, b in wrong[:10]:
+        print(f"  {a!r} ~ {b!r}")
+    return wrong
+
+
+def bench_replay():
+    with open(COMPLAINTS_PATH, encoding="utf-8") as f:
+        queries = [line.strip() for line in f if line.strip()]
+    with open(PAIRS_PATH, encoding="utf-8") as f:
+        queries += [query for line in f if line.strip() and not line.startswith("#")
+                    for query in line.rstrip("\n").split("\t")[1:]]
+    corrected = [text for text in map(correct_turkish_text, queries) if is_health_related(text)]
+
+    index = SemanticIndex(5000)
+    seen = set()
+    exact = semantic = 0
+    for text in corrected:
+        key = make_key(text, "model", 0.3, 1)
+        if key in seen:
+            exact += 1
+            continue
+        if index.search(text) is not None:
+            semantic += 1
+            continue
+        seen.add(key)
+        index.add(text, key)
+    print(f"\n== İsabet oranı: {len(corrected)} sağlık sorgusu sırayla ==")
+    print(f"tam anahtar: %{exact / len(corrected) * 100:.1f}, "
+          f"tam anahtar + kök anahtarı: %{(exact + semantic) / len(corrected) * 100:.1f} "
+          f"(upstream çağrısı {len(corrected) - exact} -> {len(corrected) - exact - semantic})")
+
+
+def synthetic_queries(count, rng):
+    with open(COMPLAINTS_PATH, encoding="utf-8") as f:
+        words = [word for line in f for word in line.split()]
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(2, 7))) for _ in range(count)]
+
+
+def bench_lookup(sizes):
+    rng = random.Random(5)
+    probes = synthetic_queries(500, rng)
+    print("\n== Arama süresi ==")
+    print(f"{'kayıt':>8}{'ekleme µs':>11}{'arama µs':>10}")
+    for size in sizes:
+        index = SemanticIndex(size)
+        texts = synthetic_queries(size, rng)
+        start = time.perf_counter()
+        for i, text in enumerate(texts):
+            index.add(text, str(i))
+        add = (time.perf_counter() - start) / size
+        start = time.perf_counter()
+        for text in probes:
+            index.search(text)
+        search = (time.perf_counter() - start) / len(probes)
+        print(f"{size:>8}{add * 1e6:>11.1f}{search * 1e6:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,5000,20000")
+    args = parser.parse_args()
+
+    wrong = bench_pairs()
+    wrong += bench_regression()
+    bench_replay()
+    bench_lookup([int(size) for size in args.sizes.split(",")])
+    if wrong:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Soğuk başlangıç benchmark'ı: import, ilk istek ve preload bellek paylaşımı.
+
+1. Süreç içi: her turda yeni bir Python süreci app modülünü yükler,
+   `init` modunda (varsa) init_worker()'ı çağırır ve sahte upstream'e
+   giden iki /api/health isteği gönderir (önbellek kapalı, her istek
+   farklı). Import süresi, ilk ve ikinci isteğin süresi medyan olarak
+   raporlanır.
+2. gunicorn: --workers N ile (--preload'lı ve preload'sız) başlatılan
+   sunucunun ilk yanıtı verene kadar geçen süre, ilk isteğin süresi ve
+   worker başına bellek (PSS; USS = yalnızca o worker'a ait sayfalar)
+   ölçülür.
+
+--app-dir ile başka bir çalışma ağacı (ör. `git worktree add /tmp/eski HEAD~1`)
+aynı ölçümlerle karşılaştırılabilir.
+
+Kullanım: python bench/bench_startup.py [--runs 5] [--workers 4] [--app-dir .]
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_openrouter import start_in_thread  # noqa: E402
+
+# Yeni süreçte çalışır; eski ağaçlarda init_worker / STARTUP_SECONDS olmayabilir
+CHILD = r"""
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+init = getattr(app, "init_worker", None)
+if init is not None and sys.argv[1] == "init":
+    init()
+ready = time.perf_counter()
+# Arka plandaki upstream ön bağlantısı için; gerçek worker'da ilk istek de hemen gelmez
+time.sleep(0.2)
+client = app.app.test_client()
+timings = []
+for i in range(2):
+    t0 = time.perf_counter()
+    body = client.post("/api/health", json={"symptoms": f"başım ağrıyor {i}"}).get_json()
+    assert "error" not in body, body
+    timings.append(time.perf_counter() - t0)
+print(json.dumps({"import": imported - started, "init": ready - imported,
+                  "first": timings[0], "second": timings[1]}))
+"""
+
+
+def server_env(fake, tmp):
+    return dict(os.environ, OPENROUTER_BASE_URL=fake.base_url, API_KEY="fake-key", HEALTH_CACHE_BACKEND="off",
+                HEALTH_SNAPSHOT_PATH="", HEALTH_JOBS_PATH=os.path.join(tmp, "jobs.sqlite3"),
+                LOG_LEVEL="WARNING")
+
+
+def bench_in_process(app_dir, env, runs):
+    print(f"== Süreç içi ({runs} tur, medyan ms) ==")
+    print(f"{'mod':<12}{'import':>9}{'init':>8}{'ilk istek':>11}{'ikinci':>9}")
+    for mode in ("lazy", "init"):
+        rows = []
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, "-c", CHILD, mode], cwd=app_dir, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            rows.append(json.loads(output.strip().splitlines()[-1]))
+        median = {key: statistics.median(row[key] for row in rows) * 1000 for key in rows[0]}
+        print(f"{mode:<12}{median['import']:>9.0f}{median['init']:>8.1f}{median['first']:>11.1f}"
+              f"{median['second']:>9.1f}")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def memory_kb(pid):
+    """(PSS, USS) kB; /proc/<pid>/smaps_rollup"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields["Pss"], fields["Private_Clean"] + fields["Private_Dirty"]
+
+
+def worker_pids(master_pid):
+    output = subprocess.run(["pgrep", "-P", str(master_pid)], capture_output=True, text=True).stdout
+    return [int(pid) for pid in output.split()]
+
+
+def bench_gunicorn(app_dir, env, workers, preload):
+    port = free_port()
+    args = [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}", "--workers", str(workers),
+            "--worker-class", "gthread", "--threads", "4"]
+    if preload:
+        args.append("--preload")
+    started = time.perf_counter()
+    proc = subprocess.Popen(args + ["app:app"], cwd=app_dir, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}/api/health"
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                t0 = time.perf_counter()
+                body = requests.post(url, json={"symptoms": "başım ağrıyor"}, timeout=10).json()
+                first = time.perf_counter() - t0
+                break
+            except requests.ConnectionError:
+                if time.time() > deadline:
+                    raise RuntimeError("sunucu başlatılamadı")
+                time.sleep(0.02)
+        ready = time.perf_counter() - started
+        assert "error" not in body, body
+        # Tüm worker'lar ayağa kalkıp birer istek görsün
+        time.sleep(1.0)
+        session = requests.Session()
+        for i in range(workers * 8):
+            session.post(url, json={"symptoms": f"başım ağrıyor {i}"}, timeout=10)
+        memory = [memory_kb(pid) for pid in worker_pids(proc.pid)]
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait()
+    return ready, first, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--app-dir", default=ROOT_DIR, help="ölçülecek çalışma ağacı")
+    args = parser.parse_args()
+
+    fake = start_in_thread(latency=0.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        env = server_env(fake, tmp)
+        bench_in_process(args.app_dir, env, args.runs)
+
+        print(f"\n== gunicorn, {args.workers} worker ==")
+        print(f"{'mod':<12}{'ilk yanıt ms':>13}{'ilk istek ms':>13}{'PSS MB/worker':>15}{'USS MB/worker':>15}")
+        for preload in (False, True):
+            ready, first, memory = bench_gunicorn(args.app_dir, env, args.workers, preload)
+            pss = statistics.mean(m[0] for m in memory) / 1024
+            uss = statistics.mean(m[1] for m in memory) / 1024
+            print(f"{'preload' if preload else 'normal':<12}{ready * 1000:>13.0f}{first * 1000:>13.1f}"
+                  f"{pss:>15.1f}{uss:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
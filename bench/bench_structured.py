@@ -0,0 +1,154 @@
+"""Düzyazı ve yapılandırılmış (JSON) yanıt modlarının karşılaştırması.
+
+Kaydedilmiş her düzyazı yanıtın (recorded_completions.jsonl) JSON modundaki
+karşılığı, aynı alanların structured.FIELD_LIMITS sınırlarına kısaltılıp
+JSON olarak yazılmasıyla türetilir (şemaya uyan bir modelin yanıtı gibi).
+
+1. Token ve ayrıştırma: yanıt başına tahmini token (history.estimate_tokens),
+   sistem prompt'u ve şemanın token'ı, ayrıştırma süresi (response_parser
+   ile structured; orjson kuruluysa standart json ile de) ölçülür. JSON
+   yanıtın alanlarının düzyazıdan kısaltılan alanlarla aynı olduğu ve
+   geçersiz yanıtların düzyazı ayrıştırıcısına düştüğü doğrulanır.
+2. Uçtan uca: sahte upstream yanıt token'ı başına gecikmeyle (decode)
+   çalıştırılır; her modda gunicorn ile başlatılan sunucuya her kayıtlı
+   yanıt için istekler gönderilip gecikme ölçülür (önbellek kapalı).
+
+Kullanım: python bench/bench_structured.py [--requests 3] [--decode-latency 1.0] [--no-e2e]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import response_parser  # noqa: E402
+import structured  # noqa: E402
+from analysis import SYSTEM_PROMPT  # noqa: E402
+from fake_openrouter import start_in_thread  # noqa: E402
+from history import estimate_tokens  # noqa: E402
+from load_async import start_server  # noqa: E402
+
+RECORDED_PATH = os.path.join(BENCH_DIR, "recorded_completions.jsonl")
+
+
+def load_recorded():
+    with open(RECORDED_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def to_structured(completion):
+    """Düzyazı yanıtın alanlarından şemaya uyan JSON yanıtı türetir."""
+    analysis = response_parser.parse(completion)
+    fields = {field: structured.clip(getattr(analysis, field), limit)
+              for field, limit in structured.FIELD_LIMITS.items()}
+    return json.dumps(fields, ensure_ascii=False), fields
+
+
+def time_per_call(func, text, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_tokens(recorded):
+    print("== Token ve ayrıştırma ==")
+    print(f"sistem prompt'u: düzyazı {estimate_tokens(SYSTEM_PROMPT)} token, JSON "
+          f"{estimate_tokens(structured.SYSTEM_PROMPT)} + şema "
+          f"{estimate_tokens(json.dumps(structured.RESPONSE_FORMAT, ensure_ascii=False))} token")
+    header = f"{'yanıt':<26}{'düzyazı tok':>12}{'JSON tok':>10}{'düzyazı µs':>12}{'JSON µs':>9}"
+    if structured.orjson is not None:
+        # JSON µs orjson ile; bu sütun standart json ile
+        header += f"{'std json µs':>13}"
+    print(header)
+    totals = [0, 0]
+    for record in recorded:
+        text, fields = to_structured(record["completion"])
+        parsed = structured.parse(text)
+        assert {field: getattr(parsed, field) for field in fields} == fields, record["name"]
+        prose_tokens, json_tokens = estimate_tokens(record["completion"]), estimate_tokens(text)
+        totals[0] += prose_tokens
+        totals[1] += json_tokens
+        row = (f"{record['name']:<26}{prose_tokens:>12}{json_tokens:>10}"
+               f"{time_per_call(response_parser.parse, record['completion']) * 1e6:>12.1f}"
+               f"{time_per_call(structured.parse, text) * 1e6:>9.1f}")
+        if structured.orjson is not None:
+            loads, structured._loads = structured._loads, json.loads
+            try:
+                row += f"{time_per_call(structured.parse, text) * 1e6:>13.1f}"
+            finally:
+                structured._loads = loads
+        print(row)
+    print(f"{'toplam':<26}{totals[0]:>12}{totals[1]:>10}")
+
+    # Geçersiz yanıtlar düzyazı ayrıştırıcısına düşer
+    sample = recorded[0]["completion"]
+    text, fields = to_structured(sample)
+    cases = {
+        "düzyazı": (sample, response_parser.parse(sample)),
+        "yarım JSON": (text[:len(text) // 2], response_parser.parse(text[:len(text) // 2])),
+        "```json bloğu": (f"```json\n{text}\n```", structured.parse(text)),
+    }
+    for name, (answer, expected) in cases.items():
+        assert structured.parse(answer) == expected, name
+    print(f"geçersiz/sarılmış yanıtlar doğrulandı: {', '.join(cases)}")
+
+
+def bench_e2e(recorded, args):
+    fake = start_in_thread(decode_latency=args.decode_latency)
+    print(f"\n== Uçtan uca: 1000 yanıt token'ı başına {args.decode_latency:g} sn, "
+          f"kayıt başına {args.requests} istek ==")
+    print(f"{'mod':<10}{'ort. yanıt tok':>15}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    counter = 0
+    for mode in ("text", "json"):
+        env = dict(os.environ, OPENROUTER_BASE_URL=fake.base_url, API_KEY="fake-key", HEALTH_CACHE_BACKEND="off",
+                   HEALTH_SNAPSHOT_PATH="", HEALTH_RESPONSE_FORMAT=mode, LOG_LEVEL="WARNING")
+        proc, base_url = start_server(["--workers", "1", "--worker-class", "gthread", "--threads", "4",
+                                       "app:app"], env)
+        latencies = []
+        tokens = []
+        try:
+            session = requests.Session()
+            for record in recorded:
+                fake.answer = record["completion"]
+                fake.json_answer = to_structured(record["completion"])[0]
+                answer = fake.json_answer if mode == "json" else fake.answer
+                for _ in range(args.requests):
+                    counter += 1
+                    start = time.perf_counter()
+                    body = session.post(f"{base_url}/api/health",
+                                        json={"symptoms": f"başım ağrıyor {counter}"}).json()
+                    latencies.append(time.perf_counter() - start)
+                    assert "error" not in body and body["causes"], body
+                    tokens.append(len(answer) // 4)
+        finally:
+            proc.terminate()
+            proc.wait()
+        latencies.sort()
+        print(f"{mode:<10}{statistics.mean(tokens):>15.0f}{latencies[len(latencies) // 2] * 1000:>10.0f}"
+              f"{latencies[int(len(latencies) * 0.95)] * 1000:>10.0f}{latencies[-1] * 1000:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3, help="kayıtlı yanıt başına istek (uçtan uca)")
+    parser.add_argument("--decode-latency", type=float, default=1.0,
+                        help="sahte upstream'de 1000 yanıt token'ı başına gecikme (sn)")
+    parser.add_argument("--no-e2e", action="store_true", help="uçtan uca ölçümü atla")
+    args = parser.parse_args()
+
+    recorded = load_recorded()
+    bench_tokens(recorded)
+    if not args.no_e2e:
+        bench_e2e(recorded, args)
+
+
+if __name__ == "__main__":
+    main()
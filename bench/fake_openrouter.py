@@ -0,0 +1,252 @@
+"""OpenRouter yerine geçen yerel sahte chat-completions sunucusu.
+
+Testlerde ve yük benchmark'larında gerçek API'ye gitmeden çalışmak için:
+
+    python bench/fake_openrouter.py --port 8090 --latency 0.5
+    OPENROUTER_BASE_URL=http://127.0.0.1:8090/api/v1 python app.py
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_ANSWER = """1. Olası Nedenler:
+Gerilim tipi baş ağrısı, uykusuzluk, yetersiz sıvı alımı veya migren olabilir.
+
+2. Öneriler:
+Bol su için, düzenli uyuyun ve ekran karşısında geçirdiğiniz süreyi azaltın.
+
+3. Ne Zaman Doktora Gitmelisiniz:
+Ağrı üç günden uzun sürerse veya giderek artarsa doktora başvurun.
+
+4. Hangi Branşa Gitmelisiniz:
+Nöroloji veya Dahiliye.
+
+5. Acil Servise Gitmem Gerekir mi?:
+Ani ve çok şiddetli ağrı, bilinç bulanıklığı veya kol-bacakta güçsüzlük varsa evet.
+
+6. Evde Nelere Dikkat Etmeliyim?:
+Sessiz ve karanlık bir ortamda dinlenin, kafein tüketimini sınırlayın.
+
+7. Ne Kadar Sürede Geçmeli?:
+Genellikle birkaç saat ile iki gün arasında geçer.
+
+8. Bu Belirtiler Stres Kaynaklı Olabilir mi?:
+Evet, stres gerilim tipi baş ağrısının en sık nedenlerindendir.
+
+9. Bu Belirtiler Hangi Hastalıklarla Karıştırılabilir?:
+Migren, sinüzit ve yüksek tansiyon ile karıştırılabilir.
+
+10. Bu Belirtiler Ciddi mi?:
+Çoğunlukla ciddi değildir ancak uyarı belirtilerine dikkat edilmelidir.
+
+11. Bu Durumda İlaç Kullanmalı mıyım?:
+Doktorunuza veya eczacınıza danışarak basit ağrı kesiciler kullanılabilir.
+
+12. Bu Durum Bulaşıcı mı?:
+Hayır, baş ağrısı bulaşıcı değildir.
+
+ÖNEMLİ: Bu bilgiler sadece bilgilendirme amaçlıdır ve kesinlikle tıbbi tavsiye değildir."""
+
+# response_format istendiğinde dönen yapılandırılmış yanıt (CANNED_ANSWER'ın alanları)
+CANNED_JSON_ANSWER = json.dumps({
+    "causes": "Gerilim tipi baş ağrısı, uykusuzluk, yetersiz sıvı alımı veya migren olabilir.",
+    "recommendations": "Bol su için, düzenli uyuyun ve ekran karşısında geçirdiğiniz süreyi azaltın.",
+    "when_to_see_doctor": "Ağrı üç günden uzun sürerse veya giderek artarsa doktora başvurun.",
+    "which_specialist": "Nöroloji veya Dahiliye.",
+    "emergency_visit": "Ani ve çok şiddetli ağrı, bilinç bulanıklığı veya kol-bacakta güçsüzlük varsa evet.",
+    "home_care": "Sessiz ve karanlık bir ortamda dinlenin, kafein tüketimini sınırlayın.",
+    "duration": "Genellikle birkaç saat ile iki gün arasında geçer.",
+    "stress_related": "Evet, stres gerilim tipi baş ağrısının en sık nedenlerindendir.",
+    "similar_conditions": "Migren, sinüzit ve yüksek tansiyon ile karıştırılabilir.",
+    "severity": "Çoğunlukla ciddi değildir ancak uyarı belirtilerine dikkat edilmelidir.",
+    "medication": "Doktorunuza veya eczacınıza danışarak basit ağrı kesiciler kullanılabilir.",
+    "contagious": "Hayır, baş ağrısı bulaşıcı değildir."
+}, ensure_ascii=False)
+
+
+class FakeOpenRouterHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Başlık ve gövde ayrı yazıldığından Nagle + gecikmeli ACK ~40 ms ekliyordu
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_stream(self, payload):
+        """Yanıtı kelime kelime SSE parçaları olarak (chunked) gönderir."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        # İlk token gecikmesi, ardından parça başına sabit gecikme
+        time.sleep(self.server.latency)
+        self._write_chunk(b": OPENROUTER PROCESSING\n\n")
+        for token in re.findall(r"\S+\s*", self.server.answer):
+            chunk = {
+                "id": "fake-completion",
+                "model": payload.get("model"),
+                "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]
+            }
+            self._write_chunk(b"data: " + json.dumps(chunk, ensure_ascii=False).encode("utf-8") + b"\n\n")
+            time.sleep(self.server.chunk_delay)
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def do_HEAD(self):
+        # UpstreamClient.preconnect bağlantıyı açık tutabilsin diye
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        self.server.record_request(payload)
+        # Sağlayıcının eşzamanlılık sınırı: fazlası sırada bekler ve gecikme artar
+        with self.server.slots:
+            self._handle_post(payload)
+
+    def _handle_post(self, payload):
+
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        # Enjekte edilen hata: istenen oranda 429/5xx döner
+        if self.server.error_rate and self.server.roll() < self.server.error_rate:
+            time.sleep(self.server.latency)
+            self._send_json(self.server.error_status, {"error": {"message": "injected error",
+                                                                 "code": self.server.error_status}})
+            return
+
+        if payload.get("stream"):
+            self._send_stream(payload)
+            return
+
+        # Enjekte edilen yavaşlık: istenen oranda yanıt slow_latency kadar geç gelir
+        if self.server.slow_rate and self.server.roll() < self.server.slow_rate:
+            time.sleep(self.server.slow_latency)
+
+        answer = self.server.json_answer if payload.get("response_format") else self.server.answer
+        # Kaba token tahmini: ~4 karakter / token
+        prompt_tokens = sum(len(m.get("content", "")) for m in payload.get("messages", [])) // 4
+        completion_tokens = len(answer) // 4
+        # Uzun prompt'ların işlenme (prefill) ve yanıtın üretilme (decode) süreleri
+        # 1000 token başına prefill_latency / decode_latency ile taklit edilir
+        time.sleep(self.server.latency + self.server.prefill_latency * prompt_tokens / 1000
+                   + self.server.decode_latency * completion_tokens / 1000)
+        self._send_json(200, {
+            "id": "fake-completion",
+            "model": payload.get("model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": answer},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens}
+        })
+
+
+class FakeOpenRouterServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Yük testlerinde yüzlerce eşzamanlı bağlantı kabul edilebilsin
+    request_queue_size = 1024
+
+    def __init__(self, address, latency=0.0, chunk_delay=0.0, answer=CANNED_ANSWER, prefill_latency=0.0,
+                 slow_rate=0.0, slow_latency=0.0, error_rate=0.0, error_status=503, seed=None,
+                 max_concurrency=0, json_answer=CANNED_JSON_ANSWER, decode_latency=0.0):
+        super().__init__(address, FakeOpenRouterHandler)
+        self.latency = latency
+        self.prefill_latency = prefill_latency
+        self.decode_latency = decode_latency
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self.slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else nullcontext()
+        self.chunk_delay = chunk_delay
+        self.answer = answer
+        self.json_answer = json_answer
+        self.request_count = 0
+        self.last_payload = None
+        self._lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        # İstemcinin kapattığı bağlantılar (ör. iptal edilen hedge istekleri) gürültü üretmesin
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+    def roll(self):
+        with self._lock:
+            return self._random.random()
+
+    def record_request(self, payload):
+        with self._lock:
+            self.request_count += 1
+            self.last_payload = payload
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+
+def start_in_thread(port=0, **kwargs):
+    """Sunucuyu arka plan thread'inde başlatır; benchmark betikleri için."""
+    server = FakeOpenRouterServer(("127.0.0.1", port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel sahte OpenRouter sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=0.0, help="yanıt başına gecikme (sn)")
+    parser.add_argument("--chunk-delay", type=float, default=0.0,
+                        help="akış modunda parça başına gecikme (sn)")
+    parser.add_argument("--prefill-latency", type=float, default=0.0,
+                        help="1000 prompt token'ı başına ek gecikme (sn)")
+    parser.add_argument("--decode-latency", type=float, default=0.0,
+                        help="1000 yanıt token'ı başına ek gecikme (sn)")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="yavaş yanıt oranı (0-1)")
+    parser.add_argument("--slow-latency", type=float, default=0.0, help="yavaş yanıtın ek gecikmesi (sn)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="hata yanıtı oranı (0-1)")
+    parser.add_argument("--error-status", type=int, default=503, help="hata yanıtının durum kodu")
+    parser.add_argument("--max-concurrency", type=int, default=0,
+                        help="aynı anda işlenen en fazla istek (0: sınırsız)")
+    args = parser.parse_args()
+
+    server = FakeOpenRouterServer((args.host, args.port), latency=args.latency,
+                                  chunk_delay=args.chunk_delay, prefill_latency=args.prefill_latency,
+                                  decode_latency=args.decode_latency, slow_rate=args.slow_rate, slow_latency=args.slow_latency,
+                                  error_rate=args.error_rate, error_status=args.error_status,
+                                  max_concurrency=args.max_concurrency)
+    print(f"Sahte OpenRouter: {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Eski `is_health_related` (her çağrıda listeleri kuran alt dizgi taraması); yalnızca karşılaştırma için."""
+
+
+def legacy_is_health_related(text):
+    # Sağlıkla ilgili anahtar kelimeler
+    health_keywords = [
+        'ağrı', 'sancı', 'hasta', 'hastalık', 'rahatsızlık', 'şikayet', 'semptom',
+        'ateş', 'öksürük', 'baş', 'mide', 'karın', 'göz', 'kulak', 'burun',
+        'boğaz', 'sırt', 'bel', 'bacak', 'kol', 'eklem', 'kas', 'cilt',
+        'uykusuzluk', 'yorgunluk', 'halsizlik', 'bulantı', 'kusma', 'ishal',
+        'kabızlık', 'baş dönmesi', 'titreme', 'terleme', 'nefes', 'kalp',
+        'tansiyon', 'şeker', 'stres', 'alerji', 'astım', 'grip', 'nezle', 'soğuk algınlığı'
+    ]
+    
+    # Sağlık dışı konular
+    non_health_topics = [
+        'xampp', 'program', 'yazılım', 'kod', 'bilgisayar', 'internet', 'web',
+        'site', 'uygulama', 'app', 'software', 'hardware', 'donanım', 'yazılım',
+        'windows', 'linux', 'mac', 'android', 'ios', 'telefon', 'tablet', 'laptop'
+    ]
+    
+    text = text.lower()
+    
+    # Önce sağlık dışı konuları kontrol et
+    if any(topic in text for topic in non_health_topics):
+        return False
+        
+    # Sonra sağlık kelimelerini kontrol et
+    return any(keyword in text for keyword in health_keywords)
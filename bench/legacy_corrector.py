@@ -0,0 +1,158 @@
+"""Eski `correct_turkish_text` (tabloları her çağrıda kuran, 400 `re.sub`lik sürüm).
+
+Yalnızca karşılaştırma ve doğruluk kontrolü için tutulur.
+"""
+import re
+
+
+def legacy_correct_turkish_text(text):
+    """Türkçe metindeki sağlık şikayetleri için yazım hatalarını kural tabanlı olarak düzeltir."""
+    
+    # Sağlık terimlerinin kök kelime ve ekler için düzeltme sözlüğü
+    roots = {
+        # Vücut bölgeleri
+        'karn': 'karın',      # karın bölgesi
+        'kar': 'karın',        # karın kısaltması
+        'bas': 'baş',         # baş bölgesi
+        'mide': 'mide',       # mide 
+        'sirt': 'sırt',       # sırt
+        'bel': 'bel',         # bel
+        'goz': 'göz',         # göz
+        'kol': 'kol',         # kol
+        'bacak': 'bacak',     # bacak
+        'bogaz': 'boğaz',     # boğaz
+        
+        # Belirtiler
+        'agr': 'ağr',         # ağrı, ağrıyor vb.
+        'sanc': 'sancı',      # sancı, sancılar vb.
+        'ates': 'ateş',       # ateş, ateşli vb.
+        'oksur': 'öksür',     # öksürük, öksürme vb.
+        'öksur': 'öksür',     
+        'bulan': 'bulan',     # bulantı vb.
+        'ishal': 'ishal',     # ishal
+        'kabiz': 'kabız',     # kabızlık vb.
+        'donme': 'dönme',     # baş dönmesi
+    }
+    
+    # Özel kelime tamlamaları ve birleşik terimler
+    special_phrases = {
+        'bas agrisi': 'baş ağrısı',
+        'bas agrim': 'baş ağrım',
+        'bas donmesi': 'baş dönmesi',
+        'bas dönmesi': 'baş dönmesi',
+        'bas donmsi': 'baş dönmesi',
+        'karin agrisi': 'karın ağrısı',
+        'karin agrim': 'karın ağrım',
+        'karnm agriyor': 'karnım ağrıyor',
+        'midem bulan': 'midem bulan',
+        'sirt agrim': 'sırt ağrım',
+        'sırt agrım': 'sırt ağrım'
+    }
+    
+    # Tam kelime eşleşmesi için düzeltmeler
+    exact_corrections = {
+        'cok': 'çok',
+        'hic': 'hiç',
+        'karnm': 'karnım',
+        'basim': 'başım',
+        'sirtim': 'sırtım',
+        'belm': 'belim',
+        'bacagm': 'bacağım',
+        'agrı': 'ağrı',
+        'agrım': 'ağrım',
+        'agrıyor': 'ağrıyor',
+        'agrısı': 'ağrısı',
+        'sanci': 'sancı',
+        'sancilar': 'sancılar',
+        'sanclarm': 'sancılarım',
+        'sanclarim': 'sancılarım',
+        'oksuruk': 'öksürük',
+        'öksuruk': 'öksürük',
+        'bulanti': 'bulantı',
+        'kabizlik': 'kabızlık',
+        'karinda': 'karında'
+    }
+    
+    # Doğru kelime, yanlışlıkla değişebilecek kelimeler ve hatalı düzeltmeleri engelleme
+    preserve_words = {
+        'karı': 'karı',  # eş anlamında karı, karın ile karıştırılmamalı
+        'karım': 'karım'  # eş anlamında karım, karnım ile karıştırılmamalı
+    }
+    
+    # Birleşik yazılan kelimeleri ayırma
+    # Örn: "karnımağrıyor" -> "karnım ağrıyor"
+    for root1, correct1 in roots.items():
+        for root2, correct2 in roots.items():
+            pattern = f"({root1}[a-zçğıöşü]*)({root2}[a-zçğıöşü]*)"
+            text = re.sub(pattern, r'\1 \2', text, flags=re.IGNORECASE)
+    
+    # Metni kelimelerine ayır
+    words = re.findall(r'\b\w+\b|[,.;:!?]', text)
+    
+    # Her kelimeyi kontrol et ve düzelt
+    corrected_words = []
+    i = 0
+    while i < len(words):
+        # Özel kelime tamlamaları için
+        if i < len(words) - 1:
+            two_word_phrase = (words[i] + " " + words[i+1]).lower()
+            if two_word_phrase in special_phrases:
+                corrected_words.append(special_phrases[two_word_phrase])
+                i += 2
+                continue
+        
+        current_word = words[i].lower()
+        
+        # Korunması gereken kelimeler
+        if current_word in preserve_words:
+            corrected_words.append(words[i])
+            i += 1
+            continue
+        
+        # Tam kelime düzeltmeleri
+        if current_word in exact_corrections:
+            # Büyük/küçük harf durumunu koru
+            if words[i].isupper():
+                corrected_words.append(exact_corrections[current_word].upper())
+            elif words[i][0].isupper():
+                corrected_words.append(exact_corrections[current_word].capitalize())
+            else:
+                corrected_words.append(exact_corrections[current_word])
+            i += 1
+            continue
+        
+        # Kök tabanlı düzeltme
+        word_corrected = False
+        for root, correct_root in roots.items():
+            if current_word.startswith(root):
+                # Kökü düzelt, kalan ekleri koru
+                suffix = current_word[len(root):]
+                corrected_root = correct_root
+                corrected_word = corrected_root + suffix
+                
+                # Büyük/küçük harf durumunu koru
+                if words[i].isupper():
+                    corrected_word = corrected_word.upper()
+                elif words[i][0].isupper():
+                    corrected_word = corrected_word.capitalize()
+                
+                corrected_words.append(corrected_word)
+                word_corrected = True
+                break
+        
+        # Eğer düzeltme yapılmadıysa, kelimeyi olduğu gibi ekle
+        if not word_corrected:
+            corrected_words.append(words[i])
+        
+        i += 1
+    
+    # Noktalama işaretleri için boşluk düzeltmeleri
+    corrected_text = ' '.join(corrected_words)
+    
+    # Noktalama işaretleri öncesi fazla boşlukları kaldır
+    corrected_text = re.sub(r'\s+([,.;:!?])', r'\1', corrected_text)
+    
+    # Birden fazla boşluğu tek boşluğa indirge
+    corrected_text = re.sub(r'\s+', ' ', corrected_text).strip()
+    
+    return corrected_text
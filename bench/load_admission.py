@@ -0,0 +1,145 @@
+"""Kabul kontrolü (admission.py) yük testi.
+
+1. Aşırı yük: sahte upstream aynı anda en fazla --upstream-slots istek
+   işler (kapasite = slots / gecikme istek/sn). Sunucuya bu kapasitenin
+   --overload katı hızda, sabit aralıklarla (açık döngü) farklı sorgular
+   gönderilir. Eşzamanlılık tavanı kapalıyken istekler upstream önünde
+   birikir ve gecikme test boyunca büyür; açıkken kabul edilen isteklerin
+   gecikmesi sabit kalır, fazlası hızlıca `overloaded` hatası alır.
+2. Hız sınırı: iki gunicorn worker'ı SQLite kovalarını paylaşır. Gürültülü
+   bir istemci (X-API-Key) art arda istek gönderirken normal hızdaki bir
+   istemcinin hiç reddedilmediği gösterilir.
+
+Kullanım: python bench/load_admission.py [--duration 10] [--latency 0.5] [--upstream-slots 8]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from fake_openrouter import start_in_thread  # noqa: E402
+from load_async import percentile, start_server  # noqa: E402
+
+SERVER_ARGS = ["--workers", "1", "--worker-class", "gthread", "--threads", "128", "app:app"]
+
+
+async def post(session, base_url, symptoms, headers=None):
+    start = time.perf_counter()
+    async with session.post(f"{base_url}/api/health", json={"symptoms": symptoms},
+                            headers=headers) as response:
+        body = await response.json()
+        retry_after = response.headers.get("Retry-After")
+    return time.perf_counter() - start, body.get("code") or ("error" if "error" in body else "ok"), retry_after
+
+
+async def open_loop(base_url, rate, duration):
+    """`rate` istek/sn hızında `duration` saniye boyunca istek gönderir."""
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=600)) as session:
+        tasks = []
+        start = time.perf_counter()
+        for i in range(int(rate * duration)):
+            await asyncio.sleep(max(0.0, start + i / rate - time.perf_counter()))
+            # Her istek farklı olsun ki önbellek devreye girmesin
+            tasks.append(asyncio.create_task(post(session, base_url, f"başım ağrıyor {i}")))
+        results = await asyncio.gather(*tasks)
+    return results, time.perf_counter() - start
+
+
+def report_overload(name, results, wall):
+    admitted = [latency for latency, outcome, _ in results if outcome == "ok"]
+    rejected = [latency for latency, outcome, _ in results if outcome == "overloaded"]
+    # Testin son çeyreğinde kabul edilenler: gecikme zamanla büyüyor mu?
+    tail = [latency for latency, outcome, _ in results[len(results) * 3 // 4:] if outcome == "ok"]
+    line = f"{name:<16}{len(admitted):>8}{len(rejected):>8}{len(admitted) / wall:>9.1f}"
+    if admitted:
+        line += (f"{percentile(admitted, 0.5):>8.2f}{percentile(admitted, 0.99):>8.2f}"
+                 f"{percentile(tail, 0.5) if tail else 0:>9.2f}")
+    if rejected:
+        line += f"   ret p99 {percentile(rejected, 0.99) * 1000:.0f} ms"
+    print(line)
+
+
+def bench_overload(args, env):
+    capacity = args.upstream_slots / args.latency
+    rate = capacity * args.overload
+    print(f"== Aşırı yük: upstream kapasitesi {capacity:g} istek/sn, gönderilen {rate:g} istek/sn, "
+          f"{args.duration:g} sn ==")
+    print(f"{'tavan':<16}{'kabul':>8}{'ret':>8}{'kabul/s':>9}{'p50 s':>8}{'p99 s':>8}{'son p50':>9}")
+    for name, in_flight in (("kapalı", 0), (f"{args.upstream_slots} + sıra {args.queue}", args.upstream_slots)):
+        server_env = dict(env, HEALTH_MAX_IN_FLIGHT=str(in_flight), HEALTH_MAX_QUEUE=str(args.queue),
+                          HEALTH_QUEUE_TIMEOUT=str(args.queue_timeout))
+        proc, base_url = start_server(SERVER_ARGS, server_env)
+        try:
+            results, wall = asyncio.run(open_loop(base_url, rate, args.duration))
+        finally:
+            proc.terminate()
+            proc.wait()
+        report_overload(name, results, wall)
+    print()
+
+
+async def noisy_and_polite(base_url, duration):
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def client(name, interval):
+            results = []
+            deadline = time.perf_counter() + duration
+            i = 0
+            while time.perf_counter() < deadline:
+                results.append(await post(session, base_url, f"midem bulanıyor {name} {i}", {"X-API-Key": name}))
+                i += 1
+                await asyncio.sleep(interval)
+            return results
+
+        return await asyncio.gather(client("noisy", 0.0), client("polite", 1.0))
+
+
+def bench_rate_limit(args, env):
+    print("== Hız sınırı: istemci başına 0.5 istek/sn, kova 5; 2 worker SQLite kovalarını paylaşıyor ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        server_env = dict(env, HEALTH_RATE_LIMIT_BACKEND="sqlite", HEALTH_RATE_LIMIT="0.5",
+                          HEALTH_RATE_BURST="5", HEALTH_RATE_LIMIT_PATH=os.path.join(tmp, "rate.sqlite3"))
+        proc, base_url = start_server(["--workers", "2", "--worker-class", "gthread", "--threads", "16",
+                                       "app:app"], server_env)
+        try:
+            noisy, polite = asyncio.run(noisy_and_polite(base_url, args.duration))
+        finally:
+            proc.terminate()
+            proc.wait()
+    for name, results in (("gürültülü", noisy), ("normal", polite)):
+        ok = sum(1 for _, outcome, _ in results if outcome == "ok")
+        limited = [(latency, retry) for latency, outcome, retry in results if outcome == "rate_limited"]
+        line = f"{name:<12} {len(results):>4} istek, {ok:>3} kabul, {len(limited):>4} rate_limited"
+        if limited:
+            line += (f" (ret p50 {percentile([latency for latency, _ in limited], 0.5) * 1000:.0f} ms, "
+                     f"Retry-After {limited[-1][1]})")
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--latency", type=float, default=0.5, help="sahte upstream gecikmesi (sn)")
+    parser.add_argument("--upstream-slots", type=int, default=8, help="sahte upstream eşzamanlılık sınırı")
+    parser.add_argument("--overload", type=float, default=2.0, help="gönderim hızı / upstream kapasitesi")
+    parser.add_argument("--queue", type=int, default=8, help="HEALTH_MAX_QUEUE")
+    parser.add_argument("--queue-timeout", type=float, default=1.0, help="HEALTH_QUEUE_TIMEOUT (sn)")
+    args = parser.parse_args()
+
+    fake = start_in_thread(latency=args.latency, max_concurrency=args.upstream_slots)
+    env = dict(os.environ, OPENROUTER_BASE_URL=fake.base_url, HEALTH_CACHE_BACKEND="off",
+               HEALTH_SNAPSHOT_PATH="", API_KEY="fake-key", LOG_LEVEL="WARNING")
+    bench_overload(args, env)
+    bench_rate_limit(args, env)
+
+
+if __name__ == "__main__":
+    main()
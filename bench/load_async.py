@@ -0,0 +1,102 @@
+"""Senkron (Flask/gunicorn sync) ve asenkron (aiohttp) sunucu yük testi.
+
+Yerel sahte OpenRouter'ı sabit gecikmeyle başlatır, iki sunucuyu gunicorn
+ile ayağa kaldırır ve aynı sayıda eşzamanlı /api/health isteği gönderir.
+
+Kullanım: python bench/load_async.py [--concurrency 200] [--latency 1.0] [--sync-workers 4]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_openrouter import start_in_thread  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args, env):
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}", "--timeout", "120"] + args,
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("sunucu başlatılamadı: " + " ".join(args))
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def drive(base_url, concurrency):
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=600)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async def one(i):
+            start = time.perf_counter()
+            # Her istek farklı olsun ki önbellek devreye girmesin
+            async with session.post(f"{base_url}/api/health",
+                                    json={"symptoms": f"başım ağrıyor {i}"}) as response:
+                body = await response.json()
+            return time.perf_counter() - start, "error" not in body
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(one(i) for i in range(concurrency)))
+        wall = time.perf_counter() - start
+    latencies = [latency for latency, _ in results]
+    ok = sum(1 for _, success in results if success)
+    return wall, latencies, ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=1.0, help="sahte upstream gecikmesi (sn)")
+    parser.add_argument("--sync-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    fake = start_in_thread(latency=args.latency)
+    env = dict(os.environ, OPENROUTER_BASE_URL=fake.base_url, HEALTH_CACHE_BACKEND="off",
+               API_KEY="fake-key")
+
+    servers = [
+        (f"sync  ({args.sync_workers} worker)", ["--workers", str(args.sync_workers), "app:app"]),
+        ("async (1 worker)", ["--workers", "1", "--worker-class", "aiohttp.GunicornWebWorker",
+                              "async_app:create_app"]),
+    ]
+    print(f"{args.concurrency} eşzamanlı istek, upstream gecikmesi {args.latency}s")
+    print(f"{'sunucu':<20}{'başarılı':>9}{'süre s':>9}{'istek/s':>9}{'p50 s':>8}{'p95 s':>8}{'max s':>8}")
+    for name, gunicorn_args in servers:
+        proc, base_url = start_server(gunicorn_args, env)
+        try:
+            wall, latencies, ok = asyncio.run(drive(base_url, args.concurrency))
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(f"{name:<20}{ok:>9}{wall:>9.2f}{args.concurrency / wall:>9.1f}"
+              f"{percentile(latencies, 0.5):>8.2f}{percentile(latencies, 0.95):>8.2f}{max(latencies):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Uçtan uca /api/health yük ve gecikme benchmark'ı.
+
+Yerel sahte OpenRouter'ı (gecikme, hata oranı, yavaş yanıt, akış) başlatır,
+sunucuyu gunicorn ile HEALTH_SERVER_TIMING=1 açık olarak ayağa kaldırır ve
+bench/complaints.txt'teki şikayetlerle istenen eşzamanlılıkta istek
+gönderir. Yanıtların Server-Timing başlıklarından her aşama (düzeltme,
+sınıflandırma, önbellek, upstream bekleme, ayrıştırma, ...) için
+p50/p95/p99 raporlanır. `--endpoint stream` ile /api/health/stream için
+ilk bölüme kadar geçen süre ve toplam süre ölçülür.
+
+Kullanım:
+    python bench/load_health.py [--server gthread|sync|async] [--concurrency 32] [--requests 500]
+                                [--latency 0.5] [--error-rate 0.05] [--unique] [--endpoint stream]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+
+import aiohttp
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from fake_openrouter import start_in_thread  # noqa: E402
+from load_async import percentile, start_server  # noqa: E402
+
+COMPLAINTS_PATH = os.path.join(BENCH_DIR, "complaints.txt")
+
+
+def load_complaints():
+    with open(COMPLAINTS_PATH, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def parse_server_timing(header):
+    """"correction;dur=1.20, total;dur=5.1" -> {"correction": 0.0012, "total": 0.0051}"""
+    timings = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur" and name:
+                timings[name] = float(value) / 1000
+    return timings
+
+
+def outcome_of(body):
+    """"ok", admission kodu ya da hata mesajının başı (sağlık dışı, API Hatası: 503, ...)"""
+    if "error" not in body:
+        return "ok"
+    return body.get("code") or body["error"].split(".")[0][:40]
+
+
+async def one_health(session, base_url, symptoms):
+    start = time.perf_counter()
+    async with session.post(f"{base_url}/api/health", json={"symptoms": symptoms}) as response:
+        body = await response.json()
+        timings = parse_server_timing(response.headers.get("Server-Timing"))
+    timings["client"] = time.perf_counter() - start
+    return outcome_of(body), timings
+
+
+async def one_stream(session, base_url, symptoms):
+    start = time.perf_counter()
+    timings = {}
+    outcome = "error"
+    async with session.post(f"{base_url}/api/health/stream", json={"symptoms": symptoms}) as response:
+        async for line in response.content:
+            if line.startswith(b"event: section") and "first_section" not in timings:
+                timings["first_section"] = time.perf_counter() - start
+            elif line.startswith(b"event: done"):
+                outcome = "ok"
+    timings["client"] = time.perf_counter() - start
+    return outcome, timings
+
+
+async def drive(base_url, queries, concurrency, request_fn):
+    """Kapalı döngü: `concurrency` istemci sıradaki sorguyu alıp gönderir."""
+    connector = aiohttp.TCPConnector(limit=0)
+    results = []
+    position = iter(queries)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=600)) as session:
+        async def worker():
+            for symptoms in position:
+                results.append(await request_fn(session, base_url, symptoms))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - start
+    return results, wall
+
+
+def report(results, wall):
+    outcomes = Counter(outcome for outcome, _ in results)
+    print(f"{len(results)} istek, {wall:.2f} sn, {len(results) / wall:.1f} istek/sn; "
+          + ", ".join(f"{name}: {count}" for name, count in outcomes.most_common()))
+
+    by_stage = defaultdict(list)
+    for _, timings in results:
+        for name, seconds in timings.items():
+            by_stage[name].append(seconds)
+    print(f"{'aşama':<16}{'adet':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    # Uçtan uca süreler en sonda
+    for name in sorted(by_stage, key=lambda name: name in ("total", "client")):
+        values = by_stage[name]
+        print(f"{name:<16}{len(values):>7}{percentile(values, 0.5) * 1000:>10.2f}"
+              f"{percentile(values, 0.95) * 1000:>10.2f}{percentile(values, 0.99) * 1000:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server", choices=("gthread", "sync", "async"), default="gthread")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=32, help="gthread worker başına thread")
+    parser.add_argument("--endpoint", choices=("health", "stream"), default="health")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--unique", action="store_true",
+                        help="her sorguya sıra numarası ekle (önbellek isabeti olmaz)")
+    parser.add_argument("--latency", type=float, default=0.5, help="sahte upstream gecikmesi (sn)")
+    parser.add_argument("--chunk-delay", type=float, default=0.005, help="akışta parça başına gecikme (sn)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="upstream hata oranı (0-1)")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="yavaş upstream yanıtı oranı (0-1)")
+    parser.add_argument("--slow-latency", type=float, default=2.0)
+    args = parser.parse_args()
+
+    fake = start_in_thread(latency=args.latency, chunk_delay=args.chunk_delay, error_rate=args.error_rate,
+                           error_status=args.error_status, slow_rate=args.slow_rate,
+                           slow_latency=args.slow_latency, seed=1)
+    env = dict(os.environ, OPENROUTER_BASE_URL=fake.base_url, API_KEY="fake-key", HEALTH_SERVER_TIMING="1",
+               HEALTH_CACHE_BACKEND="memory", HEALTH_SNAPSHOT_PATH="", LOG_LEVEL="WARNING")
+    if args.server == "async":
+        if args.endpoint == "stream":
+            parser.error("async sunucuda akış uç noktası yok")
+        gunicorn_args = ["--worker-class", "aiohttp.GunicornWebWorker", "async_app:create_app"]
+    elif args.server == "gthread":
+        gunicorn_args = ["--worker-class", "gthread", "--threads", str(args.threads), "app:app"]
+    else:
+        gunicorn_args = ["app:app"]
+    gunicorn_args = ["--workers", str(args.workers)] + gunicorn_args
+
+    complaints = load_complaints()
+    queries = [complaints[i % len(complaints)] + (f" {i}" if args.unique else "") for i in range(args.requests)]
+    print(f"sunucu: {args.server} x{args.workers}, uç nokta: {args.endpoint}, eşzamanlılık {args.concurrency}, "
+          f"upstream gecikmesi {args.latency}s, hata oranı {args.error_rate:g}")
+
+    proc, base_url = start_server(gunicorn_args, env)
+    try:
+        request_fn = one_stream if args.endpoint == "stream" else one_health
+        results, wall = asyncio.run(drive(base_url, queries, args.concurrency, request_fn))
+    finally:
+        proc.terminate()
+        proc.wait()
+    report(results, wall)
+    print(f"upstream'e giden istek: {fake.request_count}")
+
+
+if __name__ == "__main__":
+    main()
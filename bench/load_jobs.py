@@ -0,0 +1,124 @@
+"""Arka plan işleri (/api/health/jobs) uçtan uca denemesi.
+
+Yavaş bir sahte upstream ve yerel bir callback alıcısı başlatır, gunicorn
+ile tek worker'lı sunucuya işler gönderir ve gönderim süresini ölçer.
+Analizler sürerken worker SIGKILL ile öldürülür; gunicorn yeni worker
+başlatır, kirası (HEALTH_JOB_LEASE) dolan işler yeniden kuyruğa alınır.
+Sonunda tüm işlerin tamamlandığı ve callback'lerin geldiği doğrulanır.
+
+Kullanım: python bench/load_jobs.py [--jobs 20] [--latency 2.0] [--no-kill]
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from fake_openrouter import start_in_thread  # noqa: E402
+from load_async import percentile, start_server  # noqa: E402
+
+
+class CallbackHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        with self.server.lock:
+            self.server.received.setdefault(body["job_id"], body)
+        self.send_response(204)
+        self.end_headers()
+
+
+def start_callback_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CallbackHandler)
+    server.received = {}
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def worker_pids(master_pid):
+    output = subprocess.run(["pgrep", "-P", str(master_pid)], capture_output=True, text=True).stdout
+    return [int(pid) for pid in output.split()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=2.0, help="sahte upstream gecikmesi (sn)")
+    parser.add_argument("--lease", type=float, default=5.0, help="HEALTH_JOB_LEASE (sn)")
+    parser.add_argument("--no-kill", action="store_true", help="worker'ı öldürme")
+    args = parser.parse_args()
+
+    fake = start_in_thread(latency=args.latency)
+    callbacks = start_callback_server()
+    callback_url = "http://127.0.0.1:%d/hook" % callbacks.server_address[1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, OPENROUTER_BASE_URL=fake.base_url, API_KEY="fake-key", HEALTH_CACHE_BACKEND="off",
+                   HEALTH_SNAPSHOT_PATH="", HEALTH_JOBS_PATH=os.path.join(tmp, "jobs.sqlite3"),
+                   HEALTH_JOB_LEASE=str(args.lease), HEALTH_JOB_WORKERS="4", LOG_LEVEL="WARNING",
+                   # Yerel alıcı loopback'te; listede olmayan özel adresler reddedilir
+                   HEALTH_JOB_CALLBACK_HOSTS="127.0.0.1")
+        proc, base_url = start_server(["--workers", "1", "--worker-class", "gthread", "--threads", "8",
+                                       "app:app"], env)
+        session = requests.Session()
+        try:
+            submit_times = []
+            job_ids = []
+            start = time.perf_counter()
+            for i in range(args.jobs):
+                t0 = time.perf_counter()
+                body = session.post(f"{base_url}/api/health/jobs", json={
+                    "symptoms": f"başım ağrıyor {i}", "callback_url": callback_url}).json()
+                submit_times.append(time.perf_counter() - t0)
+                job_ids.append(body["job_id"])
+            print(f"{args.jobs} iş gönderildi; gönderim p50 {percentile(submit_times, 0.5) * 1000:.1f} ms, "
+                  f"max {max(submit_times) * 1000:.1f} ms")
+
+            if not args.no_kill:
+                time.sleep(args.latency / 2)
+                for pid in worker_pids(proc.pid):
+                    os.kill(pid, signal.SIGKILL)
+                print(f"worker öldürüldü (upstream'e giden istek: {fake.request_count}); "
+                      f"kira {args.lease:g} sn sonra dolacak")
+
+            deadline = time.time() + args.lease + args.latency * args.jobs + 30
+            statuses = {}
+            while time.time() < deadline:
+                try:
+                    statuses = {job_id: session.get(f"{base_url}/api/health/jobs/{job_id}").json().get("status")
+                                for job_id in job_ids}
+                except requests.ConnectionError:
+                    # Öldürülen worker'a açık kalan bağlantı; yeni worker'a yeniden bağlanılır
+                    time.sleep(0.5)
+                    continue
+                if all(status in ("done", "error") for status in statuses.values()) \
+                        and len(callbacks.received) >= len(job_ids):
+                    break
+                time.sleep(0.5)
+            elapsed = time.perf_counter() - start
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    done = sum(1 for status in statuses.values() if status == "done")
+    print(f"{elapsed:.1f} sn sonra: {done}/{len(job_ids)} tamamlandı, {len(callbacks.received)} callback alındı, "
+          f"upstream'e giden istek: {fake.request_count}")
+    if done < len(job_ids) or len(callbacks.received) < len(job_ids):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""İstek yolundaki saf Python aşamalarının mikro benchmark'ları.
+
+correct_turkish_text, is_health_related, response_parser.parse ve akışlı
+bölüm ayrıştırıcının (SectionStream) çağrı başına süresini ölçer. Her ölçüm
+--rounds kez tekrarlanır ve en iyisi raporlanır. `--save` sonuçları JSON
+olarak yazar; `--compare` kaydedilmiş bir taban çizgisine göre --tolerance
+oranından fazla yavaşlayan ölçüm varsa 1 ile çıkar (aynı makinede
+karşılaştırılmalıdır).
+
+Kullanım:
+    python bench/micro.py --save /tmp/micro_base.json
+    python bench/micro.py --compare /tmp/micro_base.json [--tolerance 0.3]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import response_parser  # noqa: E402
+from preprocess import correct_turkish_text, is_health_related  # noqa: E402
+
+COMPLAINTS_PATH = os.path.join(BENCH_DIR, "complaints.txt")
+RECORDED_PATH = os.path.join(BENCH_DIR, "recorded_completions.jsonl")
+
+
+def load_inputs():
+    with open(COMPLAINTS_PATH, encoding="utf-8") as f:
+        complaints = [line.strip() for line in f if line.strip()]
+    with open(RECORDED_PATH, encoding="utf-8") as f:
+        completions = [json.loads(line)["completion"] for line in f if line.strip()]
+    return complaints, completions
+
+
+def parse_stream(text):
+    sections = response_parser.SectionStream()
+    # Upstream akışına benzer şekilde ~20 karakterlik parçalar
+    for i in range(0, len(text), 20):
+        sections.feed(text[i:i + 20])
+    sections.close()
+
+
+def best_per_call(func, inputs, rounds, min_time=0.2):
+    """Girdi başına en iyi (en düşük) ortalama süre, saniye."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            for item in inputs:
+                func(item)
+        if time.perf_counter() - start >= min_time / rounds or loops >= 1 << 16:
+            break
+        loops *= 2
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(loops):
+            for item in inputs:
+                func(item)
+        best = min(best, (time.perf_counter() - start) / (loops * len(inputs)))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--save", help="sonuçları bu JSON dosyasına yaz")
+    parser.add_argument("--compare", help="bu JSON taban çizgisiyle karşılaştır")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="izin verilen yavaşlama oranı")
+    args = parser.parse_args()
+
+    complaints, completions = load_inputs()
+    corrected = [correct_turkish_text(text) for text in complaints]
+    benchmarks = [
+        ("correct_turkish_text", correct_turkish_text, complaints),
+        ("is_health_related", is_health_related, corrected),
+        ("response_parser.parse", response_parser.parse, completions),
+        ("SectionStream", parse_stream, completions),
+    ]
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = 0
+    print(f"{'ölçüm':<24}{'µs/çağrı':>10}{'taban':>10}{'fark':>8}")
+    for name, func, inputs in benchmarks:
+        results[name] = best_per_call(func, inputs, args.rounds)
+        line = f"{name:<24}{results[name] * 1e6:>10.2f}"
+        if name in baseline:
+            change = results[name] / baseline[name] - 1
+            line += f"{baseline[name] * 1e6:>10.2f}{change:>+8.0%}"
+            if change > args.tolerance:
+                regressions += 1
+                line += "  YAVAŞLAMA"
+        print(line)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if regressions:
+        print(f"{regressions} ölçüm %{args.tolerance * 100:g} sınırından fazla yavaşladı")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""/api/health için yanıt önbelleği.
+
+Anahtar; normalize edilmiş düzeltilmiş sorgu, model, sıcaklık ve prompt
+sürümünden oluşur. İki arka uç vardır: süreç içi LRU (`memory`) ve gunicorn
+worker'larının isabetleri paylaşabilmesi için SQLite dosyası (`sqlite`).
+Her ikisi de TTL ve en fazla kayıt sayısı ile sınırlıdır.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from sqlite_local import LocalConnection
+from turkish import turkish_lower
+
+_PUNCTUATION = re.compile(r'[,.;:!?]+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_query(text):
+    """Önbellek anahtarı için sorguyu küçük harfe çevirir, noktalama ve fazla boşlukları atar."""
+    text = turkish_lower(text)
+    text = _PUNCTUATION.sub(' ', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def make_key(corrected_query, model, temperature, prompt_version):
+    """Önbellek anahtarını üretir."""
+    raw = json.dumps([normalize_query(corrected_query), model, temperature, prompt_version],
+                     ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class MemoryBackend:
+    """Süreç içi, TTL'li ve boyut sınırlı LRU önbellek."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, now):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, expires_at):
+        """Kaydı ekler; çıkarılan kayıt sayısını döndürür."""
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            evicted = 0
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """Worker süreçleri arasında paylaşılan SQLite tabanlı önbellek."""
+
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self._connect = LocalConnection(path)
+        conn = self._connect()
+        conn.execute("""CREATE TABLE IF NOT EXISTS response_cache (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        )""")
+        conn.execute("CREATE INDEX IF NOT EXISTS response_cache_accessed ON response_cache (accessed_at)")
+        conn.commit()
+
+    def get(self, key, now):
+        conn = self._connect()
+        row = conn.execute("SELECT value, expires_at FROM response_cache WHERE key = ?",
+                           (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            conn.commit()
+            return None
+        conn.execute("UPDATE response_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key, value, expires_at):
+        conn = self._connect()
+        now = time.time()
+        conn.execute("INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?, ?)",
+                     (key, json.dumps(value, ensure_ascii=False), expires_at, now))
+        # Süresi dolanları ve en eski erişilenleri at
+        evicted = conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,)).rowcount
+        evicted += conn.execute("""DELETE FROM response_cache WHERE key IN (
+            SELECT key FROM response_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+        )""", (self.max_entries,)).rowcount
+        conn.commit()
+        return evicted
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute("DELETE FROM response_cache")
+        conn.commit()
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+
+class ResponseCache:
+    """Arka uçtan bağımsız önbellek; isabet/ıska sayaçlarını tutar."""
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        value = self.backend.get(key, time.time())
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        evicted = self.backend.set(key, value, time.time() + self.ttl)
+        with self._lock:
+            self.stores += 1
+            self.evictions += evicted
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": type(self.backend).__name__,
+                "entries": len(self.backend),
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions
+            }
+
+
+def create_cache_from_env():
+    """Ortam değişkenlerinden önbellek kurar; HEALTH_CACHE_BACKEND=off ise None döner.
+
+    HEALTH_CACHE_BACKEND: memory (varsayılan), sqlite veya off
+    HEALTH_CACHE_PATH: SQLite dosyası (varsayılan health_cache.sqlite3)
+    HEALTH_CACHE_TTL: saniye (varsayılan 86400)
+    HEALTH_CACHE_MAX_ENTRIES: en fazla kayıt (varsayılan 5000)
+    """
+    backend_name = os.environ.get("HEALTH_CACHE_BACKEND", "memory").lower()
+    if backend_name in ("off", "none", "0", ""):
+        return None
+
+    ttl = float(os.environ.get("HEALTH_CACHE_TTL", 86400))
+    max_entries = int(os.environ.get("HEALTH_CACHE_MAX_ENTRIES", 5000))
+    if backend_name == "sqlite":
+        path = os.environ.get("HEALTH_CACHE_PATH", "health_cache.sqlite3")
+        backend = SQLiteBackend(path, max_entries)
+    elif backend_name == "memory":
+        backend = MemoryBackend(max_entries)
+    else:
+        raise ValueError(f"Bilinmeyen önbellek arka ucu: {backend_name}")
+    return ResponseCache(backend, ttl)
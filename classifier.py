@@ -0,0 +1,143 @@
+"""Önceden derlenmiş, ağırlıklı sağlık / sağlık dışı metin sınıflandırıcısı.
+
+Sözlük (data/health_terms.tsv) başlangıçta bir kez yüklenir. Metin tek bir
+derlenmiş desenle kelimelere ayrılır ve her kelime için en uzun eşleşen
+terim sözlükten bakılır; böylece sorgu başına maliyet sözlük boyutundan
+bağımsızdır ve "kol" gibi kökler "kolay" içinde eşleşmez.
+"""
+import os
+import re
+
+from turkish import turkish_lower
+
+DEFAULT_TERMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "health_terms.tsv")
+
+_WORD = re.compile(r'\w+')
+
+
+def load_terms(path):
+    """terim<TAB>ağırlık satırlarını okur; '#' ile başlayan satırlar yorumdur."""
+    terms = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                term, weight = line.rsplit("\t", 1)
+                terms.append((term.strip(), float(weight)))
+            except ValueError:
+                raise ValueError(f"{path}:{line_no}: geçersiz satır: {line!r}")
+    return terms
+
+
+class HealthClassifier:
+    """Kelime ve kök eşleşmeli ağırlıklı sınıflandırıcı."""
+
+    # Kelime -> ağırlık önbelleğinin en fazla boyutu
+    MEMO_SIZE = 50000
+
+    def __init__(self, terms, threshold=1.0):
+        self.threshold = threshold
+        self._memo = {}
+        self._exact = {}
+        self._stems = {}
+        self._phrases = {}
+        self._max_stem = 0
+
+        for term, weight in terms:
+            words = _WORD.findall(turkish_lower(term))
+            if not words:
+                continue
+            stem = term.endswith("*")
+            if len(words) > 1:
+                # Çok kelimeli terimler ilk kelimeye göre gruplanır
+                self._phrases.setdefault(words[0], []).append((tuple(words), stem, weight))
+            elif stem:
+                self._stems[words[0]] = weight
+                self._max_stem = max(self._max_stem, len(words[0]))
+            else:
+                self._exact[words[0]] = weight
+
+        for candidates in self._phrases.values():
+            # Uzun tamlamalar önce denenir
+            candidates.sort(key=lambda item: -len(item[0]))
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_TERMS_PATH, threshold=1.0):
+        return cls(load_terms(path), threshold)
+
+    def _lookup(self, word):
+        weight = self._exact.get(word)
+        if weight is not None:
+            return weight
+        stems = self._stems
+        for end in range(min(len(word), self._max_stem), 0, -1):
+            weight = stems.get(word[:end])
+            if weight is not None:
+                return weight
+        return 0.0
+
+    def word_weight(self, word):
+        """Kelimeye uygulanan ağırlık: önce tam eşleşme, sonra en uzun kök."""
+        weight = self._memo.get(word)
+        if weight is None:
+            weight = self._lookup(word)
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[word] = weight
+        return weight
+
+    def _match_phrase(self, words, i):
+        for phrase, stem, weight in self._phrases.get(words[i], ()):
+            n = len(phrase)
+            if i + n > len(words):
+                continue
+            if words[i + 1:i + n - 1] != list(phrase[1:-1]):
+                continue
+            last = words[i + n - 1]
+            if last == phrase[-1] or (stem and last.startswith(phrase[-1])):
+                return n, weight
+        return 0, 0.0
+
+    def score(self, text):
+        """Metnin toplam puanı; pozitif sağlık, negatif sağlık dışı."""
+        words = _WORD.findall(turkish_lower(text))
+        phrases = self._phrases
+        memo = self._memo
+        total = 0.0
+        i = 0
+        count = len(words)
+        while i < count:
+            word = words[i]
+            if word in phrases:
+                length, weight = self._match_phrase(words, i)
+                if length:
+                    total += weight
+                    i += length
+                    continue
+            weight = memo.get(word)
+            total += self.word_weight(word) if weight is None else weight
+            i += 1
+        return total
+
+    def is_health_related(self, text):
+        return self.score(text) >= self.threshold
+
+
+CLASSIFIER = HealthClassifier.from_file(os.environ.get("HEALTH_TERMS_PATH", DEFAULT_TERMS_PATH))
+
+
+def score(text):
+    """Başlangıçta derlenen sınıflandırıcıyla metnin puanı; negatifse açıkça sağlık dışıdır."""
+    return CLASSIFIER.score(text)
+
+
+def knows(word):
+    """Küçük harfli kelime sınıflandırıcı sözlüğünde (sağlık ya da sağlık dışı terim olarak) varsa True."""
+    return CLASSIFIER.word_weight(word) != 0.0
+
+
+def is_health_related(text):
+    """Başlangıçta derlenen sınıflandırıcıyla metnin sağlıkla ilgili olup olmadığını döndürür."""
+    return CLASSIFIER.is_health_related(text)
@@ -0,0 +1,18 @@
+"""Sunucu ve komut satırı aracının ortak ayarları.
+
+İçe aktarıldığında yalnızca ortam değişkenleri okunur; hiçbir şey
+yazdırılmaz ve ağır modüller yüklenmez.
+
+API_KEY: OpenRouter anahtarı
+HEALTH_FUZZY_CORRECTION: sözlük tabanlı bulanık düzeltme (varsayılan açık; 0 ile kapatılır)
+HEALTH_FUZZY_EDITS: bulanık düzeltmede düzenleme uzaklığı aşaması (varsayılan kapalı)
+"""
+import os
+
+API_KEY = os.environ.get("API_KEY")
+MODEL = "deepseek/deepseek-chat:free"
+# Sözlük tabanlı bulanık düzeltme aşaması; HEALTH_FUZZY_CORRECTION=0 ile kapatılır
+FUZZY_CORRECTION = os.environ.get("HEALTH_FUZZY_CORRECTION", "1").lower() not in ("0", "off", "false", "no")
+# Düzenleme uzaklığı aşaması sağlık dışı gündelik kelimeleri sağlık terimlerine
+# çevirebildiğinden (para -> yara) yalnızca HEALTH_FUZZY_EDITS=1 ile açılır
+FUZZY_EDITS = os.environ.get("HEALTH_FUZZY_EDITS", "0").lower() in ("1", "on", "true", "yes")
@@ -0,0 +1,282 @@
+"""Türkçe sağlık şikayetleri için önceden derlenmiş düzeltme motoru.
+
+Düzeltme tabloları modül yüklenirken bir kez trie yapılarına derlenir.
+Birleşik kelime ayırma, tamlama, tam kelime ve kök düzeltmeleri tek bir
+doğrusal geçişte yapılır; çıktı eski 400 `re.sub` tabanlı sürümle aynıdır.
+"""
+import re
+
+# Sağlık terimlerinin kök kelime ve ekler için düzeltme sözlüğü
+# (sıra önemlidir: kök eşleştirmede ilk eşleşen kök kazanır)
+ROOTS = {
+    # Vücut bölgeleri
+    'karn': 'karın',      # karın bölgesi
+    'kar': 'karın',        # karın kısaltması
+    'bas': 'baş',         # baş bölgesi
+    'mide': 'mide',       # mide
+    'sirt': 'sırt',       # sırt
+    'bel': 'bel',         # bel
+    'goz': 'göz',         # göz
+    'kol': 'kol',         # kol
+    'bacak': 'bacak',     # bacak
+    'bogaz': 'boğaz',     # boğaz
+
+    # Belirtiler
+    'agr': 'ağr',         # ağrı, ağrıyor vb.
+    'sanc': 'sancı',      # sancı, sancılar vb.
+    'ates': 'ateş',       # ateş, ateşli vb.
+    'oksur': 'öksür',     # öksürük, öksürme vb.
+    'öksur': 'öksür',
+    'bulan': 'bulan',     # bulantı vb.
+    'ishal': 'ishal',     # ishal
+    'kabiz': 'kabız',     # kabızlık vb.
+    'donme': 'dönme',     # baş dönmesi
+}
+
+# Özel kelime tamlamaları ve birleşik terimler
+SPECIAL_PHRASES = {
+    'bas agrisi': 'baş ağrısı',
+    'bas agrim': 'baş ağrım',
+    'bas donmesi': 'baş dönmesi',
+    'bas dönmesi': 'baş dönmesi',
+    'bas donmsi': 'baş dönmesi',
+    'karin agrisi': 'karın ağrısı',
+    'karin agrim': 'karın ağrım',
+    'karnm agriyor': 'karnım ağrıyor',
+    'midem bulan': 'midem bulan',
+    'sirt agrim': 'sırt ağrım',
+    'sırt agrım': 'sırt ağrım'
+}
+
+# Tam kelime eşleşmesi için düzeltmeler
+EXACT_CORRECTIONS = {
+    'cok': 'çok',
+    'hic': 'hiç',
+    'karnm': 'karnım',
+    'basim': 'başım',
+    'sirtim': 'sırtım',
+    'belm': 'belim',
+    'bacagm': 'bacağım',
+    'agrı': 'ağrı',
+    'agrım': 'ağrım',
+    'agrıyor': 'ağrıyor',
+    'agrısı': 'ağrısı',
+    'sanci': 'sancı',
+    'sancilar': 'sancılar',
+    'sanclarm': 'sancılarım',
+    'sanclarim': 'sancılarım',
+    'oksuruk': 'öksürük',
+    'öksuruk': 'öksürük',
+    'bulanti': 'bulantı',
+    'kabizlik': 'kabızlık',
+    'karinda': 'karında'
+}
+
+# Doğru kelime, yanlışlıkla değişebilecek kelimeler ve hatalı düzeltmeleri engelleme
+PRESERVE_WORDS = {
+    'karı': 'karı',  # eş anlamında karı, karın ile karıştırılmamalı
+    'karım': 'karım'  # eş anlamında karım, karnım ile karıştırılmamalı
+}
+
+# Birleşik kelime ayırmada kullanılan harf sınıfı (eski desenle aynı)
+_LETTER_RUN = re.compile(r'[a-zçğıöşü]+', re.IGNORECASE)
+_TOKEN = re.compile(r'\b\w+\b|[,.;:!?]')
+_PUNCTUATION = frozenset(',.;:!?')
+
+_NO_MATCH = '\0'
+
+
+def _build_trie(keys):
+    """Anahtarları (sıra indeksleriyle) karakter trie'sine yerleştirir."""
+    trie = {}
+    for index, key in enumerate(keys):
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[None] = index
+    return trie
+
+
+class CorrectionEngine:
+    """Düzeltme tablolarından bir kez derlenen, tek geçişli düzeltici."""
+
+    def __init__(self, roots, special_phrases, exact_corrections, preserve_words):
+        self.root_keys = list(roots)
+        self.root_values = [roots[key] for key in self.root_keys]
+        self.root_lengths = [len(key) for key in self.root_keys]
+        self.special_phrases = dict(special_phrases)
+        self.exact_corrections = dict(exact_corrections)
+        self.preserve_words = frozenset(preserve_words)
+
+        self._root_trie = _build_trie(self.root_keys)
+        # Kök harfleri; büyük/küçük harf duyarsız eşleşme için kanonik harfler
+        self._root_chars = sorted({ch for key in self.root_keys for ch in key})
+        self._fold_cache = {}
+
+    def _fold(self, ch):
+        """Bir harfi, `re.IGNORECASE` altında eşleştiği kök harfine indirger."""
+        folded = self._fold_cache.get(ch)
+        if folded is None:
+            folded = _NO_MATCH
+            for root_ch in self._root_chars:
+                if re.fullmatch(re.escape(root_ch), ch, re.IGNORECASE):
+                    folded = root_ch
+                    break
+            self._fold_cache[ch] = folded
+        return folded
+
+    def _root_occurrences(self, run):
+        """Bir harf dizisindeki tüm kök geçişlerini (konum, kök indeksi) döndürür."""
+        folded = [self._fold(ch) for ch in run]
+        trie = self._root_trie
+        occurrences = []
+        for start in range(len(folded)):
+            node = trie.get(folded[start])
+            pos = start + 1
+            while node is not None:
+                index = node.get(None)
+                if index is not None:
+                    occurrences.append((start, index))
+                if pos >= len(folded):
+                    break
+                node = node.get(folded[pos])
+                pos += 1
+        return occurrences
+
+    def _split_points(self, run):
+        """Eski iç içe kök döngüsünün bir harf dizisine ekleyeceği boşluk konumları.
+
+        Her (kök1, kök2) çifti sırasıyla, yalnızca dizide geçen kökler için
+        uygulanır. Her geçişte her parçada en fazla bir bölme yapılır: kök2'nin
+        parçadaki son geçişinden önce biten en soldaki kök1 varsa, parça kök2'nin
+        başından bölünür.
+        """
+        occurrences = self._root_occurrences(run)
+        if len(occurrences) < 2:
+            return []
+
+        present = sorted({index for _, index in occurrences})
+        lengths = self.root_lengths
+        splits = []
+        bounds = [0, len(run)]
+
+        for first in present:
+            first_len = lengths[first]
+            first_positions = [pos for pos, index in occurrences if index == first]
+            for second in present:
+                second_len = lengths[second]
+                second_positions = [pos for pos, index in occurrences if index == second]
+                new_splits = []
+                for seg in range(len(bounds) - 1):
+                    seg_start, seg_end = bounds[seg], bounds[seg + 1]
+                    last = -1
+                    for pos in second_positions:
+                        if pos >= seg_start and pos + second_len <= seg_end:
+                            last = pos
+                    if last < 0:
+                        continue
+                    for pos in first_positions:
+                        if pos >= seg_start and pos + first_len <= last:
+                            new_splits.append(last)
+                            break
+                if new_splits:
+                    splits.extend(new_splits)
+                    bounds = sorted(set(bounds).union(new_splits))
+        return sorted(splits)
+
+    def split_compounds(self, text):
+        """Birleşik yazılan kelimeleri ayırır. Örn: "karnımağrıyor" -> "karnım ağrıyor"."""
+        pieces = []
+        last = 0
+        for match in _LETTER_RUN.finditer(text):
+            splits = self._split_points(match.group())
+            if not splits:
+                continue
+            offset = match.start()
+            for split in splits:
+                pieces.append(text[last:offset + split])
+                pieces.append(' ')
+                last = offset + split
+        if not pieces:
+            return text
+        pieces.append(text[last:])
+        return ''.join(pieces)
+
+    def _match_root(self, word):
+        """Kelimenin başındaki, sözlük sırasında ilk gelen kökün indeksini döndürür."""
+        node = self._root_trie
+        best = None
+        for ch in word:
+            node = node.get(ch)
+            if node is None:
+                break
+            index = node.get(None)
+            if index is not None and (best is None or index < best):
+                best = index
+        return best
+
+    @staticmethod
+    def _match_case(original, corrected):
+        # Büyük/küçük harf durumunu koru
+        if original.isupper():
+            return corrected.upper()
+        if original[0].isupper():
+            return corrected.capitalize()
+        return corrected
+
+    def correct(self, text):
+        """Metni düzeltir; çıktı eski `correct_turkish_text` ile birebir aynıdır."""
+        words = _TOKEN.findall(self.split_compounds(text))
+
+        special_phrases = self.special_phrases
+        exact_corrections = self.exact_corrections
+        preserve_words = self.preserve_words
+
+        out = []
+        i = 0
+        count = len(words)
+        while i < count:
+            word = words[i]
+            if word in _PUNCTUATION:
+                # Noktalama işaretleri öncesinde boşluk bırakılmaz
+                out.append(word)
+                i += 1
+                continue
+
+            corrected = None
+            current_word = word.lower()
+
+            # Özel kelime tamlamaları için
+            if i < count - 1:
+                phrase = special_phrases.get((word + " " + words[i + 1]).lower())
+                if phrase is not None:
+                    corrected = phrase
+                    i += 1
+
+            if corrected is None:
+                if current_word in preserve_words:
+                    corrected = word
+                elif current_word in exact_corrections:
+                    corrected = self._match_case(word, exact_corrections[current_word])
+                else:
+                    index = self._match_root(current_word)
+                    if index is None:
+                        corrected = word
+                    else:
+                        suffix = current_word[self.root_lengths[index]:]
+                        corrected = self._match_case(word, self.root_values[index] + suffix)
+
+            if out:
+                out.append(' ')
+            out.append(corrected)
+            i += 1
+
+        return ''.join(out).strip()
+
+
+ENGINE = CorrectionEngine(ROOTS, SPECIAL_PHRASES, EXACT_CORRECTIONS, PRESERVE_WORDS)
+
+
+def correct(text):
+    """Modül yüklenirken derlenen motorla metni düzeltir."""
+    return ENGINE.correct(text)
@@ -0,0 +1,277 @@
+"""Sözlük tabanlı bulanık (fuzzy) yazım düzeltme.
+
+Kural tabanlı düzeltmenin (corrector.py) tanımadığı yazım hataları için
+SymSpell tarzı silme dizini kullanılır: sözlükteki her kelimenin ASCII'ye
+katlanmış (ı→i, ş→s, ğ→g, ...) biçiminin ilk PREFIX_LENGTH harfinden en
+fazla MAX_DISTANCE harf silinerek elde edilen tüm biçimler başlangıçta bir
+kez dizine eklenir. Sorguda aynı silmeler üretilip dizinde bakılır ve
+adaylar Damerau-Levenshtein uzaklığıyla doğrulanır; maliyet sözlük
+boyutundan bağımsızdır.
+
+Bir kelime sırasıyla şöyle ele alınır:
+  1. sözlükte varsa ya da sözlükteki bir kelimeyle başlıyorsa (kök + ek) korunur
+  2. katlanmış biçimi bir sözlük kelimesiyle aynıysa Türkçe harfleri geri yüklenir
+     (kelimedeki Türkçe harfler korunur: kaşım -> kasım yapılmaz)
+  3. hiç Türkçe harf içermeyen kelimenin katlanmış biçimi bir sözlük
+     kelimesiyle başlıyorsa o kök geri yüklenir, ek korunur
+  4. `edits=True` ise uzunluğa göre 1 ya da 2 düzenleme uzaklığındaki en
+     yakın (eşitlikte en sık) sözlük kelimesi seçilir
+
+1-3 yalnızca Türkçe harfleri geri yükler; 4 ise sözlükte olmayan doğru
+kelimeleri de değiştirebileceğinden (yarın -> karın) yalnızca son çare
+olarak kullanılmalıdır (bkz. preprocess.correct_turkish_text).
+"""
+import os
+import re
+
+from turkish import turkish_lower
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "medical_lexicon.tsv")
+
+_FOLD = str.maketrans({"ı": "i", "ş": "s", "ğ": "g", "ü": "u", "ö": "o", "ç": "c", "â": "a", "î": "i", "û": "u"})
+_UPPER = str.maketrans({"i": "İ", "ı": "I"})
+_LETTERS = re.compile(r'[^\W\d_]+')
+
+
+def fold(word):
+    """Küçük harfli kelimeyi ASCII'ye katlar (ağrı -> agri)."""
+    return word.translate(_FOLD)
+
+
+def _keeps_letters(word, candidate):
+    """Aday, kelimedeki her Türkçe harfi aynı yerde koruyorsa True (katlanmış biçimleri aynı olmalı)."""
+    return all(a == b for a, b in zip(word, candidate) if a != a.translate(_FOLD))
+
+
+def load_lexicon(path):
+    """kelime<TAB>sıklık satırlarını okur; '#' ile başlayan satırlar yorumdur."""
+    words = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                word, count = line.rsplit("\t", 1)
+                words.append((turkish_lower(word.strip()), int(count)))
+            except ValueError:
+                raise ValueError(f"{path}:{line_no}: geçersiz satır: {line!r}")
+    return words
+
+
+def _deletes(word, max_distance):
+    """Kelimeden en fazla max_distance harf silinerek elde edilen biçimler (kendisi dahil)."""
+    result = {word}
+    frontier = [word]
+    for _ in range(max_distance):
+        next_frontier = []
+        for item in frontier:
+            for i in range(len(item)):
+                deleted = item[:i] + item[i + 1:]
+                if deleted not in result:
+                    result.add(deleted)
+                    next_frontier.append(deleted)
+        frontier = next_frontier
+    return result
+
+
+def edit_distance(a, b, limit):
+    """Sınırlı Damerau-Levenshtein (bitişik yer değiştirme) uzaklığı; limit aşılırsa limit + 1."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # Ortak ön ve son ekler uzaklığı değiştirmez; tablo yalnızca farklı kısım için kurulur
+    start = 0
+    end_a, end_b = len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return min(max(len(a), len(b)), limit + 1)
+    # Yalnızca köşegene en fazla `limit` uzaklıktaki hücreler hesaplanır
+    big = limit + 1
+    len_b = len(b)
+    previous2 = None
+    previous = [j if j <= limit else big for j in range(len_b + 1)]
+    for i in range(1, len(a) + 1):
+        current = [big] * (len_b + 1)
+        if i <= limit:
+            current[0] = i
+        row_min = current[0]
+        char_a = a[i - 1]
+        for j in range(max(1, i - limit), min(len_b, i + limit) + 1):
+            cost = 0 if char_a == b[j - 1] else 1
+            value = previous[j - 1] + cost
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == b[j - 1] and previous2[j - 2] + 1 < value:
+                value = previous2[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return big
+        previous2, previous = previous, current
+    return min(previous[-1], big)
+
+
+class FuzzyCorrector:
+    """SymSpell tarzı silme dizinli sözlük düzelticisi."""
+
+    MAX_DISTANCE = 2
+    PREFIX_LENGTH = 7
+    # Bu uzunluktan kısa kelimeler düzeltilmez (çok belirsiz)
+    MIN_WORD_LENGTH = 4
+    # Kelime -> düzeltme önbelleğinin en fazla boyutu
+    MEMO_SIZE = 50000
+
+    def __init__(self, lexicon, preserve=()):
+        self._words = []
+        self._counts = []
+        self._folded = []
+        self._known = set()
+        self._by_fold = {}      # katlanmış biçim -> en sık kelimenin sırası
+        self._deletes = {}      # silme biçimi -> kelime sırası ya da sıra listesi
+        self._memo = ({}, {})   # edits=False / edits=True
+
+        for word, count in lexicon:
+            if word in self._known:
+                continue
+            index = len(self._words)
+            folded = fold(word)
+            self._words.append(word)
+            self._counts.append(count)
+            self._folded.append(folded)
+            self._known.add(word)
+
+            best = self._by_fold.get(folded)
+            if best is None or count > self._counts[best]:
+                self._by_fold[folded] = index
+
+            deletes = self._deletes
+            for deleted in _deletes(folded[:self.PREFIX_LENGTH], self.MAX_DISTANCE):
+                entry = deletes.get(deleted)
+                if entry is None:
+                    deletes[deleted] = index
+                elif type(entry) is int:
+                    deletes[deleted] = [entry, index]
+                else:
+                    entry.append(index)
+        # Sözlükte olmasa da hiç değiştirilmeyecek kelimeler
+        self._known.update(turkish_lower(word) for word in preserve)
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_LEXICON_PATH, preserve=()):
+        return cls(load_lexicon(path), preserve)
+
+    def __len__(self):
+        return len(self._words)
+
+    def _longest_prefix(self, word, table):
+        for end in range(len(word) - 1, self.MIN_WORD_LENGTH - 1, -1):
+            if word[:end] in table:
+                return end
+        return 0
+
+    def lookup(self, folded, max_distance):
+        """Katlanmış kelimeye en yakın sözlük kelimesinin sırasını döndürür; yoksa None."""
+        prefix = folded[:self.PREFIX_LENGTH]
+        candidates = set()
+        deletes = self._deletes
+        for deleted in _deletes(prefix, max_distance):
+            entry = deletes.get(deleted)
+            if entry is None:
+                continue
+            if type(entry) is int:
+                candidates.add(entry)
+            else:
+                candidates.update(entry)
+
+        best = None
+        best_key = None
+        limit = max_distance
+        for index in candidates:
+            # Bulunan en iyi uzaklıktan kötü adaylar erken elenir
+            distance = edit_distance(folded, self._folded[index], limit)
+            if distance > limit:
+                continue
+            key = (distance, -self._counts[index])
+            if best_key is None or key < best_key:
+                best, best_key = index, key
+                limit = distance
+        return best
+
+    def _correct_lower(self, word, edits):
+        # 1. Bilinen kelime ya da bilinen kök + ek
+        if word in self._known or self._longest_prefix(word, self._known):
+            return word
+        folded = fold(word)
+        # 2. Yalnızca Türkçe harfleri eksik; var olan Türkçe harfler değiştirilmez
+        index = self._by_fold.get(folded)
+        if index is not None:
+            return self._words[index] if _keeps_letters(word, self._words[index]) else word
+        # 3. Türkçe harfleri eksik kök + ek; Türkçe harf içeren kelimede kök
+        # geri yüklenirse ekteki harfler bozulur (açılmıyor -> acilmıyor)
+        if word == folded:
+            end = self._longest_prefix(folded, self._by_fold)
+            if end:
+                return self._words[self._by_fold[folded[:end]]] + word[end:]
+        if not edits:
+            return word
+        # 4. Düzenleme uzaklığıyla en yakın kelime; çoğu yazım hatası tek
+        # düzenleme olduğundan önce daha ucuz olan 1 uzaklık denenir
+        index = self.lookup(folded, 1)
+        if index is None and len(word) >= 7:
+            index = self.lookup(folded, self.MAX_DISTANCE)
+        if index is None or (self._folded[index] == folded and not _keeps_letters(word, self._words[index])):
+            # Aynı kelimenin başka Türkçe harfli biçimi düzeltme değildir (kaşım -> kasım)
+            return word
+        return self._words[index]
+
+    def correct_word(self, word, edits=True):
+        """Tek kelimeyi düzeltir; büyük harfle başlayan kelimenin ilk harfi korunur."""
+        if len(word) < self.MIN_WORD_LENGTH or not word.isalpha():
+            return word
+        memo = self._memo[edits]
+        corrected = memo.get(word)
+        if corrected is None:
+            lower = turkish_lower(word)
+            corrected = self._correct_lower(lower, edits)
+            if corrected != lower and word[0].isupper():
+                corrected = corrected[0].translate(_UPPER).upper() + corrected[1:]
+            elif corrected == lower:
+                corrected = word
+            if len(memo) >= self.MEMO_SIZE:
+                memo.clear()
+            memo[word] = corrected
+        return corrected
+
+    def correct(self, text, edits=True, keep=None):
+        """Metindeki her kelimeyi düzeltir; noktalama ve boşluklar korunur.
+
+        keep verilirse küçük harfli kelime için True döndürdüğü kelimeler
+        (ör. sınıflandırıcının tanıdığı kelimeler) olduğu gibi bırakılır.
+        """
+        if keep is None:
+            return _LETTERS.sub(lambda m: self.correct_word(m.group(), edits), text)
+        return _LETTERS.sub(lambda m: m.group() if keep(turkish_lower(m.group()))
+                            else self.correct_word(m.group(), edits), text)
+
+
+def _build_default():
+    # Kural tabanlı düzelticinin koruduğu kelimeler (karı, karım) burada da değiştirilmez
+    from corrector import PRESERVE_WORDS
+    return FuzzyCorrector.from_file(os.environ.get("HEALTH_LEXICON_PATH", DEFAULT_LEXICON_PATH),
+                                    preserve=PRESERVE_WORDS)
+
+
+FUZZY = _build_default()
+
+
+def correct(text, edits=True, keep=None):
+    """Başlangıçta derlenen sözlükle metni bulanık düzeltir."""
+    return FUZZY.correct(text, edits, keep)
@@ -0,0 +1,26 @@
+"""gunicorn ayarları; gunicorn çalışma dizinindeki bu dosyayı kendiliğinden yükler.
+
+Ayarlar komut satırından verilir (ör. --workers, --preload); burada
+yalnızca başlangıç kancaları vardır:
+
+- --preload ile uygulama ana süreçte bir kez yüklenir. Fork'tan önce
+  yüklenen nesneler GC'nin kalıcı nesline taşınır; böylece çöp toplayıcı
+  bu nesnelere dokunup paylaşılan bellek sayfalarını worker'larda
+  kopyalatmaz.
+- Worker başlar başlamaz app.init_worker() çağrılır; upstream havuzu ve
+  iş çalıştırıcısı ilk istekte değil başlangıçta kurulur.
+"""
+import gc
+import sys
+
+
+def pre_fork(server, worker):
+    if server.cfg.preload_app:
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    # Yalnızca Flask uygulaması (app.py) yüklendiyse; async_app kaynaklarını kendi kurar
+    flask_module = sys.modules.get("app")
+    if flask_module is not None and hasattr(flask_module, "init_worker"):
+        flask_module.init_worker()
@@ -0,0 +1,103 @@
+"""de.py sohbet asistanı için token bütçeli konuşma geçmişi.
+
+Sistem prompt'u ve son mesajlar olduğu gibi gönderilir. Bütçe (veya son
+mesaj sayısı sınırı) aşıldığında en eski mesajlar tek satırlık özetlere
+dönüştürülür ve sistem mesajının sonuna eklenir. Özet de kendi bütçesini
+aşarsa en eski özet satırları atılır. Böylece her turda gönderilen istek
+boyutu konuşma uzunluğundan bağımsız olarak sınırlı kalır.
+
+Token sayısı bir tokenizer yerine karakter sayısından tahmin edilir
+(~4 karakter / token); bütçeler bu tahmine göre biraz pay bırakmalıdır.
+
+CHAT_MAX_CONTEXT_TOKENS: gönderilen toplam tahmini token (varsayılan 2000)
+CHAT_MAX_RECENT_MESSAGES: aynen gönderilen en fazla mesaj (varsayılan 8)
+CHAT_SUMMARY_TOKENS: özet bölümünün en fazla tahmini token'ı (varsayılan 300)
+"""
+from collections import deque
+
+import response_parser
+from upstream import env_int
+
+CHARS_PER_TOKEN = 4
+# Rol ve biçim alanları için mesaj başına eklenen tahmini token
+MESSAGE_OVERHEAD = 4
+SUMMARY_LINE_CHARS = 160
+SUMMARY_HEADER = "\n\nÖnceki konuşmanın özeti:"
+
+
+def estimate_tokens(text):
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _clip(text, limit=SUMMARY_LINE_CHARS):
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit - 1].rstrip() + "…"
+
+
+def summarize_message(message):
+    """Mesajı özet için tek satıra indirir; asistan yanıtından olası nedenler alınır."""
+    content = message["content"]
+    if message["role"] == "assistant":
+        causes = response_parser.parse(content).causes
+        if causes:
+            return "- Asistan (olası nedenler): " + _clip(causes)
+        return "- Asistan: " + _clip(content)
+    return "- Kullanıcı: " + _clip(content)
+
+
+class ConversationHistory:
+    """Sistem prompt'u, özet ve son mesajlardan oluşan sınırlı geçmiş."""
+
+    def __init__(self, system_prompt, max_tokens=None, max_recent=None, summary_tokens=None):
+        self.max_tokens = max_tokens or env_int("CHAT_MAX_CONTEXT_TOKENS", 2000)
+        self.max_recent = max_recent or env_int("CHAT_MAX_RECENT_MESSAGES", 8)
+        self.summary_tokens = summary_tokens or env_int("CHAT_SUMMARY_TOKENS", 300)
+        self.system_prompt = system_prompt
+        self._system_tokens = estimate_tokens(system_prompt) + MESSAGE_OVERHEAD
+        self._recent = deque()    # (mesaj, token)
+        self._recent_tokens = 0
+        self._summary = deque()   # (satır, token)
+        self._summary_tokens = 0
+        self.summarized = 0       # özete taşınan mesaj sayısı
+        self.dropped = 0          # özetten de atılan satır sayısı
+
+    def append(self, role, content):
+        tokens = estimate_tokens(content) + MESSAGE_OVERHEAD
+        self._recent.append(({"role": role, "content": content}, tokens))
+        self._recent_tokens += tokens
+        self._compact()
+
+    def token_count(self):
+        """Gönderilecek mesajların toplam tahmini token'ı"""
+        summary = estimate_tokens(SUMMARY_HEADER) + self._summary_tokens if self._summary else 0
+        return self._system_tokens + summary + self._recent_tokens
+
+    def _compact(self):
+        # Son mesaj (yeni soru) her zaman aynen gönderilir
+        while len(self._recent) > 1 and (len(self._recent) > self.max_recent
+                                         or self.token_count() > self.max_tokens):
+            message, tokens = self._recent.popleft()
+            self._recent_tokens -= tokens
+            self.summarized += 1
+            self._add_summary_line(summarize_message(message))
+
+    def _add_summary_line(self, line):
+        tokens = estimate_tokens(line) + 1
+        self._summary.append((line, tokens))
+        self._summary_tokens += tokens
+        while len(self._summary) > 1 and self._summary_tokens > self.summary_tokens:
+            _, dropped_tokens = self._summary.popleft()
+            self._summary_tokens -= dropped_tokens
+            self.dropped += 1
+
+    def messages(self):
+        """Upstream'e gönderilecek mesaj listesi"""
+        system = self.system_prompt
+        if self._summary:
+            system += SUMMARY_HEADER + "".join("\n" + line for line, _ in self._summary)
+        return [{"role": "system", "content": system}] + [message for message, _ in self._recent]
+
+    def __len__(self):
+        return len(self._recent)
@@ -0,0 +1,375 @@
+"""/api/health/jobs için arka plan analiz işleri.
+
+İstemci işi gönderir ve hemen bir iş kimliği alır; analiz sınırlı bir
+thread havuzunda çalışır. Sonuç TTL'li bir SQLite dosyasında tutulur ve
+GET /api/health/jobs/<id> ile sorgulanır ya da callback_url verildiyse
+oraya POST edilir. callback_url'nin host'u HEALTH_JOB_CALLBACK_HOSTS
+listesinde değilse çözülür ve yalnızca genel (public) adreslere izin verilir;
+loopback, özel ağ, link-local (ör. 169.254.169.254) ve ayrılmış adresler
+hem gönderimde hem de teslimden hemen önce reddedilir.
+
+Dosya gunicorn worker'ları arasında paylaşılır; her iş onu çalıştıran
+worker adına bir kira (lease) süresiyle işaretlenir. Worker yeniden
+başlarsa kirası dolan bekleyen işler (ve teslim edilemeyen callback'ler)
+herhangi bir worker tarafından yeniden kuyruğa alınır.
+"""
+import hashlib
+import hmac
+import ipaddress
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+import metrics
+from admission import OVERLOADED_ERROR, Rejected
+from log import get_logger
+from sqlite_local import LocalConnection
+from upstream import env_float, env_int
+
+logger = get_logger("jobs")
+
+JOB_NOT_FOUND_ERROR = "İş bulunamadı ya da süresi doldu."
+INVALID_CALLBACK_ERROR = "Geçersiz callback_url."
+JOB_FAILED_ERROR = "Analiz tamamlanamadı, lütfen tekrar deneyin."
+
+JOB_EVENTS = metrics.REGISTRY.register(metrics.Counter(
+    "health_jobs_total", "Async job events (submitted, done, error, deferred, requeued, callback_*)",
+    ("event",)))
+
+
+def check_public_host(hostname, port):
+    """Host'un çözüldüğü tüm adresler genel (public) değilse ValueError fırlatır."""
+    try:
+        infos = socket.getaddrinfo(hostname, port, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError):
+        raise ValueError(INVALID_CALLBACK_ERROR)
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+        if address.version == 6 and address.ipv4_mapped is not None:
+            address = address.ipv4_mapped
+        # is_global loopback, özel ağ, link-local, paylaşılan ve ayrılmış adresleri dışlar
+        if not address.is_global or address.is_multicast:
+            raise ValueError(INVALID_CALLBACK_ERROR)
+
+
+class JobStore:
+    """İşlerin ve sonuçlarının SQLite kaydı."""
+
+    def __init__(self, path, ttl, lease):
+        self.path = path
+        self.ttl = ttl
+        self.lease = lease
+        self._connect = LocalConnection(path)
+        conn = self._connect()
+        conn.execute("""CREATE TABLE IF NOT EXISTS health_jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            query TEXT,
+            should_correct INTEGER NOT NULL,
+            callback_url TEXT,
+            callback_status TEXT,
+            result TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            lease_until REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )""")
+        conn.execute("CREATE INDEX IF NOT EXISTS health_jobs_lease ON health_jobs (lease_until)")
+        conn.commit()
+
+    def create(self, job_id, query, should_correct, callback_url, now):
+        conn = self._connect()
+        conn.execute("INSERT INTO health_jobs (id, status, query, should_correct, callback_url, created_at, "
+                     "lease_until, expires_at) VALUES (?, 'queued', ?, ?, ?, ?, ?, ?)",
+                     (job_id, query, int(bool(should_correct)), callback_url, now, now + self.lease,
+                      now + self.ttl))
+        conn.commit()
+
+    def get(self, job_id, now):
+        row = self._connect().execute(
+            "SELECT id, status, result, created_at FROM health_jobs WHERE id = ? AND expires_at > ?",
+            (job_id, now)).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "status": row[1], "result": json.loads(row[2]) if row[2] else None,
+                "created_at": row[3]}
+
+    def start(self, job_id, now):
+        """İşi çalışıyor olarak işaretler ve kirasını yeniler."""
+        conn = self._connect()
+        conn.execute("UPDATE health_jobs SET status = 'running', attempts = attempts + 1, lease_until = ? "
+                     "WHERE id = ?", (now + self.lease, job_id))
+        conn.commit()
+
+    def finish(self, job_id, status, result, now):
+        """Sonucu yazar; şikayet metni artık gerekmediğinden silinir."""
+        conn = self._connect()
+        conn.execute("UPDATE health_jobs SET status = ?, result = ?, query = NULL, lease_until = ?, "
+                     "expires_at = ?, callback_status = CASE WHEN callback_url IS NULL THEN NULL "
+                     "ELSE 'pending' END WHERE id = ?",
+                     (status, json.dumps(result, ensure_ascii=False), now + self.lease, now + self.ttl, job_id))
+        conn.commit()
+
+    def renew(self, job_ids, now):
+        """Bu worker'da bekleyen ya da çalışan işlerin kirasını uzatır."""
+        conn = self._connect()
+        conn.executemany("UPDATE health_jobs SET lease_until = ? WHERE id = ?",
+                         [(now + self.lease, job_id) for job_id in job_ids])
+        conn.commit()
+
+    def defer(self, job_id, until):
+        """İşi kuyruğa geri koyar; `until` anından sonra yeniden alınır.
+
+        start() ile sayılan deneme geri alınır; erteleme başarısız deneme değildir.
+        """
+        conn = self._connect()
+        conn.execute("UPDATE health_jobs SET status = 'queued', attempts = MAX(attempts - 1, 0), lease_until = ? "
+                     "WHERE id = ?", (until, job_id))
+        conn.commit()
+
+    def set_callback_status(self, job_id, callback_status):
+        conn = self._connect()
+        conn.execute("UPDATE health_jobs SET callback_status = ? WHERE id = ?", (callback_status, job_id))
+        conn.commit()
+
+    def claim_stale(self, now, limit=100):
+        """Kirası dolmuş bekleyen işleri ve teslim edilmemiş callback'leri bu worker adına alır."""
+        conn = self._connect()
+        # Okuma ve kira yenileme tek yazma kilidi altında ki iki worker aynı işi almasın
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, status, query, should_correct, callback_url, attempts, created_at FROM health_jobs "
+                "WHERE lease_until <= ? AND expires_at > ? "
+                "AND (status IN ('queued', 'running') OR callback_status = 'pending') "
+                "ORDER BY created_at LIMIT ?", (now, now, limit)).fetchall()
+            conn.executemany("UPDATE health_jobs SET lease_until = ? WHERE id = ?",
+                             [(now + self.lease, row[0]) for row in rows])
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return rows
+
+    def purge(self, now):
+        conn = self._connect()
+        deleted = conn.execute("DELETE FROM health_jobs WHERE expires_at <= ?", (now,)).rowcount
+        conn.commit()
+        return deleted
+
+
+def public_view(job):
+    """GET yanıtı ve callback gövdesi."""
+    view = {"job_id": job["id"], "status": job["status"], "created_at": job["created_at"]}
+    if job["result"] is not None:
+        view["result"] = job["result"]
+    return view
+
+
+class JobRunner:
+    """İşleri süreç başına sınırlı bir thread havuzunda çalıştırır.
+
+    `handler(query, should_correct)` analiz sonucunu (ya da hata sözlüğünü)
+    döndürür; app.analyze_health_query ile aynı sözleşme.
+    """
+
+    # Kirası dolan işlerin aranma ve süresi dolanların silinme aralığı (sn)
+    SWEEP_INTERVAL = 5.0
+
+    def __init__(self, store, handler, workers=None, max_pending=None, max_attempts=None, max_wait=None,
+                 callback_timeout=None, callback_retries=None, callback_secret=None, callback_hosts=None):
+        self.store = store
+        self.handler = handler
+        self.workers = workers if workers is not None else env_int("HEALTH_JOB_WORKERS", 4)
+        self.max_pending = max_pending if max_pending is not None else env_int("HEALTH_JOB_MAX_PENDING", 100)
+        self.max_attempts = max_attempts if max_attempts is not None else env_int("HEALTH_JOB_MAX_ATTEMPTS", 3)
+        # Aşırı yük nedeniyle ertelenen bir işin gönderimden sonra en fazla bekleyeceği süre (sn)
+        self.max_wait = max_wait if max_wait is not None else env_float("HEALTH_JOB_MAX_WAIT", 600.0)
+        self.callback_timeout = (callback_timeout if callback_timeout is not None
+                                 else env_float("HEALTH_JOB_CALLBACK_TIMEOUT", 5.0))
+        self.callback_retries = (callback_retries if callback_retries is not None
+                                 else env_int("HEALTH_JOB_CALLBACK_RETRIES", 3))
+        self.callback_secret = (callback_secret if callback_secret is not None
+                                else os.environ.get("HEALTH_JOB_CALLBACK_SECRET", ""))
+        if callback_hosts is None:
+            callback_hosts = os.environ.get("HEALTH_JOB_CALLBACK_HOSTS", "").split(",")
+        self.callback_hosts = {host.strip().lower() for host in callback_hosts if host.strip()}
+
+        # Kiralar dolmadan birkaç kez yenilenebilsin
+        self.sweep_interval = min(self.SWEEP_INTERVAL, store.lease / 3)
+        self.pending = 0
+        # Bu worker'ın kuyruğundaki işler; kiraları her taramada yenilenir ki
+        # havuzda sıra bekleyen bir iş başka bir worker'ca yeniden alınmasın
+        self._held = set()
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="health-job")
+        self._stopped = threading.Event()
+        threading.Thread(target=self._sweep_loop, name="health-job-sweeper", daemon=True).start()
+
+    def validate_callback(self, callback_url):
+        """callback_url http(s) olmalı; HEALTH_JOB_CALLBACK_HOSTS verildiyse listedeki bir host'a,
+        verilmediyse yalnızca genel (public) adreslere çözülen bir host'a gitmeli."""
+        if callback_url is None:
+            return None
+        parts = urlsplit(str(callback_url))
+        try:
+            port = parts.port
+        except ValueError:
+            raise ValueError(INVALID_CALLBACK_ERROR)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(INVALID_CALLBACK_ERROR)
+        if self.callback_hosts:
+            if parts.hostname.lower() not in self.callback_hosts:
+                raise ValueError(INVALID_CALLBACK_ERROR)
+        else:
+            check_public_host(parts.hostname, port or (443 if parts.scheme == "https" else 80))
+        return str(callback_url)
+
+    def submit(self, query, should_correct=True, callback_url=None):
+        """İşi kaydeder ve kuyruğa alır; kuyruk doluysa Rejected fırlatır."""
+        callback_url = self.validate_callback(callback_url)
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise Rejected("overloaded", OVERLOADED_ERROR, self.sweep_interval)
+            self.pending += 1
+        job_id = secrets.token_urlsafe(16)
+        now = time.time()
+        try:
+            self.store.create(job_id, query, should_correct, callback_url, now)
+        except BaseException:
+            self._done(None)
+            raise
+        with self._lock:
+            self._held.add(job_id)
+        self._executor.submit(self._run, job_id, "queued", query, should_correct, callback_url, 0, now)
+        JOB_EVENTS.inc(event="submitted")
+        return {"id": job_id, "status": "queued", "result": None, "created_at": now}
+
+    def get(self, job_id):
+        return self.store.get(job_id, time.time())
+
+    def _done(self, job_id):
+        with self._lock:
+            self.pending -= 1
+            self._held.discard(job_id)
+
+    def _run(self, job_id, status, query, should_correct, callback_url, attempts, created_at):
+        try:
+            if status in ("queued", "running"):
+                status = self._analyze(job_id, query, should_correct, attempts, created_at)
+            if status in ("done", "error") and callback_url:
+                self._deliver(job_id, callback_url)
+        except Exception:
+            # İş kuyrukta kalır; kirası dolunca yeniden denenir
+            logger.exception("job failed id=%s", job_id[:8])
+        finally:
+            self._done(job_id)
+
+    def _analyze(self, job_id, query, should_correct, attempts, created_at):
+        now = time.time()
+        if attempts >= self.max_attempts:
+            # Worker'ı her seferinde düşüren bir iş sonsuza dek denenmesin
+            self.store.finish(job_id, "error", {"error": JOB_FAILED_ERROR}, now)
+            JOB_EVENTS.inc(event="error")
+            return "error"
+        self.store.start(job_id, now)
+        result = self.handler(query, should_correct)
+        if result.get("code") == "overloaded":
+            # Ön plandaki istekler upstream'i doldurmuş; iş biraz sonra yeniden alınır.
+            # Erteleme deneme sayılmaz, bekleme süresi max_wait ile sınırlanır.
+            retry_at = time.time() + result.get("retry_after", self.sweep_interval)
+            if retry_at < created_at + self.max_wait:
+                self.store.defer(job_id, retry_at)
+                JOB_EVENTS.inc(event="deferred")
+                return "queued"
+        status = "error" if "error" in result else "done"
+        self.store.finish(job_id, status, result, time.time())
+        JOB_EVENTS.inc(event=status)
+        return status
+
+    def _deliver(self, job_id, callback_url):
+        job = self.store.get(job_id, time.time())
+        if job is None:
+            return
+        body = json.dumps(public_view(job), ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.callback_secret:
+            digest = hmac.new(self.callback_secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+            headers["X-Neyimvar-Signature"] = "sha256=" + digest
+        for attempt in range(self.callback_retries):
+            try:
+                # DNS kaydı gönderimden sonra değişmiş olabilir; her denemede yeniden doğrulanır
+                self.validate_callback(callback_url)
+            except ValueError:
+                logger.warning("callback rejected id=%s: host is not public", job_id[:8])
+                self.store.set_callback_status(job_id, "failed")
+                JOB_EVENTS.inc(event="callback_rejected")
+                return
+            try:
+                response = self._session.post(callback_url, data=body, headers=headers,
+                                              timeout=self.callback_timeout, allow_redirects=False)
+                if response.status_code < 300:
+                    self.store.set_callback_status(job_id, "delivered")
+                    JOB_EVENTS.inc(event="callback_delivered")
+                    return
+                logger.warning("callback status=%d id=%s", response.status_code, job_id[:8])
+            except requests.RequestException as e:
+                logger.warning("callback error id=%s: %s", job_id[:8], e)
+            if attempt + 1 < self.callback_retries:
+                time.sleep(2 ** attempt)
+        self.store.set_callback_status(job_id, "failed")
+        JOB_EVENTS.inc(event="callback_failed")
+
+    def recover(self):
+        """Kirası dolmuş işleri bu worker'da yeniden kuyruğa alır; alınan iş sayısını döndürür."""
+        with self._lock:
+            room = self.max_pending - self.pending
+        if room <= 0:
+            return 0
+        rows = self.store.claim_stale(time.time(), room)
+        for job_id, status, query, should_correct, callback_url, attempts, created_at in rows:
+            with self._lock:
+                self.pending += 1
+                self._held.add(job_id)
+            self._executor.submit(self._run, job_id, status, query, bool(should_correct), callback_url, attempts,
+                                  created_at)
+        if rows:
+            JOB_EVENTS.inc(len(rows), event="requeued")
+            logger.info("requeued %d jobs", len(rows))
+        return len(rows)
+
+    def _sweep_loop(self):
+        while not self._stopped.is_set():
+            try:
+                with self._lock:
+                    held = list(self._held)
+                if held:
+                    self.store.renew(held, time.time())
+                self.recover()
+                self.store.purge(time.time())
+            except Exception:
+                logger.exception("job sweep failed")
+            self._stopped.wait(self.sweep_interval)
+
+    def stats(self):
+        with self._lock:
+            return {"pending": self.pending, "workers": self.workers}
+
+    def close(self):
+        self._stopped.set()
+        self._executor.shutdown(wait=False)
+
+
+def create_job_store_from_env():
+    """HEALTH_JOBS_PATH (varsayılan health_jobs.sqlite3), HEALTH_JOB_TTL (sn, varsayılan 3600),
+    HEALTH_JOB_LEASE (sn, varsayılan 300; upstream zaman aşımlarından uzun olmalı)"""
+    return JobStore(os.environ.get("HEALTH_JOBS_PATH", "health_jobs.sqlite3"),
+                    env_float("HEALTH_JOB_TTL", 3600.0), env_float("HEALTH_JOB_LEASE", 300.0))
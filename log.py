@@ -0,0 +1,66 @@
+"""Sunucu için seviyeli, örneklemeli ve asenkron loglama.
+
+Kayıtlar istek thread'inde yalnızca bir kuyruğa eklenir; stdout'a yazma
+arka plandaki QueueListener thread'inde yapılır. INFO ve altındaki kayıtlar
+LOG_SAMPLE_RATE oranında örneklenir, uyarı ve hatalar her zaman yazılır.
+Kullanıcı semptomları loglanmaz; yalnızca uzunluk ve sorgu anahtarı yazılır.
+
+LOG_LEVEL: DEBUG, INFO (varsayılan), WARNING, ...
+LOG_SAMPLE_RATE: 0-1 arası (varsayılan 1.0)
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+
+LOGGER_NAME = "neyimvar"
+
+_listener = None
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or self.rate >= 1.0 or random.random() < self.rate
+
+
+def _start_listener(log_queue):
+    global _listener
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(
+        "%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s"))
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=False)
+    _listener.start()
+
+
+def setup_logging():
+    """Kök 'neyimvar' logger'ını kuyruklu handler ile yapılandırır (bir kez)."""
+    logger = logging.getLogger(LOGGER_NAME)
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+    logger.propagate = False
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(float(os.environ.get("LOG_SAMPLE_RATE", 1.0))))
+    logger.addHandler(queue_handler)
+    _start_listener(log_queue)
+
+    # Fork sonrası (gunicorn --preload) dinleyici thread çocuk süreçte yeniden başlatılır
+    os.register_at_fork(after_in_child=lambda: _start_listener(log_queue))
+    # Çıkışta kuyrukta kalan kayıtlar yazılır
+    atexit.register(lambda: _listener.stop())
+    return logger
+
+
+def get_logger(name):
+    setup_logging()
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
@@ -0,0 +1,190 @@
+"""Süreç içi sayaç ve histogramlar; /metrics için Prometheus metin biçimi.
+
+Her gunicorn worker'ı kendi değerlerini tutar; Prometheus tarafında
+`instance`/`pid` etiketiyle toplanmalıdır.
+
+HEALTH_SERVER_TIMING açıkken isteğin aşama süreleri ayrıca Server-Timing
+başlığıyla döndürülür (bkz. bench/load_health.py).
+"""
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [kova sayıları..., toplam, adet]
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, [("le", f"{bound:g}")])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, [("le", "+Inf")])
+            lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {series[-2]}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class GaugeFunc:
+    """Değeri okunma anında bir fonksiyondan alınan gösterge."""
+
+    def __init__(self, name, help_text, labelname, func):
+        self.name = name
+        self.help_text = help_text
+        self.labelname = labelname
+        self.func = func
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for label, value in sorted(self.func().items()):
+            lines.append(f"{self.name}{_format_labels((self.labelname,), (label,))} {value}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "health_stage_duration_seconds", "Time spent in each /api/health stage", ("stage",)))
+REQUESTS = REGISTRY.register(Counter(
+    "health_requests_total", "Handled requests by endpoint and outcome", ("endpoint", "outcome")))
+UPSTREAM_RESPONSES = REGISTRY.register(Counter(
+    "health_upstream_responses_total", "Upstream chat completion responses by status code", ("status",)))
+UPSTREAM_TOKENS = REGISTRY.register(Counter(
+    "health_upstream_tokens_total", "Tokens reported by the upstream usage field", ("kind",)))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "health_cache_lookups_total", "Response lookups by result (snapshot, hit, semantic, miss)", ("result",)))
+PROCESS_START = time.time()
+REGISTRY.register(GaugeFunc(
+    "health_process_start_time_seconds", "Start time of this worker process", "pid",
+    lambda: {os.getpid(): PROCESS_START}))
+
+
+SERVER_TIMING = os.environ.get("HEALTH_SERVER_TIMING", "0").lower() in ("1", "true", "yes", "on")
+
+# O anki isteğin aşama süreleri (start_timing çağrılmadıysa None)
+_timings = contextvars.ContextVar("stage_timings", default=None)
+
+
+def start_timing():
+    """Bu istek (thread ya da task) için aşama sürelerini toplamaya başlar."""
+    timings = {}
+    _timings.set(timings)
+    return timings
+
+
+def server_timing_header(timings):
+    """{"correction": 0.0012, ...} -> "correction;dur=1.20, ..." (milisaniye)"""
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.items())
+
+
+@contextmanager
+def stage(name):
+    """`with stage("correction"):` biçiminde aşama süresi ölçer."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        timings = _timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + elapsed
+
+
+def record_upstream(status_code, body=None):
+    """Upstream durum kodunu ve (varsa) token kullanımını kaydeder."""
+    UPSTREAM_RESPONSES.inc(status=status_code)
+    usage = (body or {}).get("usage") or {}
+    for kind in ("prompt_tokens", "completion_tokens"):
+        if usage.get(kind):
+            UPSTREAM_TOKENS.inc(usage[kind], kind=kind.replace("_tokens", ""))
@@ -0,0 +1,43 @@
+"""Sorgu metninin düzeltilmesi ve sağlıkla ilgili olup olmadığının sınanması.
+
+Düzeltme tabloları (corrector), sağlık sözlüğü (classifier) ve bulanık
+düzeltme dizini (fuzzy) modül yüklenirken bir kez kurulur. gunicorn
+--preload ile bu yapılar ana süreçte kurulur ve worker'lar tarafından
+copy-on-write olarak paylaşılır.
+"""
+import classifier
+import corrector
+import fuzzy
+from config import FUZZY_CORRECTION, FUZZY_EDITS
+
+
+def is_health_related(text):
+    # Sözlük classifier modülünde başlangıçta bir kez derlenir
+    return classifier.is_health_related(text)
+
+
+def correct_turkish_text(text, use_fuzzy=None, use_edits=None):
+    """Türkçe metindeki sağlık şikayetleri için yazım hatalarını düzeltir.
+
+    Önce kural tabanlı düzeltme yapılır. Bulanık aşama açıksa (use_fuzzy
+    verilmezse FUZZY_CORRECTION) sözlükle Türkçe harfler geri yüklenir.
+    Düzenleme aşaması da açıksa (use_edits verilmezse FUZZY_EDITS, varsayılan
+    kapalı) ve metin hâlâ sağlıkla ilgili görünmüyorsa kelimeler düzenleme
+    uzaklığıyla en yakın sözlük kelimelerine düzeltilir. Bu aşama "para
+    lazım" gibi metinleri de "yara" yapıp sağlık sınırından geçirebildiğinden
+    varsayılan olarak kapalıdır. Açıkça sağlık dışı metne
+    (negatif puan) düzenleme yapılmaz ve sınıflandırıcının tanıdığı
+    kelimeler düzenlenmez; böylece "python kodum çalışmıyor" gibi bir
+    metin "kolum" yapılıp sağlıkla ilgili sayılmaz.
+    """
+    # Düzeltme tabloları corrector modülünde bir kez derlenir
+    corrected = corrector.correct(text)
+    if not (FUZZY_CORRECTION if use_fuzzy is None else use_fuzzy):
+        return corrected
+    corrected = fuzzy.correct(corrected, edits=False)
+    if not (FUZZY_EDITS if use_edits is None else use_edits):
+        return corrected
+    score = classifier.score(corrected)
+    if 0.0 <= score < classifier.CLASSIFIER.threshold:
+        corrected = fuzzy.correct(corrected, keep=classifier.knows)
+    return corrected
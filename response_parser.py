@@ -0,0 +1,141 @@
+"""Model yanıtındaki 12 numaralı bölümün tek geçişte ayrıştırılması.
+
+Tüm başlıklar metin bir kez taranarak bulunur; her bölüm kendi başlığından
+bir sonraki başlığa kadar uzanır. Böylece sırası değişmiş ya da eksik
+başlıklar da doğru ayrıştırılır.
+"""
+from typing import NamedTuple
+
+# Yanıt alanları ve modelin kullandığı başlıklar (prompt sırasıyla)
+SECTIONS = [
+    ("causes", "Olası Nedenler:"),
+    ("recommendations", "Öneriler:"),
+    ("when_to_see_doctor", "Ne Zaman Doktora Gitmelisiniz:"),
+    ("which_specialist", "Hangi Branşa Gitmelisiniz:"),
+    ("emergency_visit", "Acil Servise Gitmem Gerekir mi?:"),
+    ("home_care", "Evde Nelere Dikkat Etmeliyim?:"),
+    ("duration", "Ne Kadar Sürede Geçmeli?:"),
+    ("stress_related", "Bu Belirtiler Stres Kaynaklı Olabilir mi?:"),
+    ("similar_conditions", "Bu Belirtiler Hangi Hastalıklarla Karıştırılabilir?:"),
+    ("severity", "Bu Belirtiler Ciddi mi?:"),
+    ("medication", "Bu Durumda İlaç Kullanmalı mıyım?:"),
+    ("contagious", "Bu Durum Bulaşıcı mı?:"),
+]
+FIELDS = [field for field, _ in SECTIONS]
+
+_HEADINGS = [(heading, field) for field, heading in SECTIONS]
+
+
+def iter_headings(text, start=0, scan_from=None):
+    """Metindeki başlıkları (başlangıç, bitiş, alan) olarak sırayla üretir.
+
+    Tüm başlıklar ':' ile bittiği için metin yalnızca ':' karakterleri
+    üzerinden taranır. Başlığın önündeki "3." gibi numara başlığa dahil
+    edilir, böylece önceki bölümün içeriğine karışmaz. `scan_from` verilirse
+    daha önce taranmış ':' karakterleri atlanır; başlıklar yine `start`
+    konumuna kadar geriye uzanabilir.
+    """
+    colon = text.find(":", start if scan_from is None else max(start, scan_from))
+    while colon != -1:
+        end = colon + 1
+        for heading, field in _HEADINGS:
+            heading_start = end - len(heading)
+            if heading_start >= start and text.startswith(heading, heading_start):
+                # İsteğe bağlı "12." ön eki ve aradaki boşluklar
+                pos = heading_start
+                while pos > start and text[pos - 1].isspace():
+                    pos -= 1
+                if pos > start and text[pos - 1] == ".":
+                    digits = pos - 1
+                    while digits > start and text[digits - 1].isdecimal():
+                        digits -= 1
+                    if digits < pos - 1:
+                        heading_start = digits
+                yield heading_start, end, field
+                break
+        colon = text.find(":", end)
+
+
+class HealthAnalysis(NamedTuple):
+    causes: str = ""
+    recommendations: str = ""
+    when_to_see_doctor: str = ""
+    which_specialist: str = ""
+    emergency_visit: str = ""
+    home_care: str = ""
+    duration: str = ""
+    stress_related: str = ""
+    similar_conditions: str = ""
+    severity: str = ""
+    medication: str = ""
+    contagious: str = ""
+    full_response: str = ""
+
+    def as_dict(self):
+        return self._asdict()
+
+
+def parse(ai_response):
+    """Yanıtı tek taramada bölümlerine ayırır ve `HealthAnalysis` döndürür."""
+    # Yıldız (*) işaretlerini temizle
+    text = ai_response.replace("*", "")
+
+    sections = {}
+    current_field = None
+    content_start = 0
+    for heading_start, heading_end, field in iter_headings(text):
+        if current_field is not None and current_field not in sections:
+            sections[current_field] = text[content_start:heading_start].strip()
+        current_field = field
+        content_start = heading_end
+    if current_field is not None and current_field not in sections:
+        sections[current_field] = text[content_start:].strip()
+
+    return HealthAnalysis(full_response=text, **sections)
+
+
+class SectionStream:
+    """Akış halinde gelen yanıtta başlıkları izler.
+
+    Bir sonraki başlık görüldüğünde önceki bölüm tamamlanmış sayılır ve
+    (alan, içerik) olarak döndürülür.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.search_from = 0
+        # Bu konumdan önceki ':' karakterleri zaten denendi; her parçada
+        # bölümün başından yeniden taranmaz
+        self.scan_from = 0
+        self.current_field = None
+        self.content_start = 0
+        self.emitted = set()
+
+    def _complete(self, end):
+        field = self.current_field
+        # Tekrarlanan başlıklarda ilk bölüm geçerlidir (parse ile aynı)
+        if field is None or field in self.emitted:
+            return []
+        self.emitted.add(field)
+        return [(field, self.buffer[self.content_start:end].strip())]
+
+    def feed(self, delta):
+        self.buffer += delta.replace("*", "")
+        completed = []
+        for heading_start, heading_end, field in iter_headings(self.buffer, self.search_from, self.scan_from):
+            completed.extend(self._complete(heading_start))
+            self.current_field = field
+            self.content_start = heading_end
+            self.search_from = heading_end
+        if self.content_start:
+            # Tamamlanan bölümler atılır; tampon yalnızca süren bölümü tutar
+            # ki her parçada tüm yanıt kopyalanmasın
+            self.buffer = self.buffer[self.content_start:]
+            self.content_start = self.search_from = 0
+        self.scan_from = len(self.buffer)
+        return completed
+
+    def close(self):
+        completed = self._complete(len(self.buffer))
+        self.current_field = None
+        return completed
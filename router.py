@@ -0,0 +1,402 @@
+"""Birden çok model/uç nokta arasında yönlendirme: hedged istek ve devre kesici.
+
+Backend'ler sıralı bir listedir (UPSTREAM_BACKENDS). İstek ilk uygun
+backend'e gider; yanıt o backend'in son başarılı yanıtlarının
+UPSTREAM_HEDGE_PERCENTILE yüzdeliğinden uzun sürerse sıradaki backend'e
+ikinci (hedged) bir istek atılır ve önce gelen başarılı yanıt kullanılır.
+Başarısız yanıt gelirse sıradaki backend beklemeden denenir. Art arda
+UPSTREAM_BREAKER_FAILURES kez 429/5xx ya da bağlantı hatası veren backend'in
+devresi UPSTREAM_BREAKER_COOLDOWN saniye açılır; süre dolunca tek bir deneme
+isteğiyle yeniden kapanıp kapanmayacağına bakılır.
+
+UPSTREAM_BACKENDS örneği (api_key_env verilmezse API_KEY kullanılır):
+
+    [{"name": "deepseek", "model": "deepseek/deepseek-chat:free"},
+     {"name": "llama", "model": "meta-llama/llama-3.1-8b-instruct",
+      "base_url": "https://openrouter.ai/api/v1", "api_key_env": "API_KEY_2"}]
+
+Tanımlı değilse tek bir varsayılan backend (OPENROUTER_BASE_URL, MODEL) kullanılır.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import metrics
+from upstream import RETRY_STATUS_CODES, UpstreamClient, env_float, env_int
+
+BACKEND_REQUESTS = metrics.REGISTRY.register(metrics.Counter(
+    "health_upstream_backend_requests_total", "Upstream requests by backend and outcome",
+    ("backend", "outcome")))
+HEDGED_REQUESTS = metrics.REGISTRY.register(metrics.Counter(
+    "health_upstream_hedged_requests_total", "Extra requests sent because the first one was slow",
+    ("backend",)))
+BREAKER_TRIPS = metrics.REGISTRY.register(metrics.Counter(
+    "health_upstream_breaker_trips_total", "Times a backend circuit breaker opened", ("backend",)))
+
+_active_backends = []
+metrics.REGISTRY.register(metrics.GaugeFunc(
+    "health_upstream_breaker_open", "1 if the backend circuit breaker is open", "backend",
+    lambda: {backend.name: int(backend.breaker.state != CircuitBreaker.CLOSED)
+             for backend in _active_backends}))
+
+
+class CircuitOpenError(ConnectionError):
+    """Devresi kapalı (kullanılabilir) backend kalmadı."""
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold=None, cooldown=None, clock=time.monotonic):
+        self.failure_threshold = failure_threshold or env_int("UPSTREAM_BREAKER_FAILURES", 5)
+        self.cooldown = cooldown or env_float("UPSTREAM_BREAKER_COOLDOWN", 30.0)
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """İstek gönderilebilir mi; açık devrede bekleme dolduysa tek deneme isteğine izin verir."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        """Devre yeni açıldıysa True döner."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED
+                                                and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                return True
+            return False
+
+    def release(self):
+        """Sonucu beklenmeden iptal edilen deneme isteği sonraki isteğe yeniden hak tanır."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+
+class LatencyTracker:
+    """Son başarılı yanıt sürelerinden yüzdelik hesabı."""
+
+    def __init__(self, window=200, min_samples=20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+
+    def add(self, seconds):
+        self._samples.append(seconds)
+
+    def percentile(self, p):
+        if len(self._samples) < self.min_samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+class Backend:
+    """Tek bir model/uç nokta; devre kesici ve gecikme geçmişi süreç içinde tutulur."""
+
+    def __init__(self, name, model, api_key, base_url=None, max_retries=None):
+        self.name = name
+        self.model = model
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.breaker = CircuitBreaker()
+        self.latency = LatencyTracker()
+
+    def payload(self, payload):
+        return dict(payload, model=self.model)
+
+
+def load_backends(default_model, default_api_key):
+    """UPSTREAM_BACKENDS'tan backend listesini oluşturur."""
+    raw = os.environ.get("UPSTREAM_BACKENDS")
+    if not raw:
+        return [Backend("default", default_model, default_api_key)]
+
+    entries = json.loads(raw)
+    backends = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"model": entry}
+        api_key = os.environ.get(entry["api_key_env"]) if "api_key_env" in entry else default_api_key
+        # Birden çok backend varken yeniden deneme yerine sıradaki backend'e geçilir
+        max_retries = entry.get("max_retries", 0 if len(entries) > 1 else None)
+        backends.append(Backend(entry.get("name") or entry["model"], entry["model"], api_key,
+                                base_url=entry.get("base_url"), max_retries=max_retries))
+    return backends
+
+
+class BaseRouter:
+    def __init__(self, backends, hedge_percentile=None, hedge_delay=None, hedge_min_delay=None,
+                 max_hedges=None):
+        self.backends = backends
+        self.hedge_percentile = hedge_percentile or env_float("UPSTREAM_HEDGE_PERCENTILE", 0.95)
+        # Yeterli gecikme örneği yokken kullanılan bekleme
+        self.hedge_delay = hedge_delay or env_float("UPSTREAM_HEDGE_DELAY", 2.0)
+        self.hedge_min_delay = hedge_min_delay or env_float("UPSTREAM_HEDGE_MIN_DELAY", 0.05)
+        self.max_hedges = max_hedges if max_hedges is not None else env_int("UPSTREAM_MAX_HEDGES", 1)
+        _active_backends[:] = backends
+
+    def _next_backend(self, used):
+        for backend in self.backends:
+            if backend not in used and backend.breaker.allow():
+                used.add(backend)
+                return backend
+        return None
+
+    def _hedge_after(self, backend):
+        delay = backend.latency.percentile(self.hedge_percentile)
+        return max(self.hedge_delay if delay is None else delay, self.hedge_min_delay)
+
+    @staticmethod
+    def _record(backend, started, response=None, latency=True):
+        """Yanıtı (ya da hata için None) devre kesiciye ve metriklere işler.
+
+        latency=False ise (akış istekleri) süre, hedge gecikmesini belirleyen
+        gecikme izleyicisine eklenmez; akışta ölçülen yalnızca başlıklara kadar
+        geçen süredir ve tam yanıt süresiyle karşılaştırılamaz.
+        """
+        if response is None or response.status_code in RETRY_STATUS_CODES:
+            if backend.breaker.record_failure():
+                BREAKER_TRIPS.inc(backend=backend.name)
+            outcome = "failure"
+        else:
+            backend.breaker.record_success()
+            if latency and response.status_code == 200:
+                backend.latency.add(time.monotonic() - started)
+            outcome = "ok" if response.status_code == 200 else "rejected"
+        BACKEND_REQUESTS.inc(backend=backend.name, outcome=outcome)
+
+
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class Router(BaseRouter):
+    """Thread tabanlı sunucu (Flask) için yönlendirici."""
+
+    def __init__(self, backends, workers=None, **kwargs):
+        super().__init__(backends, **kwargs)
+        self._clients = {backend: UpstreamClient(base_url=backend.base_url, max_retries=backend.max_retries)
+                         for backend in backends}
+        self._executor = None
+        if len(backends) > 1:
+            self._executor = ThreadPoolExecutor(max_workers=workers or env_int("UPSTREAM_ROUTER_WORKERS", 64),
+                                                thread_name_prefix="upstream-router")
+
+    def preconnect(self):
+        """Her backend'in havuzuna önceden bir bağlantı açar (bkz. UpstreamClient.preconnect)."""
+        for client in self._clients.values():
+            client.preconnect()
+
+    def _call(self, backend, payload, stream=False):
+        started = time.monotonic()
+        try:
+            response = self._clients[backend].chat_completion(backend.payload(payload), backend.api_key,
+                                                              stream=stream)
+        except Exception:
+            self._record(backend, started)
+            raise
+        self._record(backend, started, response, latency=not stream)
+        return response
+
+    def chat_completion(self, payload):
+        """İlk başarılı yanıtı, hiçbiri başarılı değilse son yanıtı ya da son hatayı döndürür."""
+        used = set()
+        backend = self._next_backend(used)
+        if backend is None:
+            raise CircuitOpenError("Tüm upstream backend'lerinin devresi açık")
+        if self._executor is None:
+            return self._call(backend, payload)
+
+        pending = {self._executor.submit(self._call, backend, payload): backend}
+        last_response = last_error = None
+        hedges = 0
+        while pending:
+            timeout = self._hedge_after(backend) if hedges < self.max_hedges else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Yanıt gecikti: sıradaki backend'e ikinci istek
+                hedges += 1
+                hedge = self._next_backend(used)
+                if hedge is not None:
+                    backend = hedge
+                    HEDGED_REQUESTS.inc(backend=backend.name)
+                    pending[self._executor.submit(self._call, backend, payload)] = backend
+                continue
+
+            for future in done:
+                del pending[future]
+                try:
+                    response = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if response.status_code == 200:
+                    # Kaybeden istekler tamamlandığında bağlantıları havuza döner
+                    for loser in pending:
+                        loser.add_done_callback(_close_response)
+                    if last_response is not None:
+                        last_response.close()
+                    return response
+                if last_response is not None:
+                    last_response.close()
+                last_response = response
+
+            if not pending:
+                # Başarısız yanıt: sıradaki backend beklemeden denenir
+                failover = self._next_backend(used)
+                if failover is not None:
+                    backend = failover
+                    pending[self._executor.submit(self._call, backend, payload)] = backend
+
+        if last_response is not None:
+            return last_response
+        raise last_error
+
+    def open_stream(self, payload):
+        """Akış isteği; hedge yapılmaz, başarısız yanıtta sıradaki backend'e geçilir."""
+        used = set()
+        last_response = last_error = None
+        backend = self._next_backend(used)
+        if backend is None:
+            raise CircuitOpenError("Tüm upstream backend'lerinin devresi açık")
+        while backend is not None:
+            try:
+                response = self._call(backend, payload, stream=True)
+            except Exception as e:
+                last_error = e
+            else:
+                if response.status_code == 200:
+                    if last_response is not None:
+                        last_response.close()
+                    return response
+                if last_response is not None:
+                    last_response.close()
+                last_response = response
+            backend = self._next_backend(used)
+
+        if last_response is not None:
+            return last_response
+        raise last_error
+
+
+class AsyncRouter(BaseRouter):
+    """asyncio sunucusu (async_app) için yönlendirici; kaybeden istekler iptal edilir."""
+
+    def __init__(self, backends, **kwargs):
+        super().__init__(backends, **kwargs)
+        # aiohttp yalnızca async sunucuda gerekir; Flask sürecinde içe aktarılmaz
+        from async_upstream import AsyncUpstreamClient
+        self._clients = {backend: AsyncUpstreamClient(base_url=backend.base_url,
+                                                      max_retries=backend.max_retries)
+                         for backend in backends}
+
+    async def start(self):
+        for client in self._clients.values():
+            await client.start()
+
+    async def close(self):
+        for client in self._clients.values():
+            await client.close()
+
+    async def _call(self, backend, payload):
+        started = time.monotonic()
+        try:
+            response = await self._clients[backend].chat_completion(backend.payload(payload),
+                                                                    backend.api_key)
+        except asyncio.CancelledError:
+            backend.breaker.release()
+            BACKEND_REQUESTS.inc(backend=backend.name, outcome="cancelled")
+            raise
+        except Exception:
+            self._record(backend, started)
+            raise
+        self._record(backend, started, response)
+        return response
+
+    async def chat_completion(self, payload):
+        """İlk başarılı yanıtı, hiçbiri başarılı değilse son yanıtı ya da son hatayı döndürür."""
+        used = set()
+        backend = self._next_backend(used)
+        if backend is None:
+            raise CircuitOpenError("Tüm upstream backend'lerinin devresi açık")
+        if len(self.backends) == 1:
+            return await self._call(backend, payload)
+
+        pending = {asyncio.ensure_future(self._call(backend, payload))}
+        last_response = last_error = None
+        hedges = 0
+        try:
+            while pending:
+                timeout = self._hedge_after(backend) if hedges < self.max_hedges else None
+                done, pending = await asyncio.wait(pending, timeout=timeout,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedges += 1
+                    hedge = self._next_backend(used)
+                    if hedge is not None:
+                        backend = hedge
+                        HEDGED_REQUESTS.inc(backend=backend.name)
+                        pending.add(asyncio.ensure_future(self._call(backend, payload)))
+                    continue
+
+                for task in done:
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    if response.status_code == 200:
+                        return response
+                    last_response = response
+
+                if not pending:
+                    failover = self._next_backend(used)
+                    if failover is not None:
+                        backend = failover
+                        pending.add(asyncio.ensure_future(self._call(backend, payload)))
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if last_response is not None:
+            return last_response
+        raise last_error
+
+
+_router = None
+_router_pid = None
+_router_lock = threading.Lock()
+
+
+def get_router(default_model, default_api_key):
+    """Süreç başına tek yönlendirici döndürür (fork sonrası yeniden oluşturulur)."""
+    global _router, _router_pid
+    pid = os.getpid()
+    if _router is None or _router_pid != pid:
+        with _router_lock:
+            if _router is None or _router_pid != pid:
+                _router = Router(load_backends(default_model, default_api_key))
+                _router_pid = pid
+    return _router
@@ -0,0 +1,147 @@
+"""Yakın anlamlı sorgular için kök anahtarlı önbellek dizini.
+
+Tam anahtarlı önbellek "başım çok ağrıyor" ile "baş ağrım var" gibi
+dolgu kelimeleri ve çekim ekleri farklı aynı şikayetleri ıskalar. Burada
+her düzeltilmiş sorgu bir imzaya indirilir: anlam taşımayan kelimeler
+("çok", "var", "yaşıyorum") atılır, kalan kelimeler hafif bir ek
+budayıcıyla köklerine indirilir (ağrıyor, ağrım, ağrısı -> ağr) ve kökler
+sıralanır. Yeni sorgu tam anahtarla bulunamazsa aynı imzayla daha önce
+yanıtlanan sorgunun önbellek anahtarı döndürülür ve yanıt önbellekten
+alınır.
+
+Kökler Türkçe harfleriyle (katlanmadan) karşılaştırılır ve tamamı birebir
+aynı olmalıdır; organ ve belirti kelimeleri böylece kesin anahtardır
+("testisim şişti" / "testisim ağrıyor", "belim morardı" / "elim morardı"
+ve "kaşım" / "kasım" eşleşmez). Olumsuzluk kelimeleri ve olumsuz fiil
+ekleri, sayılar, süre ve taraf (sağ/sol) kelimeleri de imzaya girer
+("ateşim var" / "ateşim yok"). Vektör benzerliği kullanılmaz: kesin kök
+anahtarı zorunlu olduğunda benzerlik her eşleşmede ~1.0 olur ve karara
+katkısı yoktur (bkz. bench/bench_semantic.py).
+
+Özellik varsayılan olarak kapalıdır (HEALTH_SEMANTIC_CACHE=on ile açılır).
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from cache import normalize_query
+from fuzzy import fold
+from upstream import env_int
+
+# Anlamı değiştirmeyen dolgu kelimeleri, şiddet zarfları ve "X var/oldu" yüklemleri
+STOP_WORDS = frozenset(fold(word) for word in (
+    "ve", "ile", "ama", "fakat", "de", "da", "ki", "bir", "biraz", "çok", "aşırı", "fazla", "şiddetli",
+    "hafif", "gibi", "bende", "benim", "ben", "sürekli", "hep", "sanki", "şu", "an", "şuan", "şimdi",
+    "var", "varmış", "oldu", "oldum", "olur", "oluyor", "çıktı", "başladı", "yaşıyorum", "çekiyorum",
+    "hissediyorum", "yaşadım", "çektim", "mı", "mi", "mu", "mü", "neden", "nedir", "ne", "yapmalıyım",
+))
+# Kök budayıcının denediği ekler (katlanmış, uzundan kısaya)
+SUFFIXES = sorted({
+    "iyorum", "uyorum", "iyor", "uyor", "yor", "mesi", "masi", "lari", "leri", "imiz", "umuz", "ler", "lar",
+    "mak", "mek", "me", "ma", "di", "du", "ti", "tu", "im", "um", "in", "un", "si", "su", "m", "i", "u",
+}, key=len, reverse=True)
+MIN_STEM_LENGTH = 2
+
+# İki sorguda birebir aynı olması gereken kelimeler (katlanmış biçimde)
+GUARD_WORDS = frozenset(fold(word) for word in (
+    "yok", "değil", "olmadı", "olmuyor", "geçmedi", "geçmiyor", "hiç", "hiçbir",
+    "dakika", "dakikadır", "saat", "saattir", "gün", "gündür", "hafta", "haftadır",
+    "ay", "aydır", "yıl", "yıldır", "sağ", "sol",
+))
+_DIGITS = re.compile(r'\d+')
+# Fiilin olumsuz çekimi (ağrımıyor, geçmedi, uyumaz) kökü değiştirmez,
+# bu yüzden ayrıca koruma işareti olarak eklenir
+_NEGATIVE_VERB = re.compile(r'm[iu]yor|m[ae]d[iu]|m[ae]z$|m[ae]m[iu]s')
+NEGATION_MARK = "~olumsuz"
+
+
+def prepare_text(text):
+    """Önbellek anahtarıyla aynı biçimde normalize eder (küçük harf, noktalamasız)."""
+    return normalize_query(text)
+
+
+def stem(word):
+    """Hafif ek budama: bilinen ekler kök en az MIN_STEM_LENGTH harf kalacak şekilde atılır."""
+    for _ in range(3):
+        for suffix in SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+                word = word[:-len(suffix)]
+                break
+        else:
+            break
+    return word
+
+
+def signature(prepared):
+    """(Türkçe harfli köklerin sıralı demeti, koruma kelimeleri kümesi); içerik kelimesi yoksa None.
+
+    Kökler katlanmış kelimeden budanır (ek listesi ASCII'dir) ama anahtara
+    özgün kelimeden alınır; katlama "kaşım" ile "kasım"ı aynı yapardı.
+    """
+    stems = []
+    guards = set()
+    for word in prepared.split():
+        folded = fold(word)
+        if folded in GUARD_WORDS or _DIGITS.fullmatch(folded):
+            guards.add(folded)
+        elif folded not in STOP_WORDS:
+            if _NEGATIVE_VERB.search(folded):
+                guards.add(NEGATION_MARK)
+            # Katlama harf sayısını korur; kök aynı uzunlukta özgün kelimeden alınır
+            stems.append(word[:len(stem(folded))])
+    if not stems:
+        return None
+    return tuple(sorted(stems)), frozenset(guards)
+
+
+class SemanticIndex:
+    """İmza -> önbellek anahtarı; en fazla max_entries kayıt, en eski kullanılan atılır (LRU)."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, text, key):
+        """Yanıtlanan sorguyu önbellek anahtarıyla dizine ekler."""
+        sig = signature(prepare_text(text))
+        if sig is None:
+            return
+        with self._lock:
+            self._keys[sig] = key
+            self._keys.move_to_end(sig)
+            while len(self._keys) > self.max_entries:
+                self._keys.popitem(last=False)
+
+    def search(self, text):
+        """Aynı imzalı önceki sorgunun önbellek anahtarını döndürür; yoksa None."""
+        sig = signature(prepare_text(text))
+        with self._lock:
+            key = None if sig is None else self._keys.get(sig)
+            if key is None:
+                self.misses += 1
+            else:
+                self._keys.move_to_end(sig)
+                self.hits += 1
+        return key
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._keys), "hits": self.hits, "misses": self.misses}
+
+
+def create_semantic_index_from_env():
+    """Ortam değişkenlerinden kök anahtarlı dizini kurar; kapalıysa None döner.
+
+    HEALTH_SEMANTIC_CACHE: on veya off (varsayılan)
+    HEALTH_SEMANTIC_MAX_ENTRIES: en fazla kayıt (varsayılan 5000)
+    """
+    if os.environ.get("HEALTH_SEMANTIC_CACHE", "off").lower() in ("off", "none", "0", ""):
+        return None
+    return SemanticIndex(env_int("HEALTH_SEMANTIC_MAX_ENTRIES", 5000))
@@ -0,0 +1,124 @@
+"""Aynı anahtar için eşzamanlı çağrıları tek bir çağrıda birleştirme (single-flight).
+
+Aynı normalize edilmiş sorgu ve prompt için aynı anda gelen istekler tek bir
+upstream çağrısını bekler ve hepsi onun sonucunu alır. Bekleyenler anahtar
+başına bir zaman aşımıyla sınırlıdır.
+"""
+import asyncio
+import threading
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Bekleyen istek, süren çağrının sonucunu zamanında alamadı."""
+
+
+class _Stats:
+    def __init__(self):
+        self.leaders = 0      # gerçekten çalıştırılan çağrılar
+        self.collapsed = 0    # süren bir çağrıya katılan (birleştirilen) istekler
+        self.timeouts = 0     # beklerken zaman aşımına uğrayanlar
+        self._lock = threading.Lock()
+
+    def add(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self, in_flight):
+        with self._lock:
+            return {
+                "in_flight": in_flight,
+                "leaders": self.leaders,
+                "collapsed": self.collapsed,
+                "timeouts": self.timeouts
+            }
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Thread tabanlı sunucular (Flask/gunicorn) için single-flight."""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = _Stats()
+
+    def do(self, key, fn):
+        """Anahtar için süren çağrı varsa onu bekler, yoksa `fn()`'i çalıştırır."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if leader:
+            self._stats.add("leaders")
+            try:
+                call.result = fn()
+                return call.result
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+
+        self._stats.add("collapsed")
+        if not call.event.wait(self.timeout):
+            self._stats.add("timeouts")
+            raise SingleFlightTimeout(f"{self.timeout:g} sn içinde yanıt alınamadı")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self):
+        return self._stats.snapshot(len(self._calls))
+
+
+class AsyncSingleFlight:
+    """asyncio sunucusu (async_app) için single-flight."""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self._calls = {}
+        self._stats = _Stats()
+
+    async def do(self, key, coro_fn):
+        """Anahtar için süren çağrı varsa onu bekler, yoksa `await coro_fn()` çalıştırır."""
+        future = self._calls.get(key)
+        if future is None:
+            future = self._calls[key] = asyncio.get_running_loop().create_future()
+            # Bekleyen yoksa "exception was never retrieved" uyarısı çıkmasın
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._stats.add("leaders")
+            try:
+                result = await coro_fn()
+                future.set_result(result)
+                return result
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            finally:
+                del self._calls[key]
+
+        self._stats.add("collapsed")
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self._stats.add("timeouts")
+            raise SingleFlightTimeout(f"{self.timeout:g} sn içinde yanıt alınamadı")
+
+    def stats(self):
+        return self._stats.snapshot(len(self._calls))
@@ -0,0 +1,108 @@
+"""Önceden hesaplanmış analizlerin salt okunur, mmap ile açılan anlık görüntüsü.
+
+warmup.py sık gelen şikayetlerin analizlerini bu dosyaya yazar; sunucu
+başlarken dosyayı mmap ile açar ve bu sorguları upstream'e gitmeden yanıtlar.
+Dosya yalnızca okunduğundan gunicorn worker'ları aynı sayfaları paylaşır.
+
+Dosya düzeni (tamsayılar little-endian):
+
+    başlık   : MAGIC (8 bayt), kayıt sayısı (u32), meta veri uzunluğu (u32)
+    meta veri: UTF-8 JSON (model, sıcaklık, prompt sürümü, oluşturma zamanı)
+    dizin    : anahtara göre sıralı kayıtlar; sha1 özeti (20 bayt),
+               veri ofseti (u32), veri uzunluğu (u32)
+    veri     : zlib ile sıkıştırılmış JSON analizler
+"""
+import json
+import mmap
+import os
+import struct
+import zlib
+
+MAGIC = b"NYVSNAP1"
+_HEADER = struct.Struct("<8sII")
+_ENTRY = struct.Struct("<20sII")
+
+
+class SnapshotError(ValueError):
+    """Dosya bir anlık görüntü değil ya da bozuk."""
+
+
+def write_snapshot(path, entries, metadata):
+    """`{anahtar (hex sha1): analiz}` sözlüğünü dosyaya atomik olarak yazar."""
+    meta = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+    keys = sorted(bytes.fromhex(key) for key in entries)
+    blobs = [zlib.compress(json.dumps(entries[key.hex()], ensure_ascii=False,
+                                      separators=(",", ":")).encode("utf-8"), 9)
+             for key in keys]
+
+    offset = _HEADER.size + len(meta) + _ENTRY.size * len(keys)
+    index = bytearray()
+    for key, blob in zip(keys, blobs):
+        index += _ENTRY.pack(key, offset, len(blob))
+        offset += len(blob)
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(keys), len(meta)))
+        f.write(meta)
+        f.write(index)
+        for blob in blobs:
+            f.write(blob)
+    # Çalışan sunucular eski dosyayı (ve mmap'ini) kullanmaya devam edebilir
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """Anahtarla ikili arama yapılan mmap'li anlık görüntü."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise SnapshotError(f"{path}: anlık görüntü dosyası değil")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, meta_length = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise SnapshotError(f"{path}: anlık görüntü dosyası değil")
+        self.metadata = json.loads(self._mm[_HEADER.size:_HEADER.size + meta_length])
+        self._index_start = _HEADER.size + meta_length
+
+    def _digest(self, i):
+        start = self._index_start + i * _ENTRY.size
+        return self._mm[start:start + 20]
+
+    def get(self, key):
+        """Anahtarın (hex sha1) analizini döndürür; yoksa None."""
+        digest = bytes.fromhex(key)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._digest(mid) < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self._count or self._digest(lo) != digest:
+            return None
+        _, offset, length = _ENTRY.unpack_from(self._mm, self._index_start + lo * _ENTRY.size)
+        return json.loads(zlib.decompress(self._mm[offset:offset + length]))
+
+    def items(self):
+        """(anahtar, analiz) çiftlerini anahtar sırasıyla üretir."""
+        for i in range(self._count):
+            digest, offset, length = _ENTRY.unpack_from(self._mm, self._index_start + i * _ENTRY.size)
+            yield digest.hex(), json.loads(zlib.decompress(self._mm[offset:offset + length]))
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        self._mm.close()
+
+
+def load_snapshot_from_env():
+    """HEALTH_SNAPSHOT_PATH (varsayılan health_snapshot.bin) varsa açar; yoksa None döner."""
+    path = os.environ.get("HEALTH_SNAPSHOT_PATH", "health_snapshot.bin")
+    if not path or not os.path.exists(path):
+        return None
+    return Snapshot(path)
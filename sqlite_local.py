@@ -0,0 +1,32 @@
+"""Worker süreçleri arasında paylaşılan SQLite dosyaları için bağlantı yardımcısı.
+
+Önbellek (cache.SQLiteBackend), hız sınırlayıcı (admission.SQLiteRateLimiter)
+ve iş kaydı (jobs.JobStore) aynı dosyayı birden çok thread ve gunicorn
+worker'ından kullanır. sqlite3 bağlantıları thread'ler arasında ve fork
+sonrası güvenle paylaşılamadığından her thread ve süreç kendi bağlantısını
+açar.
+"""
+import os
+import sqlite3
+import threading
+
+
+class LocalConnection:
+    """Çağrıldığında bu thread ve süreç için WAL kipinde açılmış bağlantıyı döndürür."""
+
+    def __init__(self, path, synchronous="NORMAL", isolation_level=""):
+        self.path = path
+        self.synchronous = synchronous
+        self.isolation_level = isolation_level
+        self._local = threading.local()
+
+    def __call__(self):
+        # Bağlantılar thread ve süreç başına açılır (fork sonrası paylaşılmaz)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=self.isolation_level)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
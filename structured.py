@@ -0,0 +1,124 @@
+"""Yapılandırılmış (JSON) yanıt modu.
+
+Varsayılan modda model 12 başlıklı düzyazı üretir ve yanıt
+response_parser ile başlıklardan ayrıştırılır. Bu modda
+(HEALTH_RESPONSE_FORMAT=json) modelden aynı 12 alanı taşıyan tek bir JSON
+nesnesi istenir. Her alanın
+en fazla uzunluğu hem prompt'ta hem de istekle gönderilen şemada
+(response_format) belirtilir; yanıt böylece daha kısa olur ve ayrıştırma
+tek bir JSON çözümlemesine iner.
+
+Model şemaya uymazsa (JSON değil, yarım kalmış ya da alanları
+tanınmıyor) yanıt düzyazı ayrıştırıcısına bırakılır. Sonuç her iki modda
+da aynı alanları taşır; full_response JSON modunda alanlardan 12 başlıklı
+metin olarak yeniden kurulur.
+
+orjson isteğe bağlıdır; kuruluysa JSON çözümlemesi onunla yapılır.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson yoksa standart json
+    orjson = None
+
+import metrics
+import response_parser
+from response_parser import SECTIONS, HealthAnalysis
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Alan başına en fazla karakter; sınırı aşan değerler kelime sınırında kısaltılır
+FIELD_LIMITS = {
+    "causes": 300,
+    "recommendations": 300,
+    "when_to_see_doctor": 200,
+    "which_specialist": 60,
+    "emergency_visit": 200,
+    "home_care": 250,
+    "duration": 120,
+    "stress_related": 150,
+    "similar_conditions": 150,
+    "severity": 150,
+    "medication": 200,
+    "contagious": 100,
+}
+
+SCHEMA = {
+    "type": "object",
+    "properties": {field: {"type": "string", "maxLength": FIELD_LIMITS[field]} for field, _ in SECTIONS},
+    "required": [field for field, _ in SECTIONS],
+    "additionalProperties": False,
+}
+# OpenRouter structured outputs; desteklemeyen sağlayıcılar prompt'taki tarife uyar
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "health_analysis", "strict": True, "schema": SCHEMA},
+}
+
+SYSTEM_PROMPT = "\n".join([
+    "Sen bir sağlık asistanısın. Kullanıcının sağlık şikayetini değerlendir ve yalnızca tek bir "
+    "JSON nesnesi döndür; JSON dışında metin, markdown veya kod bloğu yazma.",
+    "Anahtarlar (değerler kısa, düz Türkçe metin; birden fazla madde virgülle ayrılır):",
+] + [f"- {field}: {heading.rstrip(':')} (en fazla {FIELD_LIMITS[field]} karakter)"
+     for field, heading in SECTIONS])
+
+STRUCTURED_PARSES = metrics.REGISTRY.register(metrics.Counter(
+    "health_structured_parses_total", "JSON-mode answers by parse result (json, invalid, text)", ("result",)))
+
+
+def clip(value, limit):
+    """Sınırı aşan metni son kelime sınırında keser."""
+    if len(value) <= limit:
+        return value
+    cut = value.rfind(" ", 0, limit)
+    return value[:cut if cut > 0 else limit].rstrip(" ,;.") + "…"
+
+
+def _as_text(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        return ", ".join(_as_text(item) for item in value if item is not None)
+    return "" if value is None else str(value)
+
+
+def load_object(ai_response):
+    """Yanıttaki JSON nesnesini (dict, sonuç) olarak döndürür; nesne yoksa dict None'dır.
+
+    sonuç: json (geçerli), invalid (JSON'a benziyor ama çözülemedi ya da
+    alanları tanınmıyor) veya text (JSON değil).
+    """
+    text = ai_response.strip()
+    # Bazı modeller şemaya rağmen ```json bloğu içinde döndürür
+    if text.startswith("```"):
+        text = text.strip("`").strip()
+        if text.startswith("json"):
+            text = text[4:]
+        text = text.strip()
+    if not text.startswith("{"):
+        return None, "text"
+    try:
+        data = _loads(text)
+    except ValueError:
+        return None, "invalid"
+    if not isinstance(data, dict) or not any(field in data for field in FIELD_LIMITS):
+        return None, "invalid"
+    return data, "json"
+
+
+def render(fields):
+    """Alanlardan düzyazı moduyla aynı başlıklı metni kurar (full_response)."""
+    return "\n\n".join(f"{number}. {heading}\n{fields[field]}"
+                       for number, (field, heading) in enumerate(SECTIONS, 1) if fields.get(field))
+
+
+def parse(ai_response):
+    """JSON yanıtı doğrulayıp `HealthAnalysis` döndürür; geçersizse düzyazı olarak ayrıştırır."""
+    data, result = load_object(ai_response)
+    STRUCTURED_PARSES.inc(result=result)
+    if data is None:
+        return response_parser.parse(ai_response)
+    fields = {field: clip(_as_text(data.get(field)).replace("*", "").strip(), limit)
+              for field, limit in FIELD_LIMITS.items()}
+    return HealthAnalysis(full_response=render(fields), **fields)
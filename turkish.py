@@ -0,0 +1,6 @@
+"""Türkçe metin yardımcıları."""
+
+
+def turkish_lower(text):
+    """Türkçe 'I' -> 'ı' ve 'İ' -> 'i' dönüşümüyle küçük harfe çevirir."""
+    return text.replace('I', 'ı').replace('İ', 'i').lower()
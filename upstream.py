@@ -0,0 +1,159 @@
+"""OpenRouter çağrıları için paylaşılan, bağlantı havuzlu HTTP istemcisi.
+
+Her süreç tek bir `requests.Session` kullanır; böylece gunicorn worker
+thread'leri arasında TCP+TLS bağlantıları yeniden kullanılır. 429/5xx
+yanıtlarında ve bağlantı hatalarında rastgele gecikmeli (jitter) yeniden
+deneme yapılır. Temel adres `OPENROUTER_BASE_URL` ile değiştirilerek yerel
+bir sahte sunucuya yönlendirilebilir.
+"""
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+class BaseUpstreamClient:
+    """Senkron ve asenkron istemcilerin ortak ayarları ve bekleme hesabı."""
+
+    def __init__(self, base_url=None, pool_size=None, connect_timeout=None,
+                 read_timeout=None, max_retries=None, backoff_base=None, backoff_max=None):
+        self.base_url = (base_url or os.environ.get("OPENROUTER_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.pool_size = pool_size or env_int("UPSTREAM_POOL_SIZE", 20)
+        self.connect_timeout = connect_timeout or env_float("UPSTREAM_CONNECT_TIMEOUT", 5.0)
+        self.read_timeout = read_timeout or env_float("UPSTREAM_READ_TIMEOUT", 60.0)
+        self.max_retries = max_retries if max_retries is not None else env_int("UPSTREAM_MAX_RETRIES", 2)
+        self.backoff_base = backoff_base or env_float("UPSTREAM_BACKOFF_BASE", 0.5)
+        self.backoff_max = backoff_max or env_float("UPSTREAM_BACKOFF_MAX", 8.0)
+
+    def url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    @staticmethod
+    def headers(api_key):
+        return {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def _backoff(self, attempt, retry_after=None):
+        """Tam jitter'lı üstel bekleme; sunucu Retry-After verdiyse ona uyulur."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class UpstreamClient(BaseUpstreamClient):
+    """Sınırlı bağlantı havuzu, ayrı bağlantı/okuma zaman aşımı ve yeniden deneme."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.session = requests.Session()
+        # Havuz dolduğunda yeni bağlantı açmak yerine boş bağlantı beklenir
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size,
+                              pool_block=True, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def post_json(self, path, payload, api_key, stream=False, timeout=None):
+        """JSON gövdeli POST isteği gönderir; son yanıtı ya da son hatayı döndürür."""
+        url = self.url(path)
+        headers = self.headers(api_key)
+        timeout = timeout or (self.connect_timeout, self.read_timeout)
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.post(url, headers=headers, json=payload,
+                                             stream=stream, timeout=timeout)
+            except requests.ConnectionError:
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                delay = self._backoff(attempt, response.headers.get("Retry-After"))
+                response.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+            return response
+
+    def chat_completion(self, payload, api_key, stream=False, timeout=None):
+        """/chat/completions uç noktasını çağırır."""
+        return self.post_json("chat/completions", payload, api_key, stream=stream, timeout=timeout)
+
+    def preconnect(self):
+        """Havuza bir bağlantı açar (DNS + TCP + TLS); ilk analiz isteği bunu beklemez.
+
+        Yanıtın kendisi önemsizdir; hatalar yok sayılır.
+        """
+        try:
+            self.session.head(self.base_url, timeout=(self.connect_timeout, self.connect_timeout)).close()
+        except requests.RequestException:
+            pass
+
+
+def iter_stream_content(response):
+    """Akış (SSE) halindeki chat completion yanıtından metin parçalarını üretir."""
+    done = False
+    for line in response.iter_lines(chunk_size=None):
+        # Boş satırlar ve ": OPENROUTER PROCESSING" gibi yorum satırları atlanır;
+        # [DONE] sonrası gövde sonuna kadar okunur ki bağlantı havuza dönebilsin
+        if done or not line or not line.startswith(b"data:"):
+            continue
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            done = True
+            continue
+        chunk = json.loads(data)
+        choices = chunk.get("choices") or []
+        if not choices:
+            continue
+        content = (choices[0].get("delta") or {}).get("content")
+        if content:
+            yield content
+
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Süreç başına tek istemci döndürür (fork sonrası yeniden oluşturulur)."""
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _client_lock:
+            if _client is None or _client_pid != pid:
+                _client = UpstreamClient()
+                _client_pid = pid
+    return _client
+
+
+def chat_completion(payload, api_key, stream=False, timeout=None):
+    """Paylaşılan istemciyle chat completion isteği gönderir."""
+    return get_client().chat_completion(payload, api_key, stream=stream, timeout=timeout)
@@ -0,0 +1,112 @@
+"""Sık şikayetler için analiz anlık görüntüsü (snapshot) oluşturan çevrimdışı araç.
+
+Korpustaki her satır sunucudaki gibi düzeltilir ve sınıflandırılır,
+normalize edilmiş önbellek anahtarına göre tekilleştirilir, analizler
+sınırlı eşzamanlılıkla upstream'den alınır ve snapshot.py biçiminde
+yazılır. Var olan dosyadaki geçerli kayıtlar yeniden kullanılır; yalnızca
+eksik anahtarlar için upstream'e gidilir. Hiçbir bölümü ayrıştırılamayan
+yanıtlar (kesik ya da biçimsiz) snapshot'a yazılmaz ve hata sayılır;
+snapshot'ın süresi dolmadığından bunlar yoksa --refresh'e kadar sunulurdu.
+
+    python warmup.py data/common_complaints.txt -o health_snapshot.bin --concurrency 4
+    HEALTH_SNAPSHOT_PATH=health_snapshot.bin gunicorn app:app
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from analysis import MODEL, PROMPT_VERSION, TEMPERATURE, build_payload, get_router, has_sections, parse_analysis
+from cache import make_key
+from preprocess import correct_turkish_text, is_health_related
+from snapshot import Snapshot, SnapshotError, write_snapshot
+
+
+def read_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def prepare_corpus(lines):
+    """Düzeltilmiş sorguları anahtara göre tekilleştirir; (sorgular, sağlık dışı sayısı) döner."""
+    queries = {}
+    rejected = 0
+    for line in lines:
+        corrected = correct_turkish_text(line)
+        if not is_health_related(corrected):
+            rejected += 1
+            continue
+        queries.setdefault(make_key(corrected, MODEL, TEMPERATURE, PROMPT_VERSION), corrected)
+    return queries, rejected
+
+
+def load_existing(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        snapshot = Snapshot(path)
+    except SnapshotError as e:
+        print(f"Uyarı: {e}; dosya baştan oluşturulacak", file=sys.stderr)
+        return {}
+    try:
+        return dict(snapshot.items())
+    finally:
+        snapshot.close()
+
+
+def fetch(corrected_query):
+    response = get_router().chat_completion(build_payload(corrected_query))
+    if response.status_code != 200:
+        raise RuntimeError(f"API Hatası: {response.status_code}")
+    ai_response = response.json()["choices"][0]["message"]["content"]
+    result = parse_analysis(ai_response)
+    if not has_sections(result):
+        raise RuntimeError("Yanıtta hiçbir bölüm ayrıştırılamadı")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sık şikayetler için analiz anlık görüntüsü oluşturur")
+    parser.add_argument("corpus", help="her satırı bir şikayet olan metin dosyası")
+    parser.add_argument("-o", "--output", default=os.environ.get("HEALTH_SNAPSHOT_PATH", "health_snapshot.bin"))
+    parser.add_argument("--concurrency", type=int, default=4, help="eşzamanlı upstream isteği sayısı")
+    parser.add_argument("--refresh", action="store_true", help="var olan kayıtları yeniden kullanma")
+    args = parser.parse_args()
+
+    lines = read_corpus(args.corpus)
+    queries, rejected = prepare_corpus(lines)
+    print(f"{len(lines)} satır, {len(queries)} tekil sağlık sorgusu, {rejected} sağlık dışı satır atlandı")
+
+    existing = {} if args.refresh else load_existing(args.output)
+    # Eski sürümlerin yazdığı boş kayıtlar yeniden alınır
+    entries = {key: existing[key] for key in queries if key in existing and has_sections(existing[key])}
+    missing = {key: query for key, query in queries.items() if key not in entries}
+    print(f"{len(entries)} kayıt mevcut dosyadan alındı, {len(missing)} sorgu upstream'e gönderilecek")
+
+    failed = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = {executor.submit(fetch, query): key for key, query in missing.items()}
+        for done, future in enumerate(as_completed(futures), 1):
+            key = futures[future]
+            try:
+                entries[key] = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"Hata ({missing[key]!r}): {e}", file=sys.stderr)
+            if done % 20 == 0 or done == len(futures):
+                print(f"  {done}/{len(futures)} tamamlandı ({time.perf_counter() - start:.1f} sn)")
+
+    write_snapshot(args.output, entries, {
+        "model": MODEL,
+        "temperature": TEMPERATURE,
+        "prompt_version": PROMPT_VERSION,
+        "created_at": int(time.time())
+    })
+    print(f"{args.output}: {len(entries)} kayıt, {os.path.getsize(args.output)} bayt ({failed} hata)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())